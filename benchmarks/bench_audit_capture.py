@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la captura de cambios para la auditoría
+
+Compara la latencia de escritura de StudentDAO.create / update / delete con
+la auditoría armada en Python (imagen "antes" leída con un SELECT y entrada
+registrada con AuditWriter, como antes de la migración 5) frente a la de los
+triggers AFTER INSERT/UPDATE/DELETE, que la escriben en la misma sentencia.
+
+Para la variante en Python se eliminan los triggers de auditoría de la base
+temporal, de modo que cada operación se audita una sola vez.
+
+Uso:
+    python benchmarks/bench_audit_capture.py [--rows 2000] [--profile interactive]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Agregar el directorio raíz al path para importar los módulos
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.database.connection import DatabaseConnection, PRAGMA_PROFILES
+from src.database.dao import Student, StudentDAO
+
+def open_database(db_path: str, profile: str) -> DatabaseConnection:
+    """Crea una instancia nueva de DatabaseConnection (ignorando el singleton)"""
+    DatabaseConnection._instance = None
+    return DatabaseConnection(db_path, profile=profile)
+
+class PythonCaptureDAO(StudentDAO):
+    """StudentDAO con la auditoría registrada desde Python (una sentencia más por escritura)"""
+
+    def create(self, student: Student) -> int:
+        with self.db.transaction():
+            student_id = super().create(student)
+            self.db.audit.log("students", "CREATE", student_id, None, student.to_dict())
+            return student_id
+
+    def update(self, student: Student) -> bool:
+        with self.db.transaction():
+            old_student = self._load_original("students", Student, student.id)
+            updated = super().update(student)
+            self.db.audit.log("students", "UPDATE", student.id, old_student.to_dict(), student.to_dict())
+            return updated
+
+    def delete(self, student_id: int) -> bool:
+        with self.db.transaction():
+            old_student = self._load_original("students", Student, student_id)
+            deleted = super().delete(student_id)
+            self.db.audit.log("students", "DELETE", student_id, old_student.to_dict(), None)
+            return deleted
+
+def drop_audit_triggers(db: DatabaseConnection):
+    triggers = db.execute_query(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%\\_audit\\_%' ESCAPE '\\'"
+    )
+    with db.transaction() as cursor:
+        for trigger in triggers:
+            cursor.execute(f"DROP TRIGGER {trigger['name']}")
+
+def bench(dao_class, rows: int, profile: str, with_triggers: bool) -> dict:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = open_database(os.path.join(temp_dir, "bench.db"), profile)
+        if not with_triggers:
+            drop_audit_triggers(db)
+        dao = dao_class()
+        timings = {'create': 0.0, 'update': 0.0, 'delete': 0.0}
+
+        ids = []
+        started = time.perf_counter()
+        for i in range(rows):
+            ids.append(dao.create(Student(first_name=f"Nombre{i}", last_name="Audit",
+                                          email=f"audit{i}@test.com")))
+        timings['create'] = time.perf_counter() - started
+
+        students = [dao.get_by_id(student_id) for student_id in ids]
+        started = time.perf_counter()
+        for student in students:
+            student.phone = "555-0000"
+            dao.update(student)
+        timings['update'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for student_id in ids:
+            dao.delete(student_id)
+        timings['delete'] = time.perf_counter() - started
+
+        audit_rows = db.execute_scalar("SELECT COUNT(*) FROM audit_log")
+        db.disconnect()
+    result = {operation: elapsed / rows * 1e6 for operation, elapsed in timings.items()}
+    result['audit_rows'] = audit_rows
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la captura de cambios")
+    parser.add_argument("--rows", type=int, default=2000, help="Estudiantes a crear, actualizar y borrar")
+    parser.add_argument("--profile", choices=list(PRAGMA_PROFILES), default="interactive",
+                        help="Perfil PRAGMA de la conexión")
+    args = parser.parse_args()
+
+    results = [
+        ("python", bench(PythonCaptureDAO, args.rows, args.profile, with_triggers=False)),
+        ("triggers", bench(StudentDAO, args.rows, args.profile, with_triggers=True)),
+    ]
+
+    print()
+    print(f"{'Captura':<10}{'CREATE (µs)':>13}{'UPDATE (µs)':>13}{'DELETE (µs)':>13}{'Filas de auditoría':>20}")
+    print("-" * 69)
+    for name, result in results:
+        print(f"{name:<10}{result['create']:>13.1f}{result['update']:>13.1f}"
+              f"{result['delete']:>13.1f}{result['audit_rows']:>20}")
+
+if __name__ == "__main__":
+    main()
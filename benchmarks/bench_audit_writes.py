@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la auditoría
+
+Mide la latencia de una transacción con una escritura y un evento de
+auditoría de aplicación (AuditWriter) para cada nivel de durabilidad: sync,
+on-commit y best-effort, junto con los lotes escritos y la latencia de
+vaciado reportada. Los cambios de filas los registran los triggers en
+cualquier nivel; ver bench_audit_capture.py.
+
+Uso:
+    python benchmarks/bench_audit_writes.py [--rows 2000] [--profile interactive]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Agregar el directorio raíz al path para importar los módulos
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.database.audit import AuditDurability
+from src.database.connection import DatabaseConnection, PRAGMA_PROFILES
+from src.database.dao import Student, StudentDAO
+
+def open_database(db_path: str, profile: str, durability: str) -> DatabaseConnection:
+    """Crea una instancia nueva de DatabaseConnection (ignorando el singleton)"""
+    DatabaseConnection._instance = None
+    return DatabaseConnection(db_path, profile=profile, audit_durability=durability)
+
+def bench(durability: str, rows: int, profile: str) -> dict:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = open_database(os.path.join(temp_dir, "bench.db"), profile, durability)
+        dao = StudentDAO()
+        started = time.perf_counter()
+        for i in range(rows):
+            with db.transaction():
+                student_id = dao.create(Student(first_name=f"Nombre{i}", last_name="Audit",
+                                                email=f"audit{i}@test.com"))
+                db.audit.log("students", "EXPORT", student_id, None, {'format': "csv"})
+        elapsed = time.perf_counter() - started
+        db.flush_audit()
+        stats = db.get_audit_stats()
+        db.disconnect()
+    return {'us_per_op': elapsed / rows * 1e6, 'stats': stats}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la auditoría")
+    parser.add_argument("--rows", type=int, default=2000, help="Estudiantes a crear")
+    parser.add_argument("--profile", choices=list(PRAGMA_PROFILES), default="interactive",
+                        help="Perfil PRAGMA de la conexión")
+    args = parser.parse_args()
+
+    results = [(level.value, bench(level.value, args.rows, args.profile)) for level in AuditDurability]
+
+    print()
+    print(f"{'Durabilidad':<14}{'µs/escritura':>14}{'Lotes':>8}{'Vaciado prom. (ms)':>20}{'Vaciado máx. (ms)':>19}")
+    print("-" * 75)
+    for name, result in results:
+        stats = result['stats']
+        print(f"{name:<14}{result['us_per_op']:>14.1f}{stats['flushes']:>8}"
+              f"{stats['flush_ms']['avg']:>20.3f}{stats['flush_ms']['max']:>19.3f}")
+
+if __name__ == "__main__":
+    main()
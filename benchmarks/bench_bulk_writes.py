@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escrituras masivas
+
+Compara filas por segundo del camino fila a fila (create/update/delete, una
+transacción y un registro de auditoría por fila) con las operaciones masivas
+create_many/update_many/delete_many (executemany en una sola transacción).
+
+Uso:
+    python benchmarks/bench_bulk_writes.py [--rows 5000] [--profile interactive]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Agregar el directorio raíz al path para importar los módulos
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.database.connection import DatabaseConnection, PRAGMA_PROFILES
+from src.database.dao import Student, StudentDAO
+
+def open_database(db_path: str, profile: str) -> DatabaseConnection:
+    """Crea una instancia nueva de DatabaseConnection (ignorando el singleton)"""
+    DatabaseConnection._instance = None
+    return DatabaseConnection(db_path, profile=profile)
+
+def make_students(prefix: str, rows: int):
+    return [Student(first_name=f"Nombre{i}", last_name=f"Apellido{i}", email=f"{prefix}{i}@test.com")
+            for i in range(rows)]
+
+def timed(func, *args) -> float:
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+def bench_per_row(dao: StudentDAO, rows: int) -> dict:
+    """Camino actual: una llamada (y un COMMIT) por fila"""
+    students = make_students("row", rows)
+    ids = []
+    create = timed(lambda: ids.extend(dao.create(student) for student in students))
+    for student, student_id in zip(students, ids):
+        student.id = student_id
+        student.phone = "555-0000"
+    update = timed(lambda: [dao.update(student) for student in students])
+    delete = timed(lambda: [dao.delete(student_id) for student_id in ids])
+    return {'create': rows / create, 'update': rows / update, 'delete': rows / delete}
+
+def bench_bulk(dao: StudentDAO, rows: int) -> dict:
+    """Operaciones masivas: executemany en una sola transacción"""
+    students = make_students("bulk", rows)
+    results = []
+    create = timed(lambda: results.append(dao.create_many(students)))
+    for student, student_id in zip(students, results[0].ids):
+        student.id = student_id
+        student.phone = "555-0000"
+    update = timed(dao.update_many, students)
+    delete = timed(dao.delete_many, results[0].ids)
+    return {'create': rows / create, 'update': rows / update, 'delete': rows / delete}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de escrituras masivas")
+    parser.add_argument("--rows", type=int, default=5000, help="Filas por operación")
+    parser.add_argument("--profile", choices=list(PRAGMA_PROFILES), default="interactive",
+                        help="Perfil PRAGMA de la conexión")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = open_database(os.path.join(temp_dir, "bench.db"), args.profile)
+        dao = StudentDAO()
+        per_row = bench_per_row(dao, args.rows)
+        bulk = bench_bulk(dao, args.rows)
+        db.disconnect()
+
+    print()
+    print(f"{'Operación':<12}{'Fila a fila (filas/s)':>24}{'Masiva (filas/s)':>20}{'Aceleración':>14}")
+    print("-" * 70)
+    for operation in ('create', 'update', 'delete'):
+        print(f"{operation:<12}{per_row[operation]:>24.0f}{bulk[operation]:>20.0f}"
+              f"{bulk[operation] / per_row[operation]:>13.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark de búsqueda: LIKE '%texto%' frente a FTS5
+
+Carga estudiantes sintéticos en una base temporal y mide el tiempo medio de
+búsqueda por nombre con el LIKE original (recorre la tabla completa) y con
+StudentDAO.search_by_name (índice FTS5 por prefijo).
+
+Uso:
+    python benchmarks/bench_fts_search.py [--rows 100000] [--searches 50]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Agregar el directorio raíz al path para importar los módulos
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.database.connection import DatabaseConnection
+from src.database.dao import StudentDAO
+
+FIRST_NAMES = ["María", "José", "Lucía", "Andrés", "Sofía", "Martín", "Inés", "Raúl", "Elena", "Tomás"]
+SYLLABLES = ["ga", "mar", "lo", "pé", "ro", "drí", "san", "chez", "gó", "mez", "fer", "nán",
+             "dí", "az", "nú", "ñez", "ibá", "cor", "tés", "ru", "bio", "vé", "ga", "lla"]
+
+def random_surname() -> str:
+    """Apellido sintético de tres sílabas (unas 14.000 combinaciones)"""
+    return "".join(random.choice(SYLLABLES) for _ in range(3)).capitalize()
+
+LIKE_QUERY = """
+SELECT * FROM students
+WHERE first_name LIKE ? OR last_name LIKE ?
+ORDER BY last_name, first_name
+"""
+
+def open_database(db_path: str) -> DatabaseConnection:
+    """Crea una instancia nueva de DatabaseConnection (ignorando el singleton)"""
+    DatabaseConnection._instance = None
+    return DatabaseConnection(db_path, profile='bulk-load')
+
+def load_students(db: DatabaseConnection, rows: int):
+    """Inserta estudiantes con nombres y apellidos acentuados"""
+    with db.transaction() as cursor:
+        cursor.executemany(
+            "INSERT INTO students (first_name, last_name, email) VALUES (?, ?, ?)",
+            ((random.choice(FIRST_NAMES), random_surname(), f"bench{i}@test.com")
+             for i in range(rows))
+        )
+
+def mean_ms(func, terms) -> float:
+    """Tiempo medio por búsqueda, en milisegundos"""
+    started = time.perf_counter()
+    for term in terms:
+        func(term)
+    return (time.perf_counter() - started) * 1000 / len(terms)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de búsqueda LIKE vs FTS5")
+    parser.add_argument("--rows", type=int, default=100000, help="Estudiantes a insertar")
+    parser.add_argument("--searches", type=int, default=50, help="Búsquedas por método")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = open_database(os.path.join(temp_dir, "bench.db"))
+        load_students(db, args.rows)
+        db.set_profile('interactive')
+        dao = StudentDAO()
+
+        # Los usuarios escriben el inicio de un apellido existente
+        surnames = [row['last_name'] for row in
+                    db.execute_query("SELECT last_name FROM students ORDER BY RANDOM() LIMIT ?", (args.searches,))]
+        terms = [surname[:5] for surname in surnames]
+
+        like_ms = mean_ms(lambda term: db.execute_query(LIKE_QUERY, (f"%{term}%", f"%{term}%")), terms)
+        fts_ms = mean_ms(dao.search_by_name, terms)
+
+        # Prefijos cortos y muy frecuentes: se ordenan muchas coincidencias
+        short_terms = [surname[:2] for surname in surnames]
+        fts_short_ms = mean_ms(lambda term: dao.search(term, limit=20), short_terms)
+
+        db.disconnect()
+
+    print()
+    print(f"{'Método':<34}{'ms/búsqueda':>14}")
+    print("-" * 48)
+    print(f"{'LIKE %texto% (recorrido completo)':<34}{like_ms:>14.2f}")
+    print(f"{'FTS5 search_by_name':<34}{fts_ms:>14.2f}")
+    print(f"{'FTS5 search (2 letras, LIMIT 20)':<34}{fts_short_ms:>14.2f}")
+    print(f"\nFilas: {args.rows}   Aceleración FTS5: {like_ms / fts_ms:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark de publicación masiva de calificaciones
+
+Carga N inscripciones y mide las filas por segundo al publicar una
+calificación nueva para cada una con:
+
+1. El camino anterior: un UPDATE por par (id, calificación) con executemany,
+   con los triggers por fila de auditoría, updated_at y agregados
+2. CRUDOperations.batch_update_grades(): validación previa, carga en una
+   tabla temporal y un solo UPDATE ... FROM, con auditoría y agregados
+   escritos por conjunto
+
+El camino anterior se mide sobre las primeras --legacy-rows inscripciones
+(a este ritmo, el millón completo tarda mucho); la comparación es en filas
+por segundo. Al final se verifica que los agregados coincidan con el cálculo
+desde cero y que haya una entrada de auditoría por fila modificada.
+
+Uso:
+    python benchmarks/bench_grade_updates.py [--rows 1000000] [--legacy-rows 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Agregar el directorio raíz al path para importar los módulos
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.database.connection import DatabaseConnection
+from src.database.crud_operations import CRUDOperations
+from bench_row_materialization import load_enrollments
+
+COURSE_TOTALS = """
+SELECT c.id, COALESCE(SUM(e.grade), 0), COUNT(e.grade), MIN(e.grade), MAX(e.grade)
+FROM courses c LEFT JOIN enrollments e ON e.course_id = c.id
+GROUP BY c.id ORDER BY c.id
+"""
+
+COURSE_AGGREGATES = """
+SELECT course_id, grade_sum, grade_count, grade_min, grade_max
+FROM course_aggregates ORDER BY course_id
+"""
+
+def open_database(db_path: str) -> DatabaseConnection:
+    """Crea una instancia nueva de DatabaseConnection (ignorando el singleton)"""
+    DatabaseConnection._instance = None
+    return DatabaseConnection(db_path, profile='bulk-load')
+
+def new_grades(rows: int, offset: int = 0):
+    """Una calificación nueva (0-100, con dos decimales) por inscripción"""
+    rng = random.Random(rows + offset)
+    return [(enrollment_id, round(rng.uniform(0, 100), 2)) for enrollment_id in range(1, rows + 1)]
+
+def per_row_path(db: DatabaseConnection, grade_updates) -> float:
+    """Un UPDATE por par, con los triggers por fila"""
+    started = time.perf_counter()
+    with db.transaction() as cursor:
+        cursor.executemany("UPDATE enrollments SET grade = ? WHERE id = ?",
+                           [(grade, enrollment_id) for enrollment_id, grade in grade_updates])
+    return time.perf_counter() - started
+
+def set_based_path(db: DatabaseConnection, grade_updates) -> float:
+    """Validación, tabla temporal y un solo UPDATE ... FROM"""
+    started = time.perf_counter()
+    result = CRUDOperations().batch_update_grades(grade_updates)
+    elapsed = time.perf_counter() - started
+    assert len(result.updated) + len(result.unchanged) == len(grade_updates), result
+    return elapsed
+
+def rounded(rows):
+    return [tuple(round(value, 6) if isinstance(value, float) else value for value in row) for row in rows]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de publicación masiva de calificaciones")
+    parser.add_argument("--rows", type=int, default=1000000, help="Calificaciones a publicar")
+    parser.add_argument("--legacy-rows", type=int, default=100000,
+                        help="Filas para medir el camino anterior")
+    args = parser.parse_args()
+    legacy_rows = min(args.legacy_rows, args.rows)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = open_database(os.path.join(temp_dir, "bench.db"))
+        load_enrollments(db, args.rows)
+
+        per_row = per_row_path(db, new_grades(legacy_rows, 1))
+        db.execute_non_query("DELETE FROM audit_log")
+        set_based = set_based_path(db, new_grades(args.rows, 2))
+
+        audited = db.execute_scalar("SELECT COUNT(*) FROM audit_log WHERE table_name = 'enrollments'")
+        exact = rounded(db.execute_query(COURSE_AGGREGATES)) == rounded(db.execute_query(COURSE_TOTALS))
+        db.disconnect()
+
+    print()
+    print(f"{'Estrategia':<36}{'Filas':>10}{'Tiempo (s)':>12}{'Filas/s':>12}{'Aceleración':>13}")
+    print("-" * 83)
+    baseline = legacy_rows / per_row
+    for name, rows, seconds in (("UPDATE por par (anterior)", legacy_rows, per_row),
+                                ("batch_update_grades()", args.rows, set_based)):
+        print(f"{name:<36}{rows:>10}{seconds:>12.2f}{rows / seconds:>12.0f}"
+              f"{rows / seconds / baseline:>12.1f}x")
+    print()
+    print(f"Entradas de auditoría: {audited}   Agregados por curso exactos: {'sí' if exact else 'NO'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark de perfiles de rendimiento (PRAGMA)
+
+Compara el rendimiento de inserción y lectura de cada perfil definido en
+PRAGMA_PROFILES usando una base de datos temporal por perfil.
+
+Uso:
+    python benchmarks/bench_pragma_profiles.py [--rows 2000] [--reads 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Agregar el directorio raíz al path para importar los módulos
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.database.connection import DatabaseConnection, PRAGMA_PROFILES
+
+def open_database(db_path: str, profile: str) -> DatabaseConnection:
+    """Crea una instancia nueva de DatabaseConnection (ignorando el singleton)"""
+    DatabaseConnection._instance = None
+    return DatabaseConnection(db_path, profile=profile)
+
+def bench_profile(profile: str, rows: int, reads: int) -> dict:
+    """Mide inserciones (una transacción por fila) y lecturas por clave"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = open_database(os.path.join(temp_dir, "bench.db"), profile)
+
+        started = time.perf_counter()
+        for i in range(rows):
+            db.execute_non_query(
+                "INSERT INTO students (first_name, last_name, email) VALUES (?, ?, ?)",
+                (f"Nombre{i}", f"Apellido{i}", f"bench{i}@test.com")
+            )
+        insert_time = time.perf_counter() - started
+
+        max_id = db.execute_scalar("SELECT MAX(id) FROM students")
+        ids = [random.randint(1, max_id) for _ in range(reads)]
+        started = time.perf_counter()
+        for student_id in ids:
+            db.execute_query("SELECT * FROM students WHERE id = ?", (student_id,))
+        read_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        db.execute_query("SELECT * FROM students ORDER BY last_name, first_name")
+        scan_time = time.perf_counter() - started
+
+        db.disconnect()
+
+    return {
+        'profile': profile,
+        'inserts_per_sec': rows / insert_time,
+        'reads_per_sec': reads / read_time,
+        'scan_ms': scan_time * 1000
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de perfiles PRAGMA")
+    parser.add_argument("--rows", type=int, default=2000, help="Filas a insertar")
+    parser.add_argument("--reads", type=int, default=20000, help="Lecturas por clave")
+    args = parser.parse_args()
+
+    results = [bench_profile(profile, args.rows, args.reads) for profile in PRAGMA_PROFILES]
+
+    print()
+    print(f"{'Perfil':<24}{'Inserts/s':>12}{'Lecturas/s':>14}{'Scan (ms)':>12}")
+    print("-" * 62)
+    for result in results:
+        print(f"{result['profile']:<24}{result['inserts_per_sec']:>12.0f}"
+              f"{result['reads_per_sec']:>14.0f}{result['scan_ms']:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark de materialización de filas
+
+Carga N inscripciones en una base temporal y mide el tiempo y la memoria pico
+necesarios para convertirlas todas en objetos Enrollment con:
+
+1. El camino anterior: sqlite3.Row -> dict -> Enrollment(**kwargs) con __dict__
+2. sqlite3.Row -> dict -> kwargs sobre el modelo actual con __slots__
+3. La fábrica compilada (execute_query(..., model=Enrollment))
+
+Uso:
+    python benchmarks/bench_row_materialization.py [--rows 1000000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Agregar el directorio raíz al path para importar los módulos
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.database.connection import DatabaseConnection
+from src.database.dao import Enrollment
+
+QUERY = "SELECT * FROM enrollments"
+
+class LegacyEnrollment:
+    """Modelo Enrollment tal como era antes de __slots__ (con __dict__)"""
+
+    def __init__(self, id=None, student_id=None, course_id=None, enrollment_date=None,
+                 grade=None, status="enrolled", created_at=None, updated_at=None):
+        self.id = id
+        self.student_id = student_id
+        self.course_id = course_id
+        self.enrollment_date = enrollment_date
+        self.grade = grade
+        self.status = status
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+def open_database(db_path: str) -> DatabaseConnection:
+    """Crea una instancia nueva de DatabaseConnection (ignorando el singleton)"""
+    DatabaseConnection._instance = None
+    return DatabaseConnection(db_path, profile='bulk-load')
+
+def load_enrollments(db: DatabaseConnection, rows: int):
+    """Genera estudiantes x cursos hasta completar `rows` inscripciones"""
+    courses = 100
+    students = (rows + courses - 1) // courses
+    with db.transaction() as cursor:
+        cursor.execute(
+            """
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+            INSERT INTO students (first_name, last_name, email)
+            SELECT 'Nombre' || i, 'Apellido' || i, 'bench' || i || '@test.com' FROM n
+            """, (students,)
+        )
+        cursor.execute(
+            """
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+            INSERT INTO courses (name, code) SELECT 'Curso ' || i, 'BEN' || i FROM n
+            """, (courses,)
+        )
+        cursor.execute(
+            """
+            INSERT INTO enrollments (student_id, course_id, grade, status)
+            SELECT s.id, c.id, (s.id + c.id) % 100, 'completed'
+            FROM students s CROSS JOIN courses c
+            LIMIT ?
+            """, (rows,)
+        )
+
+def legacy_path(db: DatabaseConnection):
+    return [LegacyEnrollment(**dict(row)) for row in db.execute_query(QUERY)]
+
+def dict_path(db: DatabaseConnection):
+    return [Enrollment(**dict(row)) for row in db.execute_query(QUERY)]
+
+def compiled_path(db: DatabaseConnection):
+    return db.execute_query(QUERY, model=Enrollment)
+
+def measure(func, db: DatabaseConnection) -> dict:
+    """Tiempo (sin tracemalloc) y memoria pico (con tracemalloc) de una estrategia"""
+    gc.collect()
+    started = time.perf_counter()
+    objects = func(db)
+    elapsed = time.perf_counter() - started
+    count = len(objects)
+    del objects
+
+    gc.collect()
+    tracemalloc.start()
+    objects = func(db)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+
+    return {'seconds': elapsed, 'rows': count, 'peak_mb': peak / (1024 * 1024)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de materialización de filas")
+    parser.add_argument("--rows", type=int, default=1000000, help="Inscripciones a materializar")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = open_database(os.path.join(temp_dir, "bench.db"))
+        load_enrollments(db, args.rows)
+
+        strategies = [
+            ("Row -> dict -> __dict__ (anterior)", legacy_path),
+            ("Row -> dict -> __slots__", dict_path),
+            ("Fábrica compilada + __slots__", compiled_path)
+        ]
+        results = [(name, measure(func, db)) for name, func in strategies]
+        db.disconnect()
+
+    baseline = results[0][1]
+    print()
+    print(f"{'Estrategia':<38}{'Filas':>10}{'Tiempo (s)':>12}{'Pico (MB)':>12}{'Aceleración':>13}")
+    print("-" * 85)
+    for name, result in results:
+        print(f"{name:<38}{result['rows']:>10}{result['seconds']:>12.2f}{result['peak_mb']:>12.1f}"
+              f"{baseline['seconds'] / result['seconds']:>12.1f}x")
+
+if __name__ == "__main__":
+    main()
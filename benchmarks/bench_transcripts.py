@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark de historiales académicos por lotes
+
+Carga N estudiantes con varias inscripciones cada uno y mide el tiempo y la
+memoria pico de generar todos los historiales con:
+
+1. El camino anterior: una consulta JOIN por estudiante y el GPA en Python
+2. CRUDOperations.get_student_transcripts(): una sola consulta ordenada, GPA
+   y créditos calculados en SQL y agrupación al vuelo
+
+Uso:
+    python benchmarks/bench_transcripts.py [--students 20000] [--per-student 8]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Agregar el directorio raíz al path para importar los módulos
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.database.connection import DatabaseConnection
+from src.database.crud_operations import CRUDOperations
+
+COURSES = 50
+
+PER_STUDENT_QUERY = """
+SELECT s.first_name, s.last_name, s.email, c.name as course_name, c.code as course_code,
+       c.credits, e.grade, e.status, e.enrollment_date
+FROM students s
+JOIN enrollments e ON s.id = e.student_id
+JOIN courses c ON e.course_id = c.id
+WHERE s.id = ?
+ORDER BY e.enrollment_date
+"""
+
+def open_database(db_path: str) -> DatabaseConnection:
+    """Crea una instancia nueva de DatabaseConnection (ignorando el singleton)"""
+    DatabaseConnection._instance = None
+    return DatabaseConnection(db_path, profile='bulk-load')
+
+def load_data(db: DatabaseConnection, students: int, per_student: int):
+    """Genera estudiantes con per_student inscripciones cada uno"""
+    with db.transaction() as cursor:
+        cursor.execute(
+            """
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+            INSERT INTO students (first_name, last_name, email)
+            SELECT 'Nombre' || i, 'Apellido' || i, 'bench' || i || '@test.com' FROM n
+            """, (students,)
+        )
+        cursor.execute(
+            """
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+            INSERT INTO courses (name, code, credits) SELECT 'Curso ' || i, 'BEN' || i, 1 + i % 5 FROM n
+            """, (COURSES,)
+        )
+        cursor.execute(
+            """
+            WITH RECURSIVE k(j) AS (SELECT 0 UNION ALL SELECT j + 1 FROM k WHERE j < ? - 1)
+            INSERT INTO enrollments (student_id, course_id, grade, status, enrollment_date)
+            SELECT s.id, 1 + (s.id + k.j * 7) % ?,
+                   CASE WHEN k.j % 4 = 3 THEN NULL ELSE (s.id * 13 + k.j * 31) % 100 END,
+                   CASE WHEN k.j % 4 = 3 THEN 'enrolled' ELSE 'completed' END,
+                   date('2024-01-01', '+' || (k.j * 30) || ' days')
+            FROM students s CROSS JOIN k
+            """, (per_student, COURSES)
+        )
+
+def per_student_path(db: DatabaseConnection) -> int:
+    """Una consulta por estudiante y el GPA acumulado en Python"""
+    count = 0
+    for row in db.execute_query("SELECT id FROM students ORDER BY id"):
+        rows = db.execute_query(PER_STUDENT_QUERY, (row['id'],))
+        if not rows:
+            continue
+        total_credits = total_grade_points = 0
+        courses = []
+        for course in rows:
+            courses.append(dict(course))
+            if course['grade'] is not None and course['status'] == 'completed':
+                total_credits += course['credits']
+                total_grade_points += course['grade'] * course['credits']
+        _gpa = total_grade_points / total_credits if total_credits > 0 else 0
+        count += 1
+    return count
+
+def batch_path(db: DatabaseConnection) -> int:
+    """Una sola consulta ordenada con el GPA calculado en SQL"""
+    return sum(1 for _transcript in CRUDOperations().get_student_transcripts())
+
+def measure(func, db: DatabaseConnection) -> dict:
+    """Tiempo (sin tracemalloc) y memoria pico (con tracemalloc) de una estrategia"""
+    gc.collect()
+    db.reset_query_stats()
+    started = time.perf_counter()
+    count = func(db)
+    elapsed = time.perf_counter() - started
+    queries = db.get_query_stats()['total_queries']
+
+    gc.collect()
+    tracemalloc.start()
+    func(db)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'seconds': elapsed, 'students': count, 'queries': queries, 'peak_mb': peak / (1024 * 1024)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de historiales académicos por lotes")
+    parser.add_argument("--students", type=int, default=20000, help="Estudiantes a generar")
+    parser.add_argument("--per-student", type=int, default=8, help="Inscripciones por estudiante")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = open_database(os.path.join(temp_dir, "bench.db"))
+        load_data(db, args.students, args.per_student)
+
+        strategies = [
+            ("Consulta por estudiante (anterior)", per_student_path),
+            ("get_student_transcripts()", batch_path)
+        ]
+        results = [(name, measure(func, db)) for name, func in strategies]
+        db.disconnect()
+
+    baseline = results[0][1]
+    print()
+    print(f"{'Estrategia':<38}{'Historiales':>12}{'Consultas':>11}{'Tiempo (s)':>12}"
+          f"{'Pico (MB)':>11}{'Aceleración':>13}")
+    print("-" * 97)
+    for name, result in results:
+        print(f"{name:<38}{result['students']:>12}{result['queries']:>11}{result['seconds']:>12.2f}"
+              f"{result['peak_mb']:>11.1f}{baseline['seconds'] / result['seconds']:>12.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -31,7 +31,8 @@ from src.database import (
     StudentDAO, CourseDAO, EnrollmentDAO,
     CRUDOperations,
     DataNavigator, NavigationDirection, SortOrder,
-    ReportGenerator
+    ReportGenerator,
+    AsyncDAO, TkAsyncBridge
 )
 
 class DatabaseConceptsDemo:
@@ -45,11 +46,16 @@ class DatabaseConceptsDemo:
         self.root.geometry("1200x800")
         
         # Inicializar componentes de base de datos
-        self.db = DatabaseConnection()
+        self.db = DatabaseConnection(sample_data=True)
         self.crud = CRUDOperations()
         self.navigator = DataNavigator()
         self.report_generator = ReportGenerator()
         
+        # Las consultas lentas y los reportes se ejecutan fuera del hilo de Tk
+        self.bridge = TkAsyncBridge(self.root)
+        self.async_students = AsyncDAO(StudentDAO(), self.bridge.db)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         self.setup_ui()
         self.load_initial_data()
     
@@ -526,17 +532,15 @@ EJEMPLO EN NUESTRO SISTEMA:
             messagebox.showerror("Error", str(e))
     
     def search_by_name(self):
-        """Busca estudiantes por nombre"""
-        try:
-            name = self.entry_search_name.get().strip()
-            if not name:
-                messagebox.showerror("Error", "Ingrese un nombre para buscar")
-                return
-            
-            students = self.crud.find_students_by_name(name)
-            
+        """Busca estudiantes por nombre (en segundo plano)"""
+        name = self.entry_search_name.get().strip()
+        if not name:
+            messagebox.showerror("Error", "Ingrese un nombre para buscar")
+            return
+        
+        def show_results(students):
             result = f"✓ Búsqueda por nombre '{name}':\n"
-            result += f"SQL ejecutado: SELECT * FROM students WHERE first_name LIKE '%{name}%' OR last_name LIKE '%{name}%'\n"
+            result += f"SQL ejecutado: SELECT ... FROM students_fts WHERE students_fts MATCH '{name}*' ORDER BY rank\n"
             result += f"Encontrados {len(students)} estudiantes:\n"
             
             for student in students:
@@ -546,9 +550,12 @@ EJEMPLO EN NUESTRO SISTEMA:
             
             self.results_text.insert(tk.END, result)
             self.results_text.see(tk.END)
-            
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        
+        self.bridge.submit(
+            self.async_students.search_by_name(name),
+            on_success=show_results,
+            on_error=lambda e: messagebox.showerror("Error", str(e))
+        )
     
     def update_student(self):
         """Actualiza un estudiante"""
@@ -691,79 +698,73 @@ NAVEGACIÓN:
         self.current_record_text.insert(tk.END, record_info.strip())
     
     # Métodos de reportes
-    def generate_student_report(self, status_filter, format_type):
-        """Genera reporte de estudiantes"""
-        try:
-            filter_status = None if status_filter == "Todos" else status_filter
-            filepath = self.report_generator.generate_student_report(format_type.lower(), filter_status)
-            
-            result = f"✓ Reporte de estudiantes generado exitosamente!\n"
-            result += f"Archivo: {filepath}\n"
-            result += f"Formato: {format_type}\n"
-            result += f"Filtro: {status_filter}\n\n"
+    def run_report(self, description: str, details: str, func, *args):
+        """
+        Genera un reporte en segundo plano para no congelar la interfaz.
+        El resultado se muestra en el hilo de Tk cuando termina.
+        """
+        self.reports_text.insert(tk.END, f"⏳ Generando {description}...\n")
+        self.reports_text.see(tk.END)
+        
+        def on_success(filepath):
+            result = f"✓ {description.capitalize()} generado exitosamente!\n"
+            result += details
+            result += f"Archivo: {filepath}\n\n"
             
             self.reports_text.insert(tk.END, result)
             self.reports_text.see(tk.END)
             
             messagebox.showinfo("Éxito", f"Reporte generado: {filepath}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo generar el reporte: {str(e)}")
+        
+        def on_error(error):
+            messagebox.showerror("Error", f"No se pudo generar el {description}: {str(error)}")
+        
+        self.bridge.run_in_background(func, *args, on_success=on_success, on_error=on_error)
+    
+    def generate_student_report(self, status_filter, format_type):
+        """Genera reporte de estudiantes"""
+        filter_status = None if status_filter == "Todos" else status_filter
+        self.run_report(
+            "reporte de estudiantes",
+            f"Formato: {format_type}\nFiltro: {status_filter}\n",
+            self.report_generator.generate_student_report, format_type.lower(), filter_status
+        )
     
     def generate_course_report(self, format_type):
         """Genera reporte de cursos"""
-        try:
-            filepath = self.report_generator.generate_course_report(format_type.lower())
-            
-            result = f"✓ Reporte de cursos generado exitosamente!\n"
-            result += f"Archivo: {filepath}\n"
-            result += f"Formato: {format_type}\n\n"
-            
-            self.reports_text.insert(tk.END, result)
-            self.reports_text.see(tk.END)
-            
-            messagebox.showinfo("Éxito", f"Reporte generado: {filepath}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo generar el reporte: {str(e)}")
+        self.run_report(
+            "reporte de cursos",
+            f"Formato: {format_type}\n",
+            self.report_generator.generate_course_report, format_type.lower()
+        )
     
     def generate_statistics_report(self, format_type):
         """Genera reporte estadístico"""
-        try:
-            filepath = self.report_generator.generate_statistics_report(format_type.lower())
-            
-            result = f"✓ Reporte estadístico generado exitosamente!\n"
-            result += f"Archivo: {filepath}\n"
-            result += f"Formato: {format_type}\n\n"
-            
-            self.reports_text.insert(tk.END, result)
-            self.reports_text.see(tk.END)
-            
-            messagebox.showinfo("Éxito", f"Reporte generado: {filepath}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo generar el reporte: {str(e)}")
+        self.run_report(
+            "reporte estadístico",
+            f"Formato: {format_type}\n",
+            self.report_generator.generate_statistics_report, format_type.lower()
+        )
     
     def generate_transcript(self, student_id_str, format_type):
         """Genera historial académico"""
         try:
             student_id = int(student_id_str)
-            filepath = self.report_generator.generate_student_transcript(student_id, format_type.lower())
-            
-            result = f"✓ Historial académico generado exitosamente!\n"
-            result += f"Estudiante ID: {student_id}\n"
-            result += f"Archivo: {filepath}\n"
-            result += f"Formato: {format_type}\n\n"
-            
-            self.reports_text.insert(tk.END, result)
-            self.reports_text.see(tk.END)
-            
-            messagebox.showinfo("Éxito", f"Historial generado: {filepath}")
-            
         except ValueError:
             messagebox.showerror("Error", "ID de estudiante debe ser un número")
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo generar el historial: {str(e)}")
+            return
+        
+        self.run_report(
+            "historial académico",
+            f"Estudiante ID: {student_id}\nFormato: {format_type}\n",
+            self.report_generator.generate_student_transcript, student_id, format_type.lower()
+        )
+    
+    def on_close(self):
+        """Detiene las tareas en segundo plano y cierra la ventana"""
+        self.bridge.close()
+        self.navigator.close()
+        self.root.destroy()
     
     # Métodos de integridad referencial
     def show_relationships(self):
@@ -3,20 +3,41 @@ Módulo de Base de Datos
 Este módulo contiene todas las funcionalidades relacionadas con el manejo de bases de datos.
 """
 
-from .connection import DatabaseConnection
-from .dao import StudentDAO, CourseDAO, EnrollmentDAO
+from .connection import DatabaseConnection, PRAGMA_PROFILES
+from .connection_pool import ConnectionPool, PoolTimeoutError
+from .dao import StudentDAO, CourseDAO, EnrollmentDAO, BulkResult, UpsertResult, GradeUpdateResult
+from .pagination import Page, PageDirection
+from .audit import AuditDurability, AuditSink
+from .change_feed import ChangeFeed
+from .statistics import StatisticsService
 from .crud_operations import CRUDOperations
 from .data_navigator import DataNavigator, NavigationDirection, SortOrder
 from .report_generator import ReportGenerator
+from .async_connection import AsyncDatabaseConnection, AsyncDAO, TkAsyncBridge
 
 __all__ = [
     'DatabaseConnection',
+    'PRAGMA_PROFILES',
+    'ConnectionPool',
+    'PoolTimeoutError',
     'StudentDAO',
     'CourseDAO', 
     'EnrollmentDAO',
+    'BulkResult',
+    'UpsertResult',
+    'GradeUpdateResult',
+    'Page',
+    'PageDirection',
+    'AuditDurability',
+    'AuditSink',
+    'ChangeFeed',
+    'StatisticsService',
     'CRUDOperations',
     'DataNavigator',
     'NavigationDirection',
     'SortOrder',
-    'ReportGenerator'
+    'ReportGenerator',
+    'AsyncDatabaseConnection',
+    'AsyncDAO',
+    'TkAsyncBridge'
 ]
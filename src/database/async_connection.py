@@ -0,0 +1,171 @@
+"""
+Acceso Asíncrono a la Base de Datos
+
+Tkinter ejecuta toda la interfaz en un único hilo (el "event loop" de Tk).
+Si una consulta lenta se ejecuta en ese hilo, la ventana deja de redibujarse
+y parece congelada. Este módulo ofrece:
+
+- AsyncDatabaseConnection: versión "awaitable" de DatabaseConnection; cada
+  operación se ejecuta en un pool de hilos dedicado a la base de datos
+- AsyncDAO: envoltorio que convierte los métodos de cualquier DAO en corutinas
+- TkAsyncBridge: puente que ejecuta corutinas en un event loop de asyncio en
+  segundo plano y entrega los resultados al hilo de Tk mediante root.after
+
+Ejemplo:
+    bridge = TkAsyncBridge(root)
+    students = AsyncDAO(StudentDAO(), bridge.db)
+    bridge.submit(students.search_by_name("ana"), on_success=mostrar_resultados)
+"""
+
+import asyncio
+import functools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, List, Optional, Tuple
+import sqlite3
+
+from .connection import DatabaseConnection
+
+
+class AsyncDatabaseConnection:
+    """
+    Fachada asíncrona sobre DatabaseConnection.
+    Las operaciones se ejecutan en hilos dedicados; cada hilo toma su propia
+    conexión del pool, por lo que varias consultas pueden avanzar en paralelo.
+    """
+
+    def __init__(self, db: DatabaseConnection = None, max_workers: int = None):
+        self.db = db or DatabaseConnection()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or self.db.pool.size,
+            thread_name_prefix="db-worker"
+        )
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Ejecuta una función síncrona en el pool de hilos de la base de datos"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def execute_query(self, query: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        """Versión asíncrona de DatabaseConnection.execute_query"""
+        return await self.run(self.db.execute_query, query, params)
+
+    async def execute_non_query(self, query: str, params: Tuple = ()) -> int:
+        """Versión asíncrona de DatabaseConnection.execute_non_query"""
+        return await self.run(self.db.execute_non_query, query, params)
+
+    async def execute_scalar(self, query: str, params: Tuple = ()) -> Any:
+        """Versión asíncrona de DatabaseConnection.execute_scalar"""
+        return await self.run(self.db.execute_scalar, query, params)
+
+    def shutdown(self, wait: bool = True):
+        """Detiene los hilos de trabajo"""
+        self._executor.shutdown(wait=wait)
+
+
+class AsyncDAO:
+    """
+    Envoltorio asíncrono para un DAO (StudentDAO, CourseDAO, EnrollmentDAO).
+    Cualquier método público del DAO se expone como corutina:
+
+        students = AsyncDAO(StudentDAO(), async_db)
+        student_id = await students.create(student)
+        ok = await students.update(student)
+    """
+
+    def __init__(self, dao, async_db: AsyncDatabaseConnection):
+        self._dao = dao
+        self._async_db = async_db
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._dao, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        async def method(*args, **kwargs):
+            return await self._async_db.run(attribute, *args, **kwargs)
+
+        method.__name__ = name
+        method.__doc__ = attribute.__doc__
+        return method
+
+
+class TkAsyncBridge:
+    """
+    Puente entre asyncio y el event loop de Tkinter.
+
+    El event loop de asyncio corre en un hilo propio. Los resultados se
+    depositan en una cola que el hilo de Tk revisa periódicamente con
+    root.after, de modo que los callbacks siempre se ejecutan en el hilo de Tk
+    y pueden actualizar widgets de forma segura.
+    """
+
+    def __init__(self, root, db: AsyncDatabaseConnection = None, poll_interval: int = 50):
+        self.root = root
+        self.db = db or AsyncDatabaseConnection()
+        self.poll_interval = poll_interval
+
+        self._results = queue.Queue()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="asyncio-db", daemon=True)
+        self._thread.start()
+        self._poll_id = self.root.after(self.poll_interval, self._poll)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, coroutine, on_success: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None) -> Future:
+        """
+        Programa una corutina en segundo plano.
+        on_success/on_error se invocan en el hilo de Tk.
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        future.add_done_callback(
+            lambda done: self._results.put((done, on_success, on_error))
+        )
+        return future
+
+    def run_in_background(self, func: Callable, *args,
+                          on_success: Optional[Callable[[Any], None]] = None,
+                          on_error: Optional[Callable[[Exception], None]] = None,
+                          **kwargs) -> Future:
+        """
+        Ejecuta una función síncrona (por ejemplo, la generación de un reporte)
+        en los hilos de la base de datos sin bloquear la interfaz
+        """
+        return self.submit(self.db.run(func, *args, **kwargs), on_success, on_error)
+
+    def _poll(self):
+        """Entrega al hilo de Tk los resultados terminados"""
+        while True:
+            try:
+                future, on_success, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                if on_error:
+                    on_error(error)
+                else:
+                    print(f"✗ Error en operación asíncrona: {error}")
+            elif on_success:
+                on_success(future.result())
+
+        self._poll_id = self.root.after(self.poll_interval, self._poll)
+
+    def close(self):
+        """Detiene el event loop y los hilos de trabajo"""
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        if not self._loop.is_running():
+            self._loop.close()
+        self.db.shutdown(wait=False)
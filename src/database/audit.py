@@ -0,0 +1,287 @@
+"""
+Registro de Auditoría con Buffer
+
+Los cambios de filas de students, courses y enrollments los registran los
+triggers de la migración 5 dentro de la misma sentencia. Este módulo queda
+para los eventos de aplicación que no modifican filas (db.audit.log; por
+ejemplo, ReportGenerator registra cada exportación de datos): acumula las
+entradas en memoria y las escribe por lotes (executemany) en un destino
+intercambiable (AuditSink; por defecto la tabla audit_log).
+
+Niveles de durabilidad:
+
+- sync: cada entrada se escribe en cuanto se registra (comportamiento anterior)
+- on-commit: las entradas de una transacción se escriben juntas justo antes de
+  su COMMIT, de modo que datos y auditoría se confirman (o revierten) a la vez
+- best-effort: al confirmarse la transacción las entradas pasan a un buffer
+  compartido y acotado que un hilo de fondo vacía por tamaño o por tiempo.
+  Si el proceso termina antes del vaciado, las entradas pendientes se pierden.
+
+En todos los niveles, las entradas de una transacción (o SAVEPOINT) revertida
+se descartan. Los valores se guardan como JSON.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# (table_name, operation, record_id, old_values, new_values, user_id, timestamp)
+AuditEntry = Tuple[str, str, Optional[int], Optional[str], Optional[str], str, str]
+
+
+class AuditDurability(Enum):
+    """Momento en que las entradas de auditoría llegan al destino"""
+    SYNC = "sync"
+    ON_COMMIT = "on-commit"
+    BEST_EFFORT = "best-effort"
+
+
+def to_json(values: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Serializa una imagen de registro (fechas y otros tipos como texto)"""
+    if values is None:
+        return None
+    return json.dumps(values, ensure_ascii=False, default=str)
+
+
+class AuditSink:
+    """
+    Destino de las entradas de auditoría. Las subclases implementan write();
+    cursor es el de la transacción en curso, de modo que un destino en la
+    propia base de datos escribe dentro del mismo COMMIT.
+    """
+
+    def write(self, cursor, entries: Sequence[AuditEntry]):
+        raise NotImplementedError
+
+
+class TableAuditSink(AuditSink):
+    """Escribe las entradas en la tabla audit_log con un solo executemany"""
+
+    def write(self, cursor, entries: Sequence[AuditEntry]):
+        cursor.executemany(
+            """INSERT INTO audit_log (table_name, operation, record_id, old_values, new_values,
+                                      user_id, timestamp)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            entries
+        )
+
+
+class AuditWriter:
+    """
+    Acumula entradas de auditoría y las entrega al destino según la
+    durabilidad elegida. DatabaseConnection.transaction() le avisa de cada
+    bloque que empieza, se revierte o se confirma.
+    """
+
+    def __init__(self, db, durability: AuditDurability = AuditDurability.ON_COMMIT,
+                 sink: Optional[AuditSink] = None, max_buffer: int = 1000,
+                 batch_size: int = 100, flush_interval: float = 1.0):
+        self.db = db
+        try:
+            self.durability = AuditDurability(durability)
+        except ValueError:
+            raise ValueError(f"Durabilidad de auditoría desconocida: {durability}")
+        self.sink = sink or TableAuditSink()
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._local = threading.local()
+        self._buffer: deque = deque()
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    # ========================================
+    # REGISTRO DE ENTRADAS
+    # ========================================
+
+    def log(self, table_name: str, operation: str, record_id: int = None,
+            old_values: Dict[str, Any] = None, new_values: Dict[str, Any] = None,
+            user_id: str = "system"):
+        """Registra una operación"""
+        self.log_many(table_name, operation, [(record_id, old_values, new_values)], user_id)
+
+    def log_many(self, table_name: str, operation: str, entries: Sequence[tuple],
+                 user_id: str = "system"):
+        """Registra varias operaciones; cada entrada es (record_id, old_values, new_values)"""
+        if not entries:
+            return
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+        rows = [(table_name, operation, record_id, to_json(old_values), to_json(new_values),
+                 user_id, timestamp)
+                for record_id, old_values, new_values in entries]
+
+        if self.durability == AuditDurability.SYNC or (
+                not self.db.in_transaction and self.durability == AuditDurability.ON_COMMIT):
+            self._write(rows)
+        elif not self.db.in_transaction:
+            self._enqueue(rows)
+        else:
+            self._pending().extend(rows)
+
+    def _pending(self) -> List[AuditEntry]:
+        pending = getattr(self._local, 'pending', None)
+        if pending is None:
+            pending = self._local.pending = []
+        return pending
+
+    # ========================================
+    # GANCHOS DE TRANSACCIÓN
+    # ========================================
+
+    def mark(self) -> int:
+        """Posición actual de las entradas pendientes del hilo (al abrir un bloque)"""
+        return len(self._pending())
+
+    def discard(self, mark: int):
+        """Descarta las entradas registradas desde mark (el bloque se revirtió)"""
+        del self._pending()[mark:]
+
+    def before_commit(self, cursor):
+        """Llamado justo antes del COMMIT de la transacción externa"""
+        pending = self._pending()
+        if not pending:
+            return
+        entries = list(pending)
+        pending.clear()
+        if self.durability == AuditDurability.BEST_EFFORT:
+            self._local.committing = entries
+        else:
+            self._write(entries, cursor)
+
+    def after_commit(self):
+        """Llamado después del COMMIT: las entradas best-effort pasan al buffer"""
+        entries = getattr(self._local, 'committing', None)
+        if entries:
+            self._local.committing = None
+            self._enqueue(entries)
+
+    # ========================================
+    # BUFFER Y VACIADO
+    # ========================================
+
+    def _enqueue(self, entries: List[AuditEntry]):
+        with self._condition:
+            self._buffer.extend(entries)
+            depth = len(self._buffer)
+            full = depth >= self.max_buffer
+            if depth >= self.batch_size:
+                self._condition.notify()
+        with self._stats_lock:
+            self._max_depth = max(self._max_depth, depth)
+        self._ensure_flusher()
+        if full:
+            # Buffer lleno: quien escribe espera al vaciado (no se pierden entradas)
+            with self._stats_lock:
+                self._forced_flushes += 1
+            self.flush()
+
+    def _ensure_flusher(self):
+        if self._flusher is not None or self._closed:
+            return
+        with self._condition:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._run, name="audit-flusher", daemon=True)
+                self._flusher.start()
+
+    def _run(self):
+        """Hilo de fondo: vacía al llegar a batch_size o cada flush_interval segundos"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or len(self._buffer) >= self.batch_size,
+                    timeout=self.flush_interval
+                )
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def flush(self) -> int:
+        """Escribe todas las entradas del buffer compartido; retorna cuántas"""
+        with self._flush_lock:
+            with self._condition:
+                entries = list(self._buffer)
+                self._buffer.clear()
+            if entries:
+                self._write(entries)
+            return len(entries)
+
+    def _write(self, entries: List[AuditEntry], cursor=None):
+        """Entrega un lote al destino y mide la latencia del vaciado"""
+        started = time.perf_counter()
+        try:
+            if cursor is not None:
+                self.sink.write(cursor, entries)
+            else:
+                with self.db.transaction() as own_cursor:
+                    self.sink.write(own_cursor, entries)
+        except Exception as e:
+            # No fallar la operación principal si no se puede registrar el log
+            with self._stats_lock:
+                self._failed += len(entries)
+            print(f"✗ No se pudo escribir la auditoría: {e}")
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self._flushes += 1
+            self._written += len(entries)
+            self._flush_total_ms += elapsed_ms
+            self._flush_max_ms = max(self._flush_max_ms, elapsed_ms)
+            self._flush_last_ms = elapsed_ms
+
+    def close(self):
+        """Detiene el hilo de fondo y escribe lo que quede en el buffer"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            flusher = self._flusher
+        if flusher is not None:
+            flusher.join()
+        self.flush()
+
+    # ========================================
+    # MÉTRICAS
+    # ========================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Profundidad del buffer, lotes escritos y latencia de vaciado"""
+        with self._condition:
+            depth = len(self._buffer)
+        with self._stats_lock:
+            flushes = self._flushes
+            return {
+                'durability': self.durability.value,
+                'sink': type(self.sink).__name__,
+                'buffer_depth': depth,
+                'max_buffer_depth': self._max_depth,
+                'max_buffer': self.max_buffer,
+                'pending_in_transaction': len(self._pending()),
+                'flushes': flushes,
+                'forced_flushes': self._forced_flushes,
+                'entries_written': self._written,
+                'entries_failed': self._failed,
+                'flush_ms': {
+                    'last': round(self._flush_last_ms, 3),
+                    'avg': round(self._flush_total_ms / flushes, 3) if flushes else 0.0,
+                    'max': round(self._flush_max_ms, 3)
+                }
+            }
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._flushes = 0
+            self._forced_flushes = 0
+            self._written = 0
+            self._failed = 0
+            self._max_depth = 0
+            self._flush_total_ms = 0.0
+            self._flush_max_ms = 0.0
+            self._flush_last_ms = 0.0
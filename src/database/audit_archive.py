@@ -0,0 +1,315 @@
+"""
+Retención de la Auditoría: Rotación a Archivos, Compactación e Historial
+
+La tabla audit_log crece con cada escritura. Para que la base principal no
+crezca sin límite, las filas antiguas se mueven ("rotan") a bases de datos de
+archivo, una por año (p. ej. school_database_audit_2024.db):
+
+    ATTACH DATABASE 'school_database_audit_2024.db' AS audit_archive;
+    BEGIN IMMEDIATE;
+    INSERT OR IGNORE INTO audit_archive.audit_log SELECT ... FROM main.audit_log WHERE ...;
+    DELETE FROM main.audit_log WHERE ...;
+    COMMIT;
+    DETACH DATABASE audit_archive;
+
+La rotación puede ser por antigüedad (max_age_days), por tamaño (max_rows:
+se conservan las N filas más recientes) o ambas. Los archivos tienen el mismo
+índice (table_name, record_id, timestamp) que la tabla viva, y la tabla
+audit_archives de la base principal guarda el rango de fechas de cada uno,
+de modo que history() solo abre los archivos que pueden tener filas del
+período pedido y en cada uno hace una búsqueda por índice.
+
+Con journal_mode=WAL el COMMIT sobre varias bases no es atómico entre ellas:
+tras una caída una fila podría quedar en ambos lados, pero nunca perderse.
+El INSERT OR IGNORE (que conserva el id original) hace que repetir la
+rotación sea seguro, e history() elimina duplicados por id.
+
+Uso desde la línea de comandos:
+    python -m src.database.audit_archive rollover --max-age-days 90
+    python -m src.database.audit_archive compact
+    python -m src.database.audit_archive history students 42
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_COLUMNS = "id, table_name, operation, record_id, old_values, new_values, user_id, timestamp"
+
+_ARCHIVE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS audit_archive.audit_log (
+        id INTEGER PRIMARY KEY,
+        table_name TEXT NOT NULL,
+        operation TEXT NOT NULL,
+        record_id INTEGER,
+        old_values TEXT,
+        new_values TEXT,
+        user_id TEXT,
+        timestamp TIMESTAMP
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS audit_archive.idx_audit_log_record
+    ON audit_log(table_name, record_id, timestamp)
+    """
+]
+
+
+def _decode(values: Optional[str]) -> Any:
+    """Imagen de un registro; las filas anteriores a JSON se retornan como texto"""
+    if values is None:
+        return None
+    try:
+        return json.loads(values)
+    except ValueError:
+        return values
+
+
+class AuditArchive:
+    """
+    Rotación, compactación y consulta de la auditoría viva más sus archivos
+    """
+
+    def __init__(self, db, archive_dir: Optional[str] = None):
+        self.db = db
+        db_path = os.path.abspath(db.db_path)
+        self.archive_dir = os.path.abspath(archive_dir or os.path.join(os.path.dirname(db_path), "audit_archive"))
+        self._stem = os.path.splitext(os.path.basename(db_path))[0]
+
+    def archive_path(self, year: str) -> str:
+        """Archivo que guarda las filas de auditoría de un año"""
+        return os.path.join(self.archive_dir, f"{self._stem}_audit_{year}.db")
+
+    def _check_no_transaction(self):
+        # ATTACH, DETACH y VACUUM no pueden ejecutarse dentro de una transacción
+        if self.db.in_transaction:
+            raise RuntimeError("La retención de la auditoría no puede ejecutarse dentro de una transacción")
+
+    # ========================================
+    # ROTACIÓN
+    # ========================================
+
+    def rollover(self, max_age_days: Optional[float] = None,
+                 max_rows: Optional[int] = None) -> Dict[str, int]:
+        """
+        Mueve a los archivos las filas con más de max_age_days días y/o las que
+        exceden las max_rows más recientes. Retorna las filas movidas por archivo.
+        """
+        if max_age_days is None and max_rows is None:
+            raise ValueError("Indique max_age_days, max_rows o ambos")
+        self._check_no_transaction()
+        # Las entradas aún en el buffer (modo best-effort) son las más nuevas
+        self.db.flush_audit()
+
+        conditions, params = [], []
+        if max_age_days is not None:
+            cutoff = time.strftime(_TIMESTAMP_FORMAT, time.gmtime(time.time() - max_age_days * 86400))
+            conditions.append("timestamp < ?")
+            params.append(cutoff)
+        if max_rows is not None:
+            boundary = self.db.execute_scalar(
+                "SELECT id FROM audit_log ORDER BY id DESC LIMIT 1 OFFSET ?", (max_rows,)
+            )
+            if boundary is not None:
+                conditions.append("id <= ?")
+                params.append(boundary)
+        if not conditions:
+            return {}
+
+        where = " OR ".join(conditions)
+        years = [row[0] for row in self.db.execute_query(
+            f"SELECT DISTINCT substr(timestamp, 1, 4) FROM audit_log WHERE {where}", tuple(params)
+        ) if row[0]]
+
+        moved = {}
+        for year in years:
+            path = self.archive_path(year)
+            # Límites con fecha completa: timestamp tiene afinidad NUMERIC y un
+            # '2024' suelto se compararía como número, no como texto
+            count = self._move(path, f"({where}) AND timestamp >= ? AND timestamp < ?",
+                               params + [f"{year}-01-01", f"{int(year) + 1}-01-01"])
+            if count:
+                moved[path] = count
+        if moved:
+            print(f"✓ Auditoría rotada: {sum(moved.values())} filas a {len(moved)} archivo(s)")
+        return moved
+
+    def _move(self, path: str, where: str, params: List[Any]) -> int:
+        """Copia las filas al archivo y las borra de la tabla viva en una transacción"""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        with self.db.pool.connection() as conn:
+            conn.execute("ATTACH DATABASE ? AS audit_archive", (path,))
+            try:
+                with self.db.transaction() as cursor:
+                    for statement in _ARCHIVE_SCHEMA:
+                        cursor.execute(statement)
+                    cursor.execute(
+                        f"INSERT OR IGNORE INTO audit_archive.audit_log ({_COLUMNS}) "
+                        f"SELECT {_COLUMNS} FROM main.audit_log WHERE {where}", params
+                    )
+                    cursor.execute(f"DELETE FROM main.audit_log WHERE {where}", params)
+                    count = cursor.rowcount
+                    first, last, rows = cursor.execute(
+                        "SELECT MIN(timestamp), MAX(timestamp), COUNT(*) FROM audit_archive.audit_log"
+                    ).fetchone()
+                    cursor.execute(
+                        """INSERT INTO main.audit_archives (path, first_timestamp, last_timestamp, row_count)
+                           VALUES (?, ?, ?, ?)
+                           ON CONFLICT(path) DO UPDATE SET
+                               first_timestamp = excluded.first_timestamp,
+                               last_timestamp = excluded.last_timestamp,
+                               row_count = excluded.row_count,
+                               updated_at = CURRENT_TIMESTAMP""",
+                        (path, first, last, rows)
+                    )
+                return count
+            finally:
+                conn.execute("DETACH DATABASE audit_archive")
+
+    # ========================================
+    # COMPACTACIÓN
+    # ========================================
+
+    def compact(self, archives: bool = True) -> Dict[str, Dict[str, int]]:
+        """
+        VACUUM de la base principal (y de los archivos) para devolver al
+        sistema de archivos el espacio que dejaron las filas rotadas.
+        Retorna el tamaño en bytes antes y después de cada archivo.
+        """
+        self._check_no_transaction()
+        self.db.flush_audit()
+        results = {}
+
+        before = os.path.getsize(self.db.db_path)
+        with self.db.pool.connection() as conn:
+            conn.execute("VACUUM")
+            # En modo WAL el archivo principal se reduce al volcar el WAL
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("PRAGMA optimize")
+        results[os.path.abspath(self.db.db_path)] = {
+            'bytes_before': before, 'bytes_after': os.path.getsize(self.db.db_path)
+        }
+
+        if archives:
+            for archive in self.list_archives():
+                path = archive['path']
+                if not os.path.exists(path):
+                    continue
+                before = os.path.getsize(path)
+                connection = sqlite3.connect(path)
+                try:
+                    connection.execute("VACUUM")
+                finally:
+                    connection.close()
+                results[path] = {'bytes_before': before, 'bytes_after': os.path.getsize(path)}
+
+        print(f"✓ Auditoría compactada: {len(results)} archivo(s)")
+        return results
+
+    # ========================================
+    # CONSULTA DEL HISTORIAL
+    # ========================================
+
+    def list_archives(self) -> List[Dict[str, Any]]:
+        """Archivos registrados en el catálogo, del más antiguo al más reciente"""
+        rows = self.db.execute_query(
+            "SELECT path, first_timestamp, last_timestamp, row_count FROM audit_archives "
+            "ORDER BY first_timestamp"
+        )
+        return [dict(row) for row in rows]
+
+    def history(self, table_name: str, record_id: int, since: Optional[str] = None,
+                until: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Historial de un registro (tabla viva más archivos), del más antiguo al
+        más reciente. since/until acotan por timestamp ('YYYY-MM-DD[ HH:MM:SS]')
+        y evitan abrir los archivos fuera del período.
+        """
+        conditions = ["table_name = ?", "record_id = ?"]
+        params: List[Any] = [table_name, record_id]
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("timestamp <= ?")
+            params.append(until)
+        query = (f"SELECT {_COLUMNS} FROM audit_log WHERE {' AND '.join(conditions)} "
+                 f"ORDER BY timestamp, id")
+
+        entries: Dict[int, Dict[str, Any]] = {}
+        for archive in self.list_archives():
+            if since is not None and archive['last_timestamp'] and archive['last_timestamp'] < since:
+                continue
+            if until is not None and archive['first_timestamp'] and archive['first_timestamp'] > until:
+                continue
+            for row in self._query_archive(archive['path'], query, params):
+                entries.setdefault(row['id'], self._entry(row, os.path.basename(archive['path'])))
+        for row in self.db.execute_query(query, tuple(params)):
+            entries.setdefault(row['id'], self._entry(row, "live"))
+
+        return sorted(entries.values(), key=lambda entry: (entry['timestamp'] or "", entry['id']))
+
+    def _query_archive(self, path: str, query: str, params: List[Any]) -> List[sqlite3.Row]:
+        """Consulta un archivo en modo de solo lectura (sin ATTACH sobre el pool)"""
+        if not os.path.exists(path):
+            return []
+        connection = sqlite3.connect(f"file:{quote(path)}?mode=ro", uri=True)
+        connection.row_factory = sqlite3.Row
+        try:
+            return connection.execute(query, params).fetchall()
+        finally:
+            connection.close()
+
+    def _entry(self, row: sqlite3.Row, source: str) -> Dict[str, Any]:
+        entry = dict(row)
+        entry['old_values'] = _decode(entry['old_values'])
+        entry['new_values'] = _decode(entry['new_values'])
+        entry['source'] = source
+        return entry
+
+
+def main():
+    from .connection import DatabaseConnection
+
+    parser = argparse.ArgumentParser(description="Retención de la auditoría")
+    parser.add_argument("--db", default="school_database.db", help="Base de datos principal")
+    parser.add_argument("--archive-dir", default=None, help="Directorio de los archivos de auditoría")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rollover = commands.add_parser("rollover", help="Mueve las filas antiguas a los archivos")
+    rollover.add_argument("--max-age-days", type=float, default=None)
+    rollover.add_argument("--max-rows", type=int, default=None)
+
+    compact = commands.add_parser("compact", help="VACUUM de la base principal y los archivos")
+    compact.add_argument("--skip-archives", action="store_true")
+
+    history = commands.add_parser("history", help="Historial de un registro")
+    history.add_argument("table_name")
+    history.add_argument("record_id", type=int)
+
+    args = parser.parse_args()
+    db = DatabaseConnection(args.db)
+    archive = AuditArchive(db, args.archive_dir)
+    try:
+        if args.command == "rollover":
+            for path, count in archive.rollover(args.max_age_days, args.max_rows).items():
+                print(f"  {path}: {count} filas")
+        elif args.command == "compact":
+            for path, sizes in archive.compact(not args.skip_archives).items():
+                print(f"  {path}: {sizes['bytes_before']} -> {sizes['bytes_after']} bytes")
+        else:
+            for entry in archive.history(args.table_name, args.record_id):
+                print(f"  {entry['timestamp']}  {entry['operation']:<7} [{entry['source']}]")
+    finally:
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Flujo de Cambios (Change Feed)
+
+Los triggers de auditoría (migración 5) escriben en audit_log una fila por
+cada INSERT, UPDATE o DELETE de students, courses y enrollments, con la
+imagen nueva del registro. Como audit_log.id es AUTOINCREMENT y SQLite
+admite un solo escritor a la vez, ese id es una secuencia monótona en el
+orden de los COMMIT: un consumidor que recuerda el último id que procesó
+puede pedir solo lo que cambió después.
+
+    feed = ChangeFeed(db)
+    seq = feed.current_seq()
+    ...
+    if feed.has_changed():                      # PRAGMA data_version, sin leer tablas
+        for change in feed.changes_since(seq, tables=("students",)):
+            ...
+            seq = change.seq
+
+has_changed() usa PRAGMA data_version en una conexión propia de solo
+lectura: el valor cambia cuando cualquier otra conexión (del pool o de otro
+proceso) confirma una escritura, así que sondearlo no toca ninguna tabla.
+
+Si la rotación de la auditoría (audit_archive.py) ya movió filas posteriores
+a seq, covers(seq) retorna False y el consumidor debe recargar completo.
+
+La conexión de sondeo se cierra con close(); DatabaseConnection.disconnect()
+cierra las de todos los flujos abiertos sobre la base.
+"""
+
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import quote
+
+# Operaciones que escriben los triggers; el resto son eventos de aplicación
+_ROW_OPERATIONS = ("CREATE", "UPDATE", "DELETE")
+
+
+class Change:
+    """Un cambio de fila: operación, registro afectado e imagen nueva"""
+
+    __slots__ = ('seq', 'table_name', 'operation', 'record_id', 'new_values')
+
+    def __init__(self, seq: int, table_name: str, operation: str, record_id: int,
+                 new_values: Optional[Dict[str, Any]]):
+        self.seq = seq
+        self.table_name = table_name
+        self.operation = operation
+        self.record_id = record_id
+        self.new_values = new_values
+
+    def __repr__(self):
+        return f"Change({self.seq}, {self.table_name}, {self.operation}, {self.record_id})"
+
+
+class ChangeFeed:
+    """
+    Cambios de las tablas auditadas a partir de una posición de la secuencia
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._probe: Optional[sqlite3.Connection] = None
+        self._probe_lock = threading.Lock()
+        self._data_version: Optional[int] = None
+        db.change_feeds.add(self)
+        self.has_changed()
+
+    def current_seq(self) -> int:
+        """Última posición asignada de la secuencia (0 si no hay cambios)"""
+        seq = self.db.execute_scalar("SELECT seq FROM sqlite_sequence WHERE name = 'audit_log'")
+        return seq or 0
+
+    def changes_since(self, seq: int, tables: Optional[Sequence[str]] = None,
+                      limit: Optional[int] = None) -> List[Change]:
+        """
+        Cambios con posición mayor que seq, en orden. tables limita las
+        tablas consultadas; limit, la cantidad (para leer por bloques).
+        """
+        query = ["SELECT id, table_name, operation, record_id, new_values FROM audit_log",
+                 "WHERE id > ? AND operation IN (?, ?, ?)"]
+        params: List[Any] = [seq, *_ROW_OPERATIONS]
+        if tables:
+            query.append("AND table_name IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(tables)))
+        query.append("ORDER BY id")
+        if limit is not None:
+            query.append("LIMIT ?")
+            params.append(limit)
+
+        return [
+            Change(row['id'], row['table_name'], row['operation'], row['record_id'],
+                   json.loads(row['new_values']) if row['new_values'] else None)
+            for row in self.db.execute_query(" ".join(query), tuple(params))
+        ]
+
+    def covers(self, seq: int) -> bool:
+        """
+        Indica si todos los cambios posteriores a seq siguen en audit_log
+        (la rotación no movió ninguno a un archivo)
+        
+        La rotación siempre mueve un prefijo de la secuencia: las filas más
+        antiguas (los triggers asignan id y timestamp en el orden de los
+        COMMIT) o todas menos las max_rows más recientes. Por eso basta con
+        comparar seq con MIN(id): un lector cuya posición quedó antes de la
+        rotación recibe False y recarga, en lugar de saltarse los cambios
+        archivados. Con audit_log vacío, sqlite_sequence conserva la última
+        posición asignada.
+        """
+        oldest = self.db.execute_scalar("SELECT MIN(id) FROM audit_log")
+        if oldest is None:
+            return seq >= self.current_seq()
+        return seq >= oldest - 1
+
+    # ========================================
+    # SONDEO (PRAGMA data_version)
+    # ========================================
+
+    def data_version(self) -> int:
+        """
+        PRAGMA data_version de la conexión de sondeo: cambia cada vez que otra
+        conexión (del pool o de otro proceso) confirma una escritura
+        """
+        with self._probe_lock:
+            if self._probe is None:
+                self._probe = sqlite3.connect(f"file:{quote(self.db.db_path)}?mode=ro", uri=True,
+                                              check_same_thread=False)
+            return self._probe.execute("PRAGMA data_version").fetchone()[0]
+
+    def has_changed(self) -> bool:
+        """
+        Indica si alguna conexión confirmó escrituras desde la llamada anterior.
+        Cuesta un PRAGMA sobre la conexión de sondeo, sin leer ninguna tabla.
+        """
+        version = self.data_version()
+        changed = self._data_version is not None and version != self._data_version
+        self._data_version = version
+        return changed
+
+    def close(self):
+        """Cierra la conexión de sondeo"""
+        with self._probe_lock:
+            if self._probe is not None:
+                self._probe.close()
+                self._probe = None
@@ -13,81 +13,387 @@ de datos. Esto incluye transacciones, control de concurrencia y validación de d
 
 import sqlite3
 import os
-from typing import Optional, Any, List, Tuple
+import threading
+import weakref
+from typing import Optional, Any, List, Tuple, Iterator
 from contextlib import contextmanager
+from .connection_pool import ConnectionPool
+from .query_stats import QueryStatistics, InstrumentedCursor
+from .identity_map import IdentityMap, IdentityMapStats
+from .audit import AuditDurability, AuditSink, AuditWriter
+from .statistics import StatisticsService
+from .row_factory import model_row_factory
+from .migrations import MigrationRunner
+
+# Perfiles de rendimiento: conjuntos de PRAGMA aplicados a cada conexión nueva.
+# - interactive: WAL + synchronous NORMAL, lectores y escritores no se bloquean
+# - bulk-load: sin fsync (synchronous OFF) y caché grande para cargas masivas
+# - read-mostly-reporting: caché y mmap grandes para consultas de reportes
+# - legacy: comportamiento por defecto de SQLite (rollback journal + FULL)
+PRAGMA_PROFILES = {
+    'interactive': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,        # ~16 MB (valores negativos = KiB)
+        'mmap_size': 67108864,       # 64 MB
+        'temp_store': 'MEMORY'
+    },
+    'bulk-load': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -131072,       # ~128 MB
+        'mmap_size': 268435456,      # 256 MB
+        'temp_store': 'MEMORY'
+    },
+    'read-mostly-reporting': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,        # ~64 MB
+        'mmap_size': 1073741824,     # 1 GB
+        'temp_store': 'MEMORY'
+    },
+    'legacy': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT'
+    }
+}
+
+DEFAULT_PROFILE = 'interactive'
 
 class DatabaseConnection:
     """
     Clase para manejar la conexión a la base de datos SQLite.
-    Implementa el patrón Singleton para garantizar una sola conexión.
+    Implementa el patrón Singleton para garantizar un único punto de acceso,
+    y un pool de conexiones para permitir operaciones concurrentes entre hilos.
     """
     
     _instance = None
-    _connection = None
     
-    def __new__(cls, db_path: str = "school_database.db"):
+    def __new__(cls, db_path: str = "school_database.db", *args, **kwargs):
         if cls._instance is None:
             cls._instance = super(DatabaseConnection, cls).__new__(cls)
             cls._instance.db_path = db_path
         return cls._instance
     
-    def __init__(self, db_path: str = "school_database.db"):
+    def __init__(self, db_path: str = "school_database.db", pool_size: int = 5,
+                 pool_timeout: float = 30.0, profile: str = DEFAULT_PROFILE,
+                 slow_query_threshold_ms: float = 100.0, slow_query_log: Optional[str] = None,
+                 sample_data: bool = False,
+                 audit_durability: str = AuditDurability.ON_COMMIT.value,
+                 audit_sink: Optional[AuditSink] = None):
         if not hasattr(self, 'initialized'):
+            if profile not in PRAGMA_PROFILES:
+                raise ValueError(f"Perfil de rendimiento desconocido: {profile}")
             self.db_path = db_path
+            self.profile = profile
+            self.pool = ConnectionPool(self.connect, size=pool_size, timeout=pool_timeout)
+            self._local = threading.local()
+            self.query_stats = QueryStatistics(slow_query_threshold_ms, slow_query_log)
+            self.identity_stats = IdentityMapStats()
+            self.audit = AuditWriter(self, audit_durability, audit_sink)
+            # Flujos de cambios abiertos sobre esta base (ver change_feed.py):
+            # disconnect() cierra sus conexiones de sondeo
+            self.change_feeds = weakref.WeakSet()
+            self.statistics = StatisticsService(self)
             self.initialized = True
-            self._create_tables()
+            self.migrate()
+            if sample_data:
+                self.insert_sample_data()
     
     def connect(self) -> sqlite3.Connection:
-        """Establece una conexión a la base de datos"""
-        if self._connection is None:
-            try:
-                self._connection = sqlite3.connect(
-                    self.db_path,
-                    check_same_thread=False,
-                    timeout=30.0
-                )
-                # Habilitar claves foráneas para integridad referencial
-                self._connection.execute("PRAGMA foreign_keys = ON")
-                self._connection.row_factory = sqlite3.Row
-                print(f"✓ Conexión establecida con la base de datos: {self.db_path}")
-            except sqlite3.Error as e:
-                print(f"✗ Error al conectar con la base de datos: {e}")
-                raise
-        return self._connection
+        """
+        Abre una nueva conexión configurada a la base de datos.
+        El pool la utiliza para crear sus conexiones bajo demanda.
+        """
+        try:
+            connection = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                timeout=30.0
+            )
+            # Habilitar claves foráneas para integridad referencial
+            connection.execute("PRAGMA foreign_keys = ON")
+            self._apply_profile(connection, self.profile)
+            connection.row_factory = sqlite3.Row
+            print(f"✓ Conexión establecida con la base de datos: {self.db_path}")
+            return connection
+        except sqlite3.Error as e:
+            print(f"✗ Error al conectar con la base de datos: {e}")
+            raise
     
     def disconnect(self):
-        """Cierra la conexión a la base de datos"""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
-            print("✓ Conexión a la base de datos cerrada")
+        """
+        Escribe la auditoría pendiente y cierra las conexiones del pool y las
+        de sondeo de los flujos de cambios
+        """
+        self.audit.close()
+        self.statistics.close()
+        for feed in list(self.change_feeds):
+            feed.close()
+        self.pool.close_all()
+        print("✓ Conexiones a la base de datos cerradas")
+    
+    @property
+    def in_transaction(self) -> bool:
+        """Indica si el hilo actual está dentro de un bloque transaction()"""
+        return getattr(self._local, 'transaction_depth', 0) > 0
+    
+    @property
+    def identity_map(self) -> Optional[IdentityMap]:
+        """Mapa de identidad de la unidad de trabajo abierta en este hilo (o None)"""
+        return getattr(self._local, 'identity_map', None)
+    
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Abre un mapa de identidad para el hilo actual sin iniciar una transacción
+        (por ejemplo, para una petición o un reporte que solo lee). Dentro del
+        bloque, get_by_id retorna el mismo objeto para la misma clave sin volver
+        a consultar la base de datos. Los bloques anidados comparten el mapa.
+        """
+        identity_map = self.identity_map
+        if identity_map is not None:
+            yield identity_map
+            return
+        
+        identity_map = self._local.identity_map = IdentityMap()
+        try:
+            yield identity_map
+        finally:
+            self._local.identity_map = None
+            self.identity_stats.record(identity_map)
+    
+    def _new_cursor(self, conn: sqlite3.Connection) -> sqlite3.Cursor:
+        """Crea un cursor que registra el tiempo de cada sentencia"""
+        cursor = conn.cursor(InstrumentedCursor)
+        cursor.stats = self.query_stats
+        return cursor
     
     @contextmanager
     def get_cursor(self):
         """
         Context manager para obtener un cursor de base de datos
         Garantiza que las operaciones se ejecuten de forma segura
+        
+        La conexión se toma prestada del pool para el hilo actual; las
+        llamadas anidadas dentro del mismo hilo reutilizan la misma conexión.
+        Dentro de un bloque transaction() no se confirma ni se revierte:
+        esa decisión corresponde al bloque de transacción.
+        
+        Un transaction() abierto dentro del cursor se anida con un SAVEPOINT
+        y su auditoría queda pendiente: se escribe con el COMMIT del cursor
+        (o se descarta si se revierte).
         """
-        conn = self.connect()
-        cursor = conn.cursor()
-        try:
-            yield cursor
-            conn.commit()
-        except sqlite3.Error as e:
-            conn.rollback()
-            print(f"✗ Error en la operación de base de datos: {e}")
-            raise
-        finally:
-            cursor.close()
+        with self.pool.connection() as conn:
+            cursor = self._new_cursor(conn)
+            in_transaction = self.in_transaction
+            audit_mark = self.audit.mark()
+            try:
+                yield cursor
+                if not in_transaction:
+                    self.audit.before_commit(cursor)
+                    conn.commit()
+                    self.audit.after_commit()
+            except sqlite3.Error as e:
+                if not in_transaction:
+                    self.audit.discard(audit_mark)
+                    conn.rollback()
+                print(f"✗ Error en la operación de base de datos: {e}")
+                raise
+            finally:
+                cursor.close()
     
-    def execute_query(self, query: str, params: Tuple = ()) -> List[sqlite3.Row]:
+    @contextmanager
+    def transaction(self):
+        """
+        Unidad de trabajo: todas las operaciones del bloque se confirman juntas
+        con un único COMMIT, o se revierten todas si ocurre una excepción.
+        
+        Los bloques anidados se implementan con SAVEPOINT, de modo que un error
+        en un bloque interno solo revierte el trabajo de ese bloque.
+        
+        El bloque es también una unidad de trabajo (ver unit_of_work()): los
+        objetos leídos con get_by_id se reutilizan hasta que se escriben, y el
+        mapa de identidad se vacía si la transacción o un SAVEPOINT se revierte.
+        Las entradas de auditoría del bloque siguen la misma suerte (ver audit.py).
+        
+        Ejemplo:
+            with db.transaction() as cursor:
+                cursor.execute("UPDATE ...")
+                student_dao.update(student)   # comparte el mismo COMMIT
+        """
+        with self.pool.connection() as conn, self.unit_of_work() as identity_map:
+            depth = getattr(self._local, 'transaction_depth', 0)
+            # Si ya hay una transacción abierta en la conexión (por ejemplo,
+            # dentro de get_cursor), este bloque se anida con un SAVEPOINT y
+            # su auditoría la escribe el COMMIT de get_cursor
+            savepoint = None
+            if depth > 0 or conn.in_transaction:
+                savepoint = f"sp_{depth + 1}"
+                conn.execute(f"SAVEPOINT {savepoint}")
+            else:
+                conn.execute("BEGIN IMMEDIATE")
+            
+            self._local.transaction_depth = depth + 1
+            cursor = self._new_cursor(conn)
+            audit_mark = self.audit.mark()
+            try:
+                yield cursor
+            except BaseException:
+                self._local.transaction_depth = depth
+                identity_map.clear()
+                self.audit.discard(audit_mark)
+                if savepoint:
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                    conn.execute(f"RELEASE {savepoint}")
+                else:
+                    conn.rollback()
+                raise
+            else:
+                self._local.transaction_depth = depth
+                if savepoint:
+                    conn.execute(f"RELEASE {savepoint}")
+                else:
+                    self.audit.before_commit(cursor)
+                    conn.commit()
+                    self.audit.after_commit()
+            finally:
+                cursor.close()
+    
+    def _apply_profile(self, connection: sqlite3.Connection, profile: str):
+        """Aplica los PRAGMA del perfil de rendimiento a una conexión"""
+        for pragma, value in PRAGMA_PROFILES[profile].items():
+            connection.execute(f"PRAGMA {pragma} = {value}")
+    
+    def set_profile(self, profile: str):
+        """
+        Cambia el perfil de rendimiento activo.
+        Las conexiones del pool se recrean para que usen el nuevo perfil.
+        """
+        if profile not in PRAGMA_PROFILES:
+            raise ValueError(f"Perfil de rendimiento desconocido: {profile}")
+        self.profile = profile
+        self.pool.reset()
+        print(f"✓ Perfil de rendimiento activo: {profile}")
+    
+    def get_active_profile(self) -> dict:
+        """
+        Retorna el perfil activo junto con los valores de PRAGMA
+        efectivamente aplicados en la conexión
+        """
+        effective = {}
+        with self.pool.connection() as conn:
+            for pragma in PRAGMA_PROFILES[self.profile]:
+                value = conn.execute(f"PRAGMA {pragma}").fetchone()
+                effective[pragma] = value[0] if value else None
+        return {
+            'name': self.profile,
+            'settings': dict(PRAGMA_PROFILES[self.profile]),
+            'effective': effective
+        }
+    
+    def get_query_stats(self) -> dict:
+        """
+        Retorna las métricas por sentencia normalizada (ejecuciones, tiempo
+        total, p50/p95/p99, filas) y las consultas lentas recientes
+        """
+        return self.query_stats.snapshot()
+    
+    def reset_query_stats(self):
+        """Reinicia las métricas de consultas"""
+        self.query_stats.reset()
+    
+    def get_identity_map_stats(self) -> dict:
+        """
+        Retorna los aciertos y fallos del mapa de identidad: cada acierto es
+        una consulta get_by_id que no llegó a la base de datos
+        """
+        return self.identity_stats.snapshot(self.identity_map)
+    
+    def get_audit_stats(self) -> dict:
+        """
+        Retorna la durabilidad de la auditoría, la profundidad del buffer y
+        la latencia de los vaciados (última, promedio y máxima, en ms)
+        """
+        return self.audit.get_stats()
+    
+    def flush_audit(self) -> int:
+        """Escribe ya las entradas de auditoría del buffer (modo best-effort)"""
+        return self.audit.flush()
+    
+    def get_pool_stats(self) -> dict:
+        """Retorna los contadores del pool de conexiones"""
+        return self.pool.get_stats()
+    
+    def execute_query(self, query: str, params: Tuple = (), model: type = None) -> List[Any]:
         """
         Ejecuta una consulta SELECT y retorna los resultados
+        
+        Con model (una clase con __slots__, p. ej. Student), cada fila se
+        construye directamente como objeto mediante una fábrica compilada,
+        sin pasar por sqlite3.Row ni por un diccionario intermedio.
         """
         with self.get_cursor() as cursor:
+            if model is not None:
+                cursor.row_factory = model_row_factory(model)
             cursor.execute(query, params)
             return cursor.fetchall()
     
+    def iter_query(self, query: str, params: Tuple = (),
+                   batch_size: int = 500, model: type = None) -> Iterator[Any]:
+        """
+        Ejecuta una consulta SELECT y genera las filas una a una, leyéndolas
+        de la base de datos en bloques de `batch_size` (fetchmany).
+        Con model, las filas se construyen como objetos (ver execute_query).
+        
+        A diferencia de execute_query, nunca carga el resultado completo en
+        memoria. Si el hilo no tiene una conexión prestada, las filas se leen
+        con una conexión propia del pool (fuera del checkout del hilo) dentro
+        de una transacción de lectura, por lo que todas provienen de la misma
+        instantánea de la base de datos aunque el bucle lea o escriba con
+        get_cursor() o transaction(): esas operaciones usan la conexión del
+        hilo y se confirman con normalidad. Por la misma razón, el generador
+        puede recorrerse desde otro hilo.
+        
+        Dentro de get_cursor() o transaction() se lee con la conexión que el
+        hilo ya tiene (y se ven sus cambios), sin ocupar otra del pool.
+        
+        Con el perfil legacy (rollback journal) la lectura abierta bloquea los
+        COMMIT de otras conexiones: no escriba dentro del bucle.
+        """
+        if self.pool.current_connection is not None:
+            with self.pool.connection() as conn:
+                yield from self._fetch_batches(conn, query, params, batch_size, model)
+            return
+        
+        conn = self.pool.checkout()
+        try:
+            conn.execute("BEGIN")
+            yield from self._fetch_batches(conn, query, params, batch_size, model)
+        finally:
+            if conn.in_transaction:
+                conn.commit()
+            self.pool.checkin(conn)
+    
+    def _fetch_batches(self, conn: sqlite3.Connection, query: str, params: Tuple,
+                       batch_size: int, model: type) -> Iterator[Any]:
+        """Genera las filas de una consulta leyéndolas en bloques con fetchmany"""
+        cursor = self._new_cursor(conn)
+        if model is not None:
+            cursor.row_factory = model_row_factory(model)
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+    
     def execute_non_query(self, query: str, params: Tuple = ()) -> int:
         """
         Ejecuta una consulta INSERT, UPDATE o DELETE
@@ -106,205 +412,196 @@ class DatabaseConnection:
             result = cursor.fetchone()
             return result[0] if result else None
     
-    def _create_tables(self):
+    def migrate(self) -> list:
         """
-        Crea las tablas necesarias para el sistema escolar
+        Aplica las migraciones de esquema pendientes (ver migrations.py).
+        Si el esquema está al día solo se lee PRAGMA user_version.
         Implementa Integridad Referencial con claves foráneas
         """
-        tables_sql = [
-            # Tabla de Estudiantes
-            """
-            CREATE TABLE IF NOT EXISTS students (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                first_name TEXT NOT NULL,
-                last_name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                phone TEXT,
-                birth_date DATE,
-                enrollment_date DATE NOT NULL DEFAULT CURRENT_DATE,
-                status TEXT CHECK(status IN ('active', 'inactive', 'graduated')) DEFAULT 'active',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """,
-            
-            # Tabla de Cursos
-            """
-            CREATE TABLE IF NOT EXISTS courses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                code TEXT UNIQUE NOT NULL,
-                description TEXT,
-                credits INTEGER NOT NULL DEFAULT 3,
-                semester TEXT,
-                instructor TEXT,
-                capacity INTEGER DEFAULT 30,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """,
-            
-            # Tabla de Inscripciones (Integridad Referencial)
-            """
-            CREATE TABLE IF NOT EXISTS enrollments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                course_id INTEGER NOT NULL,
-                enrollment_date DATE NOT NULL DEFAULT CURRENT_DATE,
-                grade REAL CHECK(grade >= 0 AND grade <= 100),
-                status TEXT CHECK(status IN ('enrolled', 'completed', 'dropped')) DEFAULT 'enrolled',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-                FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
-                UNIQUE(student_id, course_id)
-            )
-            """,
-            
-            # Tabla de Auditoría
-            """
-            CREATE TABLE IF NOT EXISTS audit_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                table_name TEXT NOT NULL,
-                operation TEXT NOT NULL,
-                record_id INTEGER,
-                old_values TEXT,
-                new_values TEXT,
-                user_id TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-        ]
-        
-        # Crear triggers para actualizar updated_at automáticamente
-        triggers_sql = [
-            """
-            CREATE TRIGGER IF NOT EXISTS update_students_timestamp 
-            AFTER UPDATE ON students
-            FOR EACH ROW
-            BEGIN
-                UPDATE students SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
-            END
-            """,
-            
-            """
-            CREATE TRIGGER IF NOT EXISTS update_courses_timestamp 
-            AFTER UPDATE ON courses
-            FOR EACH ROW
-            BEGIN
-                UPDATE courses SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
-            END
-            """,
-            
-            """
-            CREATE TRIGGER IF NOT EXISTS update_enrollments_timestamp 
-            AFTER UPDATE ON enrollments
-            FOR EACH ROW
-            BEGIN
-                UPDATE enrollments SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
-            END
-            """
-        ]
-        
         try:
-            with self.get_cursor() as cursor:
-                # Crear tablas
-                for table_sql in tables_sql:
-                    cursor.execute(table_sql)
-                
-                # Crear triggers
-                for trigger_sql in triggers_sql:
-                    cursor.execute(trigger_sql)
-                
-                print("✓ Tablas y triggers creados exitosamente")
-                
-                # Insertar datos de ejemplo si no existen
-                self._insert_sample_data()
-                
+            return MigrationRunner(self).migrate()
         except sqlite3.Error as e:
-            print(f"✗ Error al crear las tablas: {e}")
+            print(f"✗ Error al aplicar las migraciones: {e}")
             raise
     
-    def _insert_sample_data(self):
+    def insert_sample_data(self):
         """Inserta datos de ejemplo si las tablas están vacías"""
         try:
             # Verificar si ya existen datos
             student_count = self.execute_scalar("SELECT COUNT(*) FROM students")
             
             if student_count == 0:
-                # Insertar estudiantes de ejemplo
-                students_data = [
-                    ("Juan", "Pérez", "juan.perez@email.com", "123-456-7890", "1995-03-15"),
-                    ("María", "García", "maria.garcia@email.com", "123-456-7891", "1996-07-20"),
-                    ("Carlos", "López", "carlos.lopez@email.com", "123-456-7892", "1994-11-10"),
-                    ("Ana", "Martínez", "ana.martinez@email.com", "123-456-7893", "1997-02-28"),
-                    ("Luis", "Rodríguez", "luis.rodriguez@email.com", "123-456-7894", "1995-09-05")
-                ]
-                
-                for student in students_data:
-                    self.execute_non_query(
-                        "INSERT INTO students (first_name, last_name, email, phone, birth_date) VALUES (?, ?, ?, ?, ?)",
-                        student
-                    )
-                
-                # Insertar cursos de ejemplo
-                courses_data = [
-                    ("Programación I", "PROG101", "Introducción a la programación", 4, "2024-1", "Prof. Smith"),
-                    ("Base de Datos", "BD201", "Fundamentos de bases de datos", 3, "2024-1", "Prof. Johnson"),
-                    ("Matemáticas", "MAT101", "Matemáticas básicas", 3, "2024-1", "Prof. Brown"),
-                    ("Inglés", "ENG101", "Inglés básico", 2, "2024-1", "Prof. Davis"),
-                    ("Algoritmos", "ALG201", "Algoritmos y estructuras de datos", 4, "2024-2", "Prof. Wilson")
-                ]
-                
-                for course in courses_data:
-                    self.execute_non_query(
-                        "INSERT INTO courses (name, code, description, credits, semester, instructor) VALUES (?, ?, ?, ?, ?, ?)",
-                        course
-                    )
-                
-                # Insertar algunas inscripciones de ejemplo
-                enrollments_data = [
-                    (1, 1, 85.5),  # Juan en Programación I
-                    (1, 2, 90.0),  # Juan en Base de Datos
-                    (2, 1, 78.0),  # María en Programación I
-                    (2, 3, 92.5),  # María en Matemáticas
-                    (3, 2, 88.0),  # Carlos en Base de Datos
-                ]
-                
-                for enrollment in enrollments_data:
-                    self.execute_non_query(
-                        "INSERT INTO enrollments (student_id, course_id, grade, status) VALUES (?, ?, ?, 'completed')",
-                        enrollment
-                    )
-                
+                self._insert_sample_rows()
                 print("✓ Datos de ejemplo insertados exitosamente")
                 
         except sqlite3.Error as e:
             print(f"✗ Error al insertar datos de ejemplo: {e}")
     
-    def get_database_info(self) -> dict:
-        """Retorna información sobre la base de datos"""
+    def _insert_sample_rows(self):
+        """Inserta las filas de ejemplo en una única transacción"""
+        with self.transaction():
+            # Insertar estudiantes de ejemplo
+            students_data = [
+                ("Juan", "Pérez", "juan.perez@email.com", "123-456-7890", "1995-03-15"),
+                ("María", "García", "maria.garcia@email.com", "123-456-7891", "1996-07-20"),
+                ("Carlos", "López", "carlos.lopez@email.com", "123-456-7892", "1994-11-10"),
+                ("Ana", "Martínez", "ana.martinez@email.com", "123-456-7893", "1997-02-28"),
+                ("Luis", "Rodríguez", "luis.rodriguez@email.com", "123-456-7894", "1995-09-05")
+            ]
+            
+            for student in students_data:
+                self.execute_non_query(
+                    "INSERT INTO students (first_name, last_name, email, phone, birth_date) VALUES (?, ?, ?, ?, ?)",
+                    student
+                )
+            
+            # Insertar cursos de ejemplo
+            courses_data = [
+                ("Programación I", "PROG101", "Introducción a la programación", 4, "2024-1", "Prof. Smith"),
+                ("Base de Datos", "BD201", "Fundamentos de bases de datos", 3, "2024-1", "Prof. Johnson"),
+                ("Matemáticas", "MAT101", "Matemáticas básicas", 3, "2024-1", "Prof. Brown"),
+                ("Inglés", "ENG101", "Inglés básico", 2, "2024-1", "Prof. Davis"),
+                ("Algoritmos", "ALG201", "Algoritmos y estructuras de datos", 4, "2024-2", "Prof. Wilson")
+            ]
+            
+            for course in courses_data:
+                self.execute_non_query(
+                    "INSERT INTO courses (name, code, description, credits, semester, instructor) VALUES (?, ?, ?, ?, ?, ?)",
+                    course
+                )
+            
+            # Insertar algunas inscripciones de ejemplo
+            enrollments_data = [
+                (1, 1, 85.5),  # Juan en Programación I
+                (1, 2, 90.0),  # Juan en Base de Datos
+                (2, 1, 78.0),  # María en Programación I
+                (2, 3, 92.5),  # María en Matemáticas
+                (3, 2, 88.0),  # Carlos en Base de Datos
+            ]
+            
+            for enrollment in enrollments_data:
+                self.execute_non_query(
+                    "INSERT INTO enrollments (student_id, course_id, grade, status) VALUES (?, ?, ?, 'completed')",
+                    enrollment
+                )
+    
+    def update_statistics(self, analysis_limit: int = 1000):
+        """
+        Actualiza las estadísticas del planificador (sqlite_stat1).
+        Con analysis_limit, ANALYZE examina como máximo ese número de filas por
+        índice, por lo que es rápido incluso en tablas grandes.
+        """
+        with self.get_cursor() as cursor:
+            cursor.execute(f"PRAGMA analysis_limit = {int(analysis_limit)}")
+            cursor.execute("ANALYZE")
+        print("✓ Estadísticas de la base de datos actualizadas")
+    
+    def _get_row_estimates(self, cursor: sqlite3.Cursor) -> dict:
+        """
+        Estimación del número de filas por tabla a partir de sqlite_stat1
+        (el primer número de la columna stat es la cantidad de filas)
+        """
+        estimates = {}
+        try:
+            for tbl, stat in cursor.execute("SELECT tbl, stat FROM sqlite_stat1").fetchall():
+                rows = int(stat.split()[0]) if stat else 0
+                estimates[tbl] = max(estimates.get(tbl, 0), rows)
+        except (sqlite3.Error, ValueError):
+            pass  # Sin ANALYZE previo no existe sqlite_stat1
+        return estimates
+    
+    def _get_object_sizes(self, cursor: sqlite3.Cursor) -> dict:
+        """
+        Páginas y bytes ocupados por cada tabla e índice (tabla virtual dbstat).
+        Retorna un diccionario vacío si SQLite se compiló sin dbstat.
+        """
+        try:
+            rows = cursor.execute(
+                "SELECT name, pageno, pgsize FROM dbstat WHERE aggregate = TRUE"
+            ).fetchall()
+            return {name: {'pages': pages, 'bytes': size} for name, pages, size in rows}
+        except sqlite3.Error:
+            return {}
+    
+    def get_database_info(self, exact_counts: bool = False) -> dict:
+        """
+        Retorna información sobre la base de datos
+        
+        Por defecto el número de registros por tabla es una estimación barata
+        (sqlite_stat1 o el mayor rowid), sin recorrer las tablas. Con
+        exact_counts=True se ejecuta SELECT COUNT(*) en cada tabla.
+        """
         info = {
             'database_path': self.db_path,
             'database_size': os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0,
             'tables': [],
-            'total_records': 0
+            'indexes': [],
+            'total_records': 0,
+            'exact_counts': exact_counts,
+            'pool': self.get_pool_stats(),
+            'audit': self.get_audit_stats(),
+            'statistics_cache': self.statistics.get_stats(),
+            'profile': self.profile
         }
         
         try:
-            # Obtener lista de tablas
-            tables = self.execute_query("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
-            
-            for table in tables:
-                table_name = table['name']
-                count = self.execute_scalar(f"SELECT COUNT(*) FROM {table_name}")
-                info['tables'].append({
-                    'name': table_name,
-                    'records': count
-                })
-                info['total_records'] += count
+            with self.get_cursor() as cursor:
+                info['page_size'] = cursor.execute("PRAGMA page_size").fetchone()[0]
+                info['page_count'] = cursor.execute("PRAGMA page_count").fetchone()[0]
+                info['free_pages'] = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+                
+                sizes = self._get_object_sizes(cursor)
+                estimates = {} if exact_counts else self._get_row_estimates(cursor)
+                
+                # Índices agrupados por tabla
+                index_bytes = {}
+                for index in cursor.execute(
+                    "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index' ORDER BY tbl_name, name"
+                ).fetchall():
+                    size = sizes.get(index['name'], {})
+                    info['indexes'].append({
+                        'name': index['name'],
+                        'table': index['tbl_name'],
+                        'pages': size.get('pages'),
+                        'bytes': size.get('bytes')
+                    })
+                    index_bytes[index['tbl_name']] = index_bytes.get(index['tbl_name'], 0) + size.get('bytes', 0)
+                
+                # Obtener lista de tablas (sin las tablas virtuales FTS5 ni sus tablas internas)
+                tables = cursor.execute(
+                    "SELECT name FROM pragma_table_list "
+                    "WHERE schema = 'main' AND type = 'table' AND name NOT LIKE 'sqlite_%'"
+                ).fetchall()
+                
+                for table in tables:
+                    table_name = table['name']
+                    if exact_counts:
+                        count = cursor.execute(f'SELECT COUNT(*) FROM "{table_name}"').fetchone()[0]
+                        source = 'exact'
+                    elif table_name in estimates:
+                        count = estimates[table_name]
+                        source = 'sqlite_stat1'
+                    else:
+                        # El mayor rowid se obtiene del extremo del B-tree: O(log n)
+                        try:
+                            count = cursor.execute(f'SELECT MAX(rowid) FROM "{table_name}"').fetchone()[0] or 0
+                            source = 'max_rowid'
+                        except sqlite3.Error:
+                            count, source = 0, 'unknown'
+                    
+                    size = sizes.get(table_name, {})
+                    info['tables'].append({
+                        'name': table_name,
+                        'records': count,
+                        'count_source': source,
+                        'pages': size.get('pages'),
+                        'bytes': size.get('bytes'),
+                        'index_bytes': index_bytes.get(table_name, 0)
+                    })
+                    info['total_records'] += count
                 
         except sqlite3.Error as e:
             print(f"✗ Error al obtener información de la base de datos: {e}")
         
+        info['query_stats'] = self.get_query_stats()
         return info
@@ -0,0 +1,207 @@
+"""
+Pool de Conexiones a la Base de Datos
+
+Un pool de conexiones mantiene un conjunto de conexiones abiertas que se
+reutilizan entre operaciones. En lugar de compartir una única conexión entre
+todos los hilos (lo que obliga a serializar el acceso), cada hilo toma prestada
+("checkout") una conexión del pool mientras trabaja y la devuelve al terminar.
+
+Características:
+- Tamaño máximo configurable
+- Checkout por hilo y reentrante: si un hilo ya tiene una conexión prestada,
+  las operaciones anidadas reutilizan la misma conexión
+- Checkout independiente del hilo (checkout/checkin) para conexiones que
+  deben quedar fuera de las operaciones anidadas del hilo
+- Tiempo máximo de espera cuando todas las conexiones están ocupadas
+- Contadores de préstamos, esperas y tiempo total de espera
+"""
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Optional
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Se lanza cuando no hay conexiones disponibles dentro del tiempo de espera"""
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones SQLite seguro para múltiples hilos.
+    Las conexiones se crean bajo demanda mediante la función `factory`.
+    """
+
+    def __init__(self, factory: Callable[[], sqlite3.Connection],
+                 size: int = 5, timeout: float = 30.0):
+        if size < 1:
+            raise ValueError("El tamaño del pool debe ser al menos 1")
+
+        self._factory = factory
+        self.size = size
+        self.timeout = timeout
+
+        self._idle = deque()
+        self._created = 0
+        self._generation = 0
+        self._generations = {}
+        self._condition = threading.Condition(threading.Lock())
+        self._local = threading.local()
+
+        # Contadores
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._timeouts = 0
+
+    # ========================================
+    # PRÉSTAMO Y DEVOLUCIÓN DE CONEXIONES
+    # ========================================
+
+    def acquire(self, timeout: Optional[float] = None) -> sqlite3.Connection:
+        """
+        Toma prestada una conexión para el hilo actual.
+        Si el hilo ya tiene una conexión, la reutiliza (checkout reentrante).
+        """
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            self._local.depth += 1
+            return conn
+
+        conn = self.checkout(timeout)
+        self._local.connection = conn
+        self._local.depth = 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        """Devuelve al pool la conexión prestada al hilo actual"""
+        if getattr(self._local, 'connection', None) is not conn:
+            raise RuntimeError("La conexión no pertenece al hilo actual")
+
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+
+        self._local.connection = None
+        self.checkin(conn)
+
+    def checkout(self, timeout: Optional[float] = None) -> sqlite3.Connection:
+        """
+        Toma prestada una conexión sin asociarla al hilo actual: las
+        operaciones del hilo no la reutilizan y puede devolverse desde
+        cualquier hilo con checkin() (por ejemplo, la de un cursor que se
+        recorre mientras el hilo sigue trabajando con su propia conexión).
+        """
+        timeout = self.timeout if timeout is None else timeout
+        create = False
+
+        with self._condition:
+            self._checkouts += 1
+
+            if not self._idle and self._created >= self.size:
+                self._waits += 1
+                started = time.perf_counter()
+                deadline = started + timeout
+
+                while not self._idle and self._created >= self.size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        self._wait_time += time.perf_counter() - started
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"No hay conexiones disponibles después de {timeout:.1f}s "
+                            f"(tamaño del pool: {self.size})"
+                        )
+                    self._condition.wait(remaining)
+
+                self._wait_time += time.perf_counter() - started
+
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                # Reservar el espacio antes de crear la conexión fuera del lock
+                self._created += 1
+                create = True
+
+        if create:
+            try:
+                conn = self._factory()
+            except Exception:
+                with self._condition:
+                    self._created -= 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._generations[id(conn)] = self._generation
+
+        return conn
+
+    def checkin(self, conn: sqlite3.Connection):
+        """Devuelve al pool una conexión obtenida con checkout()"""
+        # Descartar transacciones que hayan quedado abiertas
+        if conn.in_transaction:
+            conn.rollback()
+
+        with self._condition:
+            if self._generations.get(id(conn)) != self._generation:
+                # La conexión pertenece a una configuración anterior del pool
+                self._generations.pop(id(conn), None)
+                self._created -= 1
+                conn.close()
+            else:
+                self._idle.append(conn)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager que presta una conexión y la devuelve al terminar"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @property
+    def current_connection(self) -> Optional[sqlite3.Connection]:
+        """Conexión prestada al hilo actual, si existe"""
+        return getattr(self._local, 'connection', None)
+
+    # ========================================
+    # ADMINISTRACIÓN DEL POOL
+    # ========================================
+
+    def reset(self):
+        """
+        Cierra las conexiones inactivas y marca las prestadas para que se
+        cierren al ser devueltas. Las nuevas conexiones se crean de nuevo
+        con la función `factory`.
+        """
+        with self._condition:
+            self._generation += 1
+            while self._idle:
+                conn = self._idle.pop()
+                self._generations.pop(id(conn), None)
+                self._created -= 1
+                conn.close()
+            self._condition.notify_all()
+
+    def close_all(self):
+        """Cierra todas las conexiones inactivas del pool"""
+        self.reset()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna los contadores del pool"""
+        with self._condition:
+            idle = len(self._idle)
+            return {
+                'size': self.size,
+                'created': self._created,
+                'in_use': self._created - idle,
+                'idle': idle,
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'total_wait_time': round(self._wait_time, 6),
+                'timeouts': self._timeouts
+            }
@@ -14,11 +14,13 @@ SQL es un lenguaje estándar para manejar bases de datos relacionales.
 Permite crear, modificar y consultar datos de manera eficiente y flexible.
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
+from itertools import chain, groupby
+import json
 import sqlite3
 from datetime import datetime
 from .connection import DatabaseConnection
-from .dao import Student, Course, Enrollment, StudentDAO, CourseDAO, EnrollmentDAO
+from .dao import Student, Course, Enrollment, StudentDAO, CourseDAO, EnrollmentDAO, GradeUpdateResult
 
 class CRUDOperations:
     """
@@ -131,23 +133,28 @@ class CRUDOperations:
         """
         Editar la información de un estudiante
         
-        SQL equivalente:
-        UPDATE students SET first_name = ?, last_name = ?, email = ?, 
-                           phone = ?, birth_date = ?, status = ?
+        SQL equivalente (solo con las columnas que cambian):
+        UPDATE students SET phone = ?, status = ?
         WHERE id = ?
-        """
-        student = self.student_dao.get_by_id(student_id)
-        if not student:
-            print(f"✗ Estudiante con ID {student_id} no encontrado")
-            return False
-        
-        # Actualizar los campos proporcionados
-        for field, value in kwargs.items():
-            if hasattr(student, field):
-                setattr(student, field, value)
+        RETURNING *
         
+        Si los valores nuevos coinciden con los guardados no se escribe nada.
+        La lectura, la actualización y su registro de auditoría se ejecutan
+        en una sola transacción (un único COMMIT).
+        """
         try:
-            success = self.student_dao.update(student)
+            with self.db.transaction():
+                student = self.student_dao.get_by_id(student_id)
+                if not student:
+                    print(f"✗ Estudiante con ID {student_id} no encontrado")
+                    return False
+                
+                # Actualizar los campos proporcionados
+                for field, value in kwargs.items():
+                    if hasattr(student, field):
+                        setattr(student, field, value)
+                
+                success = self.student_dao.update(student)
             if success:
                 print(f"✓ Estudiante ID {student_id} actualizado exitosamente")
             else:
@@ -164,23 +171,24 @@ class CRUDOperations:
         """
         Editar la información de un curso
         
-        SQL equivalente:
-        UPDATE courses SET name = ?, code = ?, description = ?, credits = ?, 
-                          semester = ?, instructor = ?, capacity = ?
+        SQL equivalente (solo con las columnas que cambian):
+        UPDATE courses SET instructor = ?, capacity = ?
         WHERE id = ?
+        RETURNING *
         """
-        course = self.course_dao.get_by_id(course_id)
-        if not course:
-            print(f"✗ Curso con ID {course_id} no encontrado")
-            return False
-        
-        # Actualizar los campos proporcionados
-        for field, value in kwargs.items():
-            if hasattr(course, field):
-                setattr(course, field, value)
-        
         try:
-            success = self.course_dao.update(course)
+            with self.db.transaction():
+                course = self.course_dao.get_by_id(course_id)
+                if not course:
+                    print(f"✗ Curso con ID {course_id} no encontrado")
+                    return False
+                
+                # Actualizar los campos proporcionados
+                for field, value in kwargs.items():
+                    if hasattr(course, field):
+                        setattr(course, field, value)
+                
+                success = self.course_dao.update(course)
             if success:
                 print(f"✓ Curso ID {course_id} actualizado exitosamente")
             else:
@@ -197,22 +205,24 @@ class CRUDOperations:
         """
         Editar una inscripción (principalmente para actualizar calificaciones)
         
-        SQL equivalente:
+        SQL equivalente (solo con las columnas que cambian):
         UPDATE enrollments SET grade = ?, status = ?
         WHERE id = ?
+        RETURNING *
         """
-        enrollment = self.enrollment_dao.get_by_id(enrollment_id)
-        if not enrollment:
-            print(f"✗ Inscripción con ID {enrollment_id} no encontrada")
-            return False
-        
-        # Actualizar los campos proporcionados
-        for field, value in kwargs.items():
-            if hasattr(enrollment, field):
-                setattr(enrollment, field, value)
-        
         try:
-            success = self.enrollment_dao.update(enrollment)
+            with self.db.transaction():
+                enrollment = self.enrollment_dao.get_by_id(enrollment_id)
+                if not enrollment:
+                    print(f"✗ Inscripción con ID {enrollment_id} no encontrada")
+                    return False
+                
+                # Actualizar los campos proporcionados
+                for field, value in kwargs.items():
+                    if hasattr(enrollment, field):
+                        setattr(enrollment, field, value)
+                
+                success = self.enrollment_dao.update(enrollment)
             if success:
                 print(f"✓ Inscripción ID {enrollment_id} actualizada exitosamente")
             else:
@@ -313,10 +323,11 @@ class CRUDOperations:
     
     def find_students_by_name(self, name: str) -> List[Student]:
         """
-        Localizar estudiantes por nombre (búsqueda parcial)
+        Localizar estudiantes por nombre (búsqueda por prefijo, sin acentos)
         
         SQL equivalente:
-        SELECT * FROM students WHERE first_name LIKE '%name%' OR last_name LIKE '%name%'
+        SELECT s.* FROM students_fts JOIN students s ON s.id = students_fts.rowid
+        WHERE students_fts MATCH '{first_name last_name} : ("name"*)' ORDER BY rank
         """
         try:
             students = self.student_dao.search_by_name(name)
@@ -364,10 +375,11 @@ class CRUDOperations:
     
     def find_courses_by_name(self, name: str) -> List[Course]:
         """
-        Localizar cursos por nombre (búsqueda parcial)
+        Localizar cursos por nombre (búsqueda por prefijo, sin acentos)
         
         SQL equivalente:
-        SELECT * FROM courses WHERE name LIKE '%name%'
+        SELECT c.* FROM courses_fts JOIN courses c ON c.id = courses_fts.rowid
+        WHERE courses_fts MATCH 'name : ("name"*)' ORDER BY rank
         """
         try:
             courses = self.course_dao.search_by_name(name)
@@ -415,16 +427,41 @@ class CRUDOperations:
         """
         Obtener el historial académico completo de un estudiante
         
+        Es get_student_transcripts con un solo ID (ver abajo). Retorna None si
+        el estudiante no tiene inscripciones.
+        """
+        transcripts = self.get_student_transcripts([student_id])
+        try:
+            return next(transcripts, None)
+        finally:
+            # Libera la conexión que el generador mantiene prestada
+            transcripts.close()
+    
+    def get_student_transcripts(self, student_ids: Optional[Iterable[int]] = None,
+                                status: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Generar los historiales académicos de varios estudiantes con una sola
+        consulta: los de student_ids, los que tienen el estado status, o todos
+        si no se indica ningún filtro.
+        
         SQL equivalente:
-        SELECT s.first_name, s.last_name, c.name, c.code, c.credits, 
-               e.grade, e.status, e.enrollment_date
-        FROM students s
-        JOIN enrollments e ON s.id = e.student_id
-        JOIN courses c ON e.course_id = c.id
-        WHERE s.id = ?
+        SELECT s.id, s.first_name, c.name, e.grade, ...,
+               SUM(créditos completados) OVER (PARTITION BY e.student_id),
+               SUM(calificación * créditos) OVER (...) / SUM(créditos) OVER (...)
+        FROM enrollments e
+        JOIN students s ON s.id = e.student_id
+        JOIN courses c ON c.id = e.course_id
+        ORDER BY e.student_id, e.enrollment_date
+        
+        Las filas llegan ordenadas por estudiante (índice
+        idx_enrollments_student_date) y se agrupan al vuelo: cada historial se
+        entrega en cuanto termina el del estudiante, así que en memoria hay uno
+        solo a la vez. El GPA y los créditos se calculan en SQL con sumas
+        ponderadas por ventana. Los estudiantes sin inscripciones no aparecen.
         """
         query = """
         SELECT 
+            e.student_id,
             s.first_name,
             s.last_name,
             s.email,
@@ -433,54 +470,60 @@ class CRUDOperations:
             c.credits,
             e.grade,
             e.status,
-            e.enrollment_date
-        FROM students s
-        JOIN enrollments e ON s.id = e.student_id
-        JOIN courses c ON e.course_id = c.id
-        WHERE s.id = ?
-        ORDER BY e.enrollment_date
-        """
+            e.enrollment_date,
+            COALESCE(SUM(CASE WHEN e.status = 'completed' AND e.grade IS NOT NULL
+                              THEN c.credits END) OVER student, 0) as total_credits,
+            COALESCE(SUM(CASE WHEN e.status = 'completed' AND e.grade IS NOT NULL
+                              THEN e.grade * c.credits END) OVER student
+                     / SUM(CASE WHEN e.status = 'completed' AND e.grade IS NOT NULL
+                                THEN c.credits END) OVER student, 0) as gpa
+        FROM enrollments e
+        JOIN students s ON s.id = e.student_id
+        JOIN courses c ON c.id = e.course_id
+        WHERE {conditions}
+        WINDOW student AS (PARTITION BY e.student_id ORDER BY e.enrollment_date
+                           ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+        ORDER BY e.student_id, e.enrollment_date
+        """
+        # La ventana se ordena igual que el resultado para que SQLite recorra
+        # el índice una sola vez, sin un B-tree temporal para el ORDER BY
+        conditions, params = ["1"], []
+        if student_ids is not None:
+            conditions.append("e.student_id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(student_ids)))
+        if status is not None:
+            # "+" descarta idx_students_status_name: recorrer estudiantes por
+            # nombre obligaría a reordenar todo el resultado
+            conditions.append("+s.status = ?")
+            params.append(status)
+        query = query.format(conditions=" AND ".join(conditions))
         
         try:
-            rows = self.db.execute_query(query, (student_id,))
-            if not rows:
-                return None
-            
-            # Organizar los datos
-            student_info = {
-                'first_name': rows[0]['first_name'],
-                'last_name': rows[0]['last_name'],
-                'email': rows[0]['email'],
-                'courses': []
-            }
-            
-            total_credits = 0
-            total_grade_points = 0
-            
-            for row in rows:
-                course_data = {
-                    'course_name': row['course_name'],
-                    'course_code': row['course_code'],
-                    'credits': row['credits'],
-                    'grade': row['grade'],
-                    'status': row['status'],
-                    'enrollment_date': row['enrollment_date']
+            rows = self.db.iter_query(query, tuple(params))
+            for student_id, group in groupby(rows, key=lambda row: row['student_id']):
+                first = next(group)
+                transcript = {
+                    'student_id': student_id,
+                    'first_name': first['first_name'],
+                    'last_name': first['last_name'],
+                    'email': first['email'],
+                    'courses': [],
+                    'gpa': first['gpa'],
+                    'total_credits': first['total_credits']
                 }
-                student_info['courses'].append(course_data)
+                for row in chain((first,), group):
+                    transcript['courses'].append({
+                        'course_name': row['course_name'],
+                        'course_code': row['course_code'],
+                        'credits': row['credits'],
+                        'grade': row['grade'],
+                        'status': row['status'],
+                        'enrollment_date': row['enrollment_date']
+                    })
+                yield transcript
                 
-                # Calcular GPA
-                if row['grade'] is not None and row['status'] == 'completed':
-                    total_credits += row['credits']
-                    total_grade_points += row['grade'] * row['credits']
-            
-            # Calcular GPA
-            student_info['gpa'] = total_grade_points / total_credits if total_credits > 0 else 0
-            student_info['total_credits'] = total_credits
-            
-            return student_info
-            
         except Exception as e:
-            print(f"✗ Error al obtener historial académico: {e}")
+            print(f"✗ Error al obtener historiales académicos: {e}")
             raise
     
     def get_course_roster(self, course_id: int) -> Dict[str, Any]:
@@ -550,41 +593,26 @@ class CRUDOperations:
         """
         Obtener estadísticas generales del sistema
         
-        Utiliza múltiples consultas SQL para generar estadísticas
+        Los contadores vienen del servicio compartido (statistics.py): una
+        pasada agregada por tabla, en caché hasta la siguiente escritura.
         """
-        stats = {}
-        
         try:
-            # Contar estudiantes
-            stats['total_students'] = self.db.execute_scalar("SELECT COUNT(*) FROM students")
-            stats['active_students'] = self.db.execute_scalar("SELECT COUNT(*) FROM students WHERE status = 'active'")
-            
-            # Contar cursos
-            stats['total_courses'] = self.db.execute_scalar("SELECT COUNT(*) FROM courses")
-            
-            # Contar inscripciones
-            stats['total_enrollments'] = self.db.execute_scalar("SELECT COUNT(*) FROM enrollments")
-            stats['active_enrollments'] = self.db.execute_scalar("SELECT COUNT(*) FROM enrollments WHERE status = 'enrolled'")
-            
-            # Promedio de calificaciones
-            avg_grade = self.db.execute_scalar("SELECT AVG(grade) FROM enrollments WHERE grade IS NOT NULL")
-            stats['average_grade'] = round(avg_grade, 2) if avg_grade else 0
-            
-            # Curso más popular
-            popular_course = self.db.execute_query("""
-                SELECT c.name, c.code, COUNT(e.id) as enrollment_count
-                FROM courses c
-                LEFT JOIN enrollments e ON c.id = e.course_id
-                GROUP BY c.id, c.name, c.code
-                ORDER BY enrollment_count DESC
-                LIMIT 1
-            """)
+            counters = self.db.statistics.get()
+            stats = {
+                'total_students': counters['students']['total'],
+                'active_students': counters['students']['active'],
+                'total_courses': counters['courses']['total'],
+                'total_enrollments': counters['enrollments']['total'],
+                'active_enrollments': counters['enrollments']['enrolled'],
+                'average_grade': counters['enrollments']['average_grade']
+            }
             
-            if popular_course:
+            if counters['popular_courses']:
+                popular_course = counters['popular_courses'][0]
                 stats['most_popular_course'] = {
-                    'name': popular_course[0]['name'],
-                    'code': popular_course[0]['code'],
-                    'enrollments': popular_course[0]['enrollment_count']
+                    'name': popular_course['name'],
+                    'code': popular_course['code'],
+                    'enrollments': popular_course['enrollments']
                 }
             
             return stats
@@ -597,28 +625,26 @@ class CRUDOperations:
     # OPERACIONES BATCH
     # ========================================
     
-    def batch_update_grades(self, grade_updates: List[Tuple[int, float]]) -> int:
+    def batch_update_grades(self, grade_updates: List[Tuple[int, Optional[float]]]) -> GradeUpdateResult:
         """
         Actualizar múltiples calificaciones en una sola operación
         
         SQL equivalente:
-        UPDATE enrollments SET grade = ? WHERE id = ?
-        (ejecutado múltiples veces en una transacción)
-        """
-        updated_count = 0
+        CREATE TEMP TABLE grade_updates (enrollment_id, grade)  -- carga masiva
+        UPDATE enrollments SET grade = g.grade
+        FROM temp.grade_updates AS g WHERE enrollments.id = g.enrollment_id
         
+        El lote se valida completo antes de escribir. Retorna un
+        GradeUpdateResult: actualizadas, sin cambios, no encontradas e
+        inválidas por ID
+        (ver EnrollmentDAO.update_grades).
+        """
         try:
-            with self.db.get_cursor() as cursor:
-                for enrollment_id, grade in grade_updates:
-                    cursor.execute(
-                        "UPDATE enrollments SET grade = ? WHERE id = ?",
-                        (grade, enrollment_id)
-                    )
-                    if cursor.rowcount > 0:
-                        updated_count += 1
-            
-            print(f"✓ {updated_count} calificaciones actualizadas exitosamente")
-            return updated_count
+            result = self.enrollment_dao.update_grades(grade_updates)
+            print(f"✓ {len(result.updated)} calificaciones actualizadas exitosamente "
+                  f"({len(result.unchanged)} sin cambios, {len(result.not_found)} no encontradas, "
+                  f"{len(result.invalid)} inválidas)")
+            return result
             
         except Exception as e:
             print(f"✗ Error en actualización batch: {e}")
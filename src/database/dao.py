@@ -12,10 +12,14 @@ Ventajas de usar DAO:
 4. Facilita las pruebas unitarias
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Callable, Sequence, Set, Tuple, Union
 from datetime import datetime, date
+import json
 import sqlite3
 from .connection import DatabaseConnection
+from .fts import build_match_expression
+from .migrations import ENROLLMENTS_UPDATE_TRIGGERS, audit_image
+from .pagination import Page, PageDirection, build_page_query, decode_cursor, encode_cursor
 
 class BaseDAO:
     """Clase base para todos los DAO"""
@@ -23,27 +27,370 @@ class BaseDAO:
     def __init__(self):
         self.db = DatabaseConnection()
     
-    def _dict_to_object(self, row: sqlite3.Row, obj_class) -> Any:
-        """Convierte una fila de BD a un objeto"""
-        if row:
-            return obj_class(**dict(row))
-        return None
+    # ========================================
+    # MAPA DE IDENTIDAD
+    # ========================================
     
-    def _log_operation(self, table_name: str, operation: str, record_id: int = None, 
-                      old_values: str = None, new_values: str = None):
-        """Registra la operación en el log de auditoría"""
-        try:
-            self.db.execute_non_query(
-                """INSERT INTO audit_log (table_name, operation, record_id, old_values, new_values, user_id) 
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (table_name, operation, record_id, old_values, new_values, "system")
+    def _find_by_id(self, table_name: str, model, record_id: int) -> Any:
+        """
+        Obtiene un registro por ID. Dentro de una unidad de trabajo, las
+        lecturas repetidas de la misma clave retornan el mismo objeto sin
+        consultar la base de datos.
+        """
+        identity_map = self.db.identity_map
+        if identity_map is not None:
+            obj = identity_map.get(table_name, record_id)
+            if obj is not None:
+                return obj
+        
+        rows = self.db.execute_query(f"SELECT * FROM {table_name} WHERE id = ?", (record_id,), model=model)
+        if not rows:
+            return None
+        obj = rows[0]
+        if identity_map is not None:
+            identity_map.add(table_name, record_id, obj, obj.to_dict())
+        return obj
+    
+    def _load_original(self, table_name: str, model, record_id: int) -> Any:
+        """
+        Imagen "antes" de un registro: la fila tal como se leyó en esta unidad
+        de trabajo, aunque el objeto se haya modificado.
+        """
+        identity_map = self.db.identity_map
+        if identity_map is not None:
+            row = identity_map.original(table_name, record_id)
+            if row is not None:
+                return model(**row)
+        rows = self.db.execute_query(f"SELECT * FROM {table_name} WHERE id = ?", (record_id,), model=model)
+        return rows[0] if rows else None
+    
+    def _invalidate(self, table_name: str, record_ids: Sequence[int], cascade: Sequence[str] = ()):
+        """Retira del mapa de identidad los registros escritos (y las tablas en cascada)"""
+        identity_map = self.db.identity_map
+        if identity_map is None:
+            return
+        for record_id in record_ids:
+            identity_map.discard(table_name, record_id)
+        for dependent_table in cascade:
+            identity_map.discard_table(dependent_table)
+
+    # ========================================
+    # ACTUALIZACIÓN DE CAMPOS MODIFICADOS
+    # ========================================
+
+    def _update_changed(self, table_name: str, model, obj: 'TrackedModel',
+                        columns: Sequence[str]) -> bool:
+        """
+        UPDATE solo de las columnas modificadas desde que se leyó el objeto.
+
+        Los objetos rastreados se comparan contra los valores leídos, de modo
+        que la escritura es una sola sentencia (la auditoría la agrega el
+        trigger); los objetos sin rastreo se comparan contra _load_original.
+        Si nada cambió no se escribe (ni se disparan los triggers) y se
+        retorna True.
+        """
+        with self.db.transaction() as cursor:
+            changed = obj.changed_fields(columns)
+            if changed is None:
+                original = self._load_original(table_name, model, obj.id)
+                if not original:
+                    return False
+                changed = [column for column in columns if getattr(obj, column) != getattr(original, column)]
+            if not changed:
+                return True
+
+            assignments = ", ".join(f"{column} = ?" for column in changed)
+            cursor.execute(
+                f"UPDATE {table_name} SET {assignments} WHERE id = ? RETURNING *",
+                [getattr(obj, column) for column in changed] + [obj.id]
             )
-        except sqlite3.Error:
-            pass  # No fallar si no se puede registrar el log
+            row = cursor.fetchone()
+            self._invalidate(table_name, [obj.id])
+            if row is None:
+                return False
+
+            # Los valores guardados pasan a ser la nueva referencia del objeto
+            obj.mark_clean(row)
+            return True
+
+    # ========================================
+    # PAGINACIÓN POR CLAVE
+    # ========================================
+    
+    def _get_page(self, table_name: str, model, key_columns: Sequence[str], descending: bool,
+                  after: Union[str, Sequence[Any], None], limit: int,
+                  direction: Union[PageDirection, str], filters: Dict[str, Any] = None) -> Page:
+        """
+        Lee una página ordenada por key_columns a partir de una clave (sin OFFSET).
+        
+        after puede ser un token (Page.next_cursor / Page.prev_cursor), que ya
+        incluye la dirección, o una tupla con los valores de key_columns.
+        """
+        if limit < 1:
+            raise ValueError("El límite de la página debe ser mayor que cero")
+        
+        if isinstance(after, str):
+            key, direction = decode_cursor(after)
+        else:
+            key = tuple(after) if after is not None else None
+            direction = PageDirection(direction)
+        if key is not None and len(key) != len(key_columns):
+            raise ValueError(f"La clave de paginación debe tener {len(key_columns)} valores: {key_columns}")
+        
+        filters = {column: value for column, value in (filters or {}).items() if value is not None}
+        forward = direction == PageDirection.NEXT
+        query = build_page_query(table_name, key_columns, descending, forward, key is not None, list(filters))
+        params = list(filters.values()) + list(key or ()) + [limit + 1]
+        
+        rows = self.db.execute_query(query, tuple(params), model=model)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if not forward:
+            rows.reverse()
+        
+        # Hacia adelante, "hay más" indica si existe la página siguiente; la
+        # anterior existe si se partió de una clave (y al revés hacia atrás)
+        has_next = has_more if forward else key is not None
+        has_prev = key is not None if forward else has_more
+        
+        if rows:
+            first_key = tuple(getattr(rows[0], column) for column in key_columns)
+            last_key = tuple(getattr(rows[-1], column) for column in key_columns)
+        else:
+            first_key = last_key = key
+        
+        return Page(
+            rows,
+            next_cursor=encode_cursor(last_key, PageDirection.NEXT) if has_next and last_key else None,
+            prev_cursor=encode_cursor(first_key, PageDirection.PREVIOUS) if has_prev and first_key else None
+        )
+    
+    # ========================================
+    # OPERACIONES MASIVAS
+    # ========================================
+    
+    def _integrity_message(self, error: sqlite3.IntegrityError) -> str:
+        """Traduce una violación de restricción a un mensaje para el usuario"""
+        return str(error)
+    
+    def _existing_ids(self, table_name: str, ids: Sequence[int]) -> Set[int]:
+        """IDs de la lista que existen en la tabla, con una sola consulta"""
+        query = f"SELECT id FROM {table_name} WHERE id IN (SELECT value FROM json_each(?))"
+        return {row['id'] for row in self.db.execute_query(query, (json.dumps(list(ids)),))}
+    
+    def _rows_by_id(self, cursor: sqlite3.Cursor, table_name: str, ids: Sequence[int]) -> Dict[int, sqlite3.Row]:
+        """Filas completas de los IDs de la lista, con una sola consulta"""
+        query = f"SELECT * FROM {table_name} WHERE id IN (SELECT value FROM json_each(?))"
+        return {row['id']: row for row in cursor.execute(query, (json.dumps(list(ids)),))}
+    
+    def _execute_batch(self, cursor: sqlite3.Cursor, query: str, params: List[tuple],
+                       result: 'BulkResult', positions: List[int],
+                       record_ids: Optional[List[int]] = None) -> List[Optional[int]]:
+        """
+        Ejecuta la misma sentencia para cada juego de parámetros.
+        
+        Primero intenta un único executemany dentro de un SAVEPOINT. Si alguna
+        fila viola una restricción, se deshace el SAVEPOINT y se repite fila por
+        fila: SQLite revierte solo la sentencia fallida, así que las filas
+        válidas se conservan y cada error queda registrado en result.
+        
+        Retorna, por cada juego de parámetros, el ID afectado (record_ids en
+        UPDATE/DELETE, el rowid generado en INSERT) o None si la fila falló.
+        """
+        try:
+            with self.db.transaction() as batch:
+                batch.executemany(query, params)
+                if record_ids is not None:
+                    return list(record_ids)
+                last_id = batch.execute("SELECT last_insert_rowid()").fetchone()[0]
+            # Con el bloqueo de escritura tomado, AUTOINCREMENT asigna IDs consecutivos
+            return list(range(last_id - len(params) + 1, last_id + 1))
+        except sqlite3.IntegrityError:
+            pass
+        
+        row_ids = []
+        for i, (position, values) in enumerate(zip(positions, params)):
+            record_id = record_ids[i] if record_ids is not None else None
+            try:
+                cursor.execute(query, values)
+                row_ids.append(record_id if record_ids is not None else cursor.lastrowid)
+            except sqlite3.IntegrityError as e:
+                result.add_error(position, self._integrity_message(e), record_id)
+                row_ids.append(None)
+        return row_ids
+    
+    def _create_many(self, table_name: str, query: str, objects: Sequence[Any],
+                     params: Callable[[Any], tuple]) -> 'BulkResult':
+        """INSERT masivo; ver create_many de cada DAO"""
+        result = BulkResult()
+        if not objects:
+            return result
+        
+        with self.db.transaction() as cursor:
+            row_ids = self._execute_batch(cursor, query, [params(obj) for obj in objects],
+                                          result, list(range(len(objects))))
+            result.ids.extend(row_id for row_id in row_ids if row_id is not None)
+        return result
+    
+    def _update_many(self, table_name: str, query: str, objects: Sequence[Any],
+                     params: Callable[[Any], tuple]) -> 'BulkResult':
+        """
+        UPDATE masivo; ver update_many de cada DAO.
+        
+        Al confirmarse el bloque, los objetos escritos toman como valores
+        leídos la fila guardada (como update()): si no, un update() posterior
+        compararía contra los valores anteriores al lote y podría no escribir.
+        """
+        result = BulkResult()
+        if not objects:
+            return result
+        
+        with self.db.transaction() as cursor:
+            existing = self._existing_ids(table_name, [obj.id for obj in objects])
+            positions = []
+            for position, obj in enumerate(objects):
+                if obj.id in existing:
+                    positions.append(position)
+                else:
+                    result.add_error(position, "Registro no encontrado", obj.id)
+            
+            found = [objects[position] for position in positions]
+            row_ids = self._execute_batch(cursor, query, [params(obj) for obj in found],
+                                          result, positions, [obj.id for obj in found])
+            self._invalidate(table_name, [obj.id for obj in found])
+            result.ids.extend(row_id for row_id in row_ids if row_id is not None)
+            written = [obj for obj, row_id in zip(found, row_ids) if row_id is not None]
+            saved = self._rows_by_id(cursor, table_name, result.ids)
+        
+        for obj in written:
+            obj.mark_clean(saved[obj.id])
+        return result
+    
+    def _delete_many(self, table_name: str, ids: Sequence[int],
+                     cascade: Sequence[str] = ()) -> 'BulkResult':
+        """DELETE masivo; ver delete_many de cada DAO"""
+        result = BulkResult()
+        if not ids:
+            return result
+        
+        query = f"DELETE FROM {table_name} WHERE id = ?"
+        with self.db.transaction() as cursor:
+            existing = self._existing_ids(table_name, ids)
+            positions = []
+            for position, record_id in enumerate(ids):
+                if record_id in existing:
+                    positions.append(position)
+                else:
+                    result.add_error(position, "Registro no encontrado", record_id)
+            
+            found = [ids[position] for position in positions]
+            row_ids = self._execute_batch(cursor, query, [(record_id,) for record_id in found],
+                                          result, positions, found)
+            self._invalidate(table_name, found, cascade)
+            result.ids.extend(row_id for row_id in row_ids if row_id is not None)
+        return result
 
-class Student:
+    # ========================================
+    # INSERTAR O ACTUALIZAR (UPSERT)
+    # ========================================
+
+    def _upsert_many(self, table_name: str, key_column: str, query: str,
+                     objects: Sequence[Any], params: Callable[[Any], tuple]) -> 'UpsertResult':
+        """
+        INSERT ... ON CONFLICT(key_column) DO UPDATE ... RETURNING * por cada
+        objeto, en una sola transacción; ver upsert_by_email / upsert_by_code.
+
+        Para distinguir inserciones de actualizaciones se lee el último ID
+        asignado (sqlite_sequence) antes del lote: con el bloqueo de escritura
+        tomado, un ID mayor solo puede ser una fila nueva de este lote.
+
+        Al confirmarse el bloque, cada objeto escrito toma como valores leídos
+        la última fila que el lote guardó con su clave (ver _update_many).
+        """
+        result = UpsertResult()
+        if not objects:
+            return result
+
+        with self.db.transaction() as cursor:
+            cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table_name,))
+            row = cursor.fetchone()
+            last_id = row[0] if row else 0
+
+            seen = set()
+            written, saved = [], {}
+            for position, obj in enumerate(objects):
+                try:
+                    cursor.execute(query, params(obj))
+                    row = cursor.fetchone()
+                except sqlite3.IntegrityError as e:
+                    result.add_error(position, self._integrity_message(e))
+                    continue
+                record_id = row['id']
+                written.append((obj, record_id))
+                saved[record_id] = row
+
+                # Una clave repetida en el lote actualiza la fila recién escrita
+                if record_id > last_id and record_id not in seen:
+                    result.inserted.append(record_id)
+                else:
+                    result.updated.append(record_id)
+                result.ids.append(record_id)
+                seen.add(record_id)
+
+            self._invalidate(table_name, result.updated)
+
+        for obj, record_id in written:
+            obj.mark_clean(saved[record_id])
+        return result
+
+class TrackedModel:
+    """
+    Base de los modelos: recuerda los valores con que se leyó cada objeto de
+    la base de datos para saber qué atributos se modificaron después.
+
+    La fábrica de filas compilada guarda la fila original y la posición de
+    cada atributo en ella (sin copiar nada). Los objetos creados directamente
+    con el constructor no tienen valores cargados y se consideran sin rastreo.
+    """
+
+    __slots__ = ('_loaded_row', '_loaded_layout')
+
+    def loaded_values(self) -> Optional[Dict[str, Any]]:
+        """Valores leídos de la base de datos, o None si el objeto no se cargó de ella"""
+        row = getattr(self, '_loaded_row', None)
+        if row is None:
+            return None
+        return {field: row[index] for field, index in self._loaded_layout}
+
+    def changed_fields(self, fields: Sequence[str]) -> Optional[List[str]]:
+        """
+        Atributos de fields cuyo valor difiere del leído. Retorna None si no
+        se puede saber (objeto sin rastreo o cargado sin alguna de esas columnas).
+        """
+        loaded = self.loaded_values()
+        if loaded is None or any(field not in loaded for field in fields):
+            return None
+        return [field for field in fields if getattr(self, field) != loaded[field]]
+
+    def mark_clean(self, row: sqlite3.Row = None):
+        """
+        Toma como valores leídos los de la fila indicada (p. ej. la que retorna
+        UPDATE ... RETURNING *) o, sin fila, los valores actuales del objeto
+        """
+        fields = type(self).__slots__
+        if row is None:
+            self._loaded_row = tuple(getattr(self, field) for field in fields)
+        else:
+            self._loaded_row = tuple(row[field] for field in fields)
+        self._loaded_layout = tuple((field, index) for index, field in enumerate(fields))
+
+class Student(TrackedModel):
     """Modelo de datos para Estudiante"""
     
+    # Sin __dict__: menos memoria por objeto y acceso a atributos más rápido
+    __slots__ = ('id', 'first_name', 'last_name', 'email', 'phone', 'birth_date',
+                 'enrollment_date', 'status', 'created_at', 'updated_at')
+    
     def __init__(self, id: int = None, first_name: str = "", last_name: str = "", 
                  email: str = "", phone: str = "", birth_date: str = None, 
                  enrollment_date: str = None, status: str = "active",
@@ -80,9 +427,12 @@ class Student:
             'updated_at': self.updated_at
         }
 
-class Course:
+class Course(TrackedModel):
     """Modelo de datos para Curso"""
     
+    __slots__ = ('id', 'name', 'code', 'description', 'credits', 'semester',
+                 'instructor', 'capacity', 'created_at', 'updated_at')
+    
     def __init__(self, id: int = None, name: str = "", code: str = "", 
                  description: str = "", credits: int = 3, semester: str = "",
                  instructor: str = "", capacity: int = 30,
@@ -115,9 +465,12 @@ class Course:
             'updated_at': self.updated_at
         }
 
-class Enrollment:
+class Enrollment(TrackedModel):
     """Modelo de datos para Inscripción"""
     
+    __slots__ = ('id', 'student_id', 'course_id', 'enrollment_date', 'grade', 'status',
+                 'created_at', 'updated_at')
+    
     def __init__(self, id: int = None, student_id: int = None, course_id: int = None,
                  enrollment_date: str = None, grade: float = None, status: str = "enrolled",
                  created_at: str = None, updated_at: str = None):
@@ -145,6 +498,108 @@ class Enrollment:
             'updated_at': self.updated_at
         }
 
+class BulkResult:
+    """
+    Resultado de una operación masiva (create_many, update_many, delete_many)
+    
+    - ids: IDs procesados con éxito, en el orden de entrada
+    - errors: una entrada por fila rechazada con su posición en la lista
+      de entrada, el ID (si se conoce) y el motivo
+    """
+    
+    def __init__(self):
+        self.ids: List[int] = []
+        self.errors: List[Dict[str, Any]] = []
+    
+    @property
+    def succeeded(self) -> int:
+        return len(self.ids)
+    
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+    
+    def add_error(self, index: int, message: str, record_id: int = None):
+        self.errors.append({'index': index, 'id': record_id, 'error': message})
+    
+    def __str__(self):
+        return f"BulkResult({self.succeeded} correctas, {self.failed} con error)"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'ids': self.ids,
+            'errors': self.errors,
+            'succeeded': self.succeeded,
+            'failed': self.failed
+        }
+
+class UpsertResult(BulkResult):
+    """
+    Resultado de un upsert masivo: además de ids (en el orden de entrada),
+    separa los IDs de filas insertadas y de filas actualizadas
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.inserted: List[int] = []
+        self.updated: List[int] = []
+
+    def __str__(self):
+        return (f"UpsertResult({len(self.inserted)} insertadas, {len(self.updated)} actualizadas, "
+                f"{self.failed} con error)")
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        data['inserted'] = self.inserted
+        data['updated'] = self.updated
+        return data
+
+class GradeUpdateResult(BulkResult):
+    """
+    Resultado de EnrollmentDAO.update_grades, con cada ID en una sola lista
+    (si se repite en el lote, decide la última entrada): ids son las
+    inscripciones actualizadas, unchanged las que ya tenían esa calificación,
+    not_found las inexistentes e invalid las rechazadas por la validación.
+    errors conserva la posición y el motivo de cada rechazo.
+    """
+
+    UPDATED = "updated"
+    UNCHANGED = "unchanged"
+    NOT_FOUND = "not_found"
+    INVALID = "invalid"
+
+    def __init__(self):
+        super().__init__()
+        self.unchanged: List[int] = []
+        self.not_found: List[int] = []
+        self.invalid: List[Any] = []
+
+    @property
+    def updated(self) -> List[int]:
+        return self.ids
+
+    def outcomes(self) -> List[Tuple[Any, str]]:
+        """
+        Pares (ID, resultado) con UPDATED, UNCHANGED, NOT_FOUND o INVALID.
+        Es una lista y no un diccionario porque los IDs inválidos se reportan
+        tal como llegaron y pueden no ser hashables (p. ej. una lista).
+        """
+        return ([(record_id, self.INVALID) for record_id in self.invalid]
+                + [(record_id, self.NOT_FOUND) for record_id in self.not_found]
+                + [(record_id, self.UNCHANGED) for record_id in self.unchanged]
+                + [(record_id, self.UPDATED) for record_id in self.ids])
+
+    def __str__(self):
+        return (f"GradeUpdateResult({len(self.ids)} actualizadas, {len(self.unchanged)} sin cambios, "
+                f"{len(self.not_found)} no encontradas, {len(self.invalid)} inválidas)")
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        data['unchanged'] = self.unchanged
+        data['not_found'] = self.not_found
+        data['invalid'] = self.invalid
+        return data
+
 class StudentDAO(BaseDAO):
     """DAO para operaciones con Estudiantes"""
     
@@ -155,13 +610,12 @@ class StudentDAO(BaseDAO):
         VALUES (?, ?, ?, ?, ?, ?)
         """
         try:
-            with self.db.get_cursor() as cursor:
+            with self.db.transaction() as cursor:
                 cursor.execute(query, (
                     student.first_name, student.last_name, student.email,
                     student.phone, student.birth_date, student.status
                 ))
                 student_id = cursor.lastrowid
-                self._log_operation("students", "CREATE", student_id, None, str(student.to_dict()))
                 return student_id
         except sqlite3.IntegrityError as e:
             if "UNIQUE constraint failed: students.email" in str(e):
@@ -170,39 +624,37 @@ class StudentDAO(BaseDAO):
     
     def get_by_id(self, student_id: int) -> Optional[Student]:
         """Obtiene un estudiante por ID (READ)"""
-        query = "SELECT * FROM students WHERE id = ?"
-        rows = self.db.execute_query(query, (student_id,))
-        return self._dict_to_object(rows[0] if rows else None, Student)
+        return self._find_by_id("students", Student, student_id)
     
     def get_all(self) -> List[Student]:
         """Obtiene todos los estudiantes (READ)"""
         query = "SELECT * FROM students ORDER BY last_name, first_name"
-        rows = self.db.execute_query(query)
-        return [self._dict_to_object(row, Student) for row in rows]
+        return self.db.execute_query(query, (), model=Student)
+    
+    def get_page(self, after: Union[str, Sequence[Any], None] = None, limit: int = 50,
+                 direction: Union[PageDirection, str] = PageDirection.NEXT,
+                 status: str = None) -> Page:
+        """
+        Obtiene una página de estudiantes en el orden de get_all (READ paginado).
+        after: token de una página previa o clave (last_name, first_name, id).
+        """
+        return self._get_page("students", Student, ("last_name", "first_name", "id"), False,
+                              after, limit, direction, {'status': status})
+    
+    def iter_all(self, batch_size: int = 500) -> Iterator[Student]:
+        """Recorre todos los estudiantes sin cargarlos todos en memoria (READ)"""
+        query = "SELECT * FROM students ORDER BY last_name, first_name"
+        yield from self.db.iter_query(query, (), batch_size, model=Student)
     
     def update(self, student: Student) -> bool:
-        """Actualiza un estudiante (UPDATE)"""
-        old_student = self.get_by_id(student.id)
-        if not old_student:
-            return False
-        
-        query = """
-        UPDATE students 
-        SET first_name = ?, last_name = ?, email = ?, phone = ?, 
-            birth_date = ?, status = ?
-        WHERE id = ?
+        """
+        Actualiza un estudiante (UPDATE): solo se escriben las columnas
+        modificadas desde que se leyó; si no cambió nada no se escribe.
         """
         try:
-            affected = self.db.execute_non_query(query, (
-                student.first_name, student.last_name, student.email,
-                student.phone, student.birth_date, student.status, student.id
+            return self._update_changed("students", Student, student, (
+                "first_name", "last_name", "email", "phone", "birth_date", "status"
             ))
-            
-            if affected > 0:
-                self._log_operation("students", "UPDATE", student.id, 
-                                  str(old_student.to_dict()), str(student.to_dict()))
-            return affected > 0
-            
         except sqlite3.IntegrityError as e:
             if "UNIQUE constraint failed: students.email" in str(e):
                 raise ValueError("El email ya existe en el sistema")
@@ -210,39 +662,131 @@ class StudentDAO(BaseDAO):
     
     def delete(self, student_id: int) -> bool:
         """Elimina un estudiante (DELETE)"""
-        old_student = self.get_by_id(student_id)
-        if not old_student:
-            return False
-        
         query = "DELETE FROM students WHERE id = ?"
-        affected = self.db.execute_non_query(query, (student_id,))
-        
-        if affected > 0:
-            self._log_operation("students", "DELETE", student_id, str(old_student.to_dict()), None)
-        return affected > 0
+        with self.db.transaction():
+            affected = self.db.execute_non_query(query, (student_id,))
+            # Las inscripciones eliminadas en cascada también dejan de ser válidas
+            self._invalidate("students", [student_id], cascade=("enrollments",))
+            return affected > 0
+    
+    def create_many(self, students: List[Student]) -> BulkResult:
+        """
+        Crea varios estudiantes en una sola transacción (CREATE masivo).
+        Las filas que violan una restricción se reportan en BulkResult.errors
+        sin abortar el resto del lote.
+        """
+        query = """
+        INSERT INTO students (first_name, last_name, email, phone, birth_date, status) 
+        VALUES (?, ?, ?, ?, ?, ?)
+        """
+        return self._create_many("students", query, students, lambda student: (
+            student.first_name, student.last_name, student.email,
+            student.phone, student.birth_date, student.status
+        ))
+    
+    def update_many(self, students: List[Student]) -> BulkResult:
+        """Actualiza varios estudiantes en una sola transacción (UPDATE masivo)"""
+        query = """
+        UPDATE students 
+        SET first_name = ?, last_name = ?, email = ?, phone = ?, 
+            birth_date = ?, status = ?
+        WHERE id = ?
+        """
+        return self._update_many("students", query, students, lambda student: (
+            student.first_name, student.last_name, student.email,
+            student.phone, student.birth_date, student.status, student.id
+        ))
+    
+    def delete_many(self, student_ids: List[int]) -> BulkResult:
+        """Elimina varios estudiantes en una sola transacción (DELETE masivo)"""
+        return self._delete_many("students", student_ids, cascade=("enrollments",))
+
+    _UPSERT_BY_EMAIL = """
+        INSERT INTO students (first_name, last_name, email, phone, birth_date, status)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(email) DO UPDATE SET
+            first_name = excluded.first_name, last_name = excluded.last_name,
+            phone = excluded.phone, birth_date = excluded.birth_date, status = excluded.status
+        RETURNING *
+        """
+
+    def upsert_by_email(self, student: Student) -> Tuple[int, bool]:
+        """
+        Inserta el estudiante o, si su email ya existe, actualiza esa fila
+        (INSERT ... ON CONFLICT DO UPDATE en una sola sentencia).
+        Retorna (id, insertado): insertado es False si se actualizó.
+        """
+        result = self.upsert_many_by_email([student])
+        if result.errors:
+            raise ValueError(result.errors[0]['error'])
+        return result.ids[0], bool(result.inserted)
+
+    def upsert_many_by_email(self, students: List[Student]) -> UpsertResult:
+        """
+        Upsert por email de varios estudiantes en una sola transacción.
+        UpsertResult.inserted y UpsertResult.updated separan los IDs según
+        el caso; las filas inválidas se reportan en UpsertResult.errors.
+        """
+        return self._upsert_many("students", "email", self._UPSERT_BY_EMAIL, students,
+                                 lambda student: (
+            student.first_name, student.last_name, student.email,
+            student.phone, student.birth_date, student.status
+        ))
+
+    def _integrity_message(self, error: sqlite3.IntegrityError) -> str:
+        if "UNIQUE constraint failed: students.email" in str(error):
+            return "El email ya existe en el sistema"
+        return str(error)
     
     def search_by_name(self, name: str) -> List[Student]:
-        """Busca estudiantes por nombre (SELECT ... WHERE)"""
+        """
+        Busca estudiantes por nombre o apellido usando el índice FTS5.
+        Cada palabra se busca como prefijo, sin distinguir acentos ni
+        mayúsculas, y los resultados se ordenan por relevancia.
+        """
+        expression = build_match_expression(name, ("first_name", "last_name"))
+        if expression is None:
+            # Sin palabras buscables (p. ej. solo signos): búsqueda literal
+            query = """
+            SELECT * FROM students 
+            WHERE first_name LIKE ? OR last_name LIKE ?
+            ORDER BY last_name, first_name
+            """
+            name_pattern = f"%{name}%"
+            return self.db.execute_query(query, (name_pattern, name_pattern), model=Student)
+        return self._search_fts(expression)
+    
+    def search(self, text: str, limit: Optional[int] = None) -> List[Student]:
+        """Búsqueda de texto completo en nombre, apellido, email y teléfono"""
+        expression = build_match_expression(text)
+        if expression is None:
+            return []
+        return self._search_fts(expression, limit)
+    
+    def _search_fts(self, expression: str, limit: Optional[int] = None) -> List[Student]:
+        """Ejecuta una expresión MATCH sobre students_fts, ordenada por bm25"""
         query = """
-        SELECT * FROM students 
-        WHERE first_name LIKE ? OR last_name LIKE ?
-        ORDER BY last_name, first_name
+        SELECT s.* FROM students_fts
+        JOIN students s ON s.id = students_fts.rowid
+        WHERE students_fts MATCH ?
+        ORDER BY rank
         """
-        name_pattern = f"%{name}%"
-        rows = self.db.execute_query(query, (name_pattern, name_pattern))
-        return [self._dict_to_object(row, Student) for row in rows]
+        params = [expression]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self.db.execute_query(query, tuple(params), model=Student)
     
     def search_by_email(self, email: str) -> Optional[Student]:
         """Busca un estudiante por email (SELECT ... WHERE)"""
         query = "SELECT * FROM students WHERE email = ?"
-        rows = self.db.execute_query(query, (email,))
-        return self._dict_to_object(rows[0] if rows else None, Student)
+        rows = self.db.execute_query(query, (email,), model=Student)
+        return rows[0] if rows else None
     
     def get_by_status(self, status: str) -> List[Student]:
         """Obtiene estudiantes por estado (SELECT ... WHERE)"""
         query = "SELECT * FROM students WHERE status = ? ORDER BY last_name, first_name"
-        rows = self.db.execute_query(query, (status,))
-        return [self._dict_to_object(row, Student) for row in rows]
+        return self.db.execute_query(query, (status,), model=Student)
 
 class CourseDAO(BaseDAO):
     """DAO para operaciones con Cursos"""
@@ -254,13 +798,12 @@ class CourseDAO(BaseDAO):
         VALUES (?, ?, ?, ?, ?, ?, ?)
         """
         try:
-            with self.db.get_cursor() as cursor:
+            with self.db.transaction() as cursor:
                 cursor.execute(query, (
                     course.name, course.code, course.description, course.credits,
                     course.semester, course.instructor, course.capacity
                 ))
                 course_id = cursor.lastrowid
-                self._log_operation("courses", "CREATE", course_id, None, str(course.to_dict()))
                 return course_id
         except sqlite3.IntegrityError as e:
             if "UNIQUE constraint failed: courses.code" in str(e):
@@ -269,39 +812,34 @@ class CourseDAO(BaseDAO):
     
     def get_by_id(self, course_id: int) -> Optional[Course]:
         """Obtiene un curso por ID (READ)"""
-        query = "SELECT * FROM courses WHERE id = ?"
-        rows = self.db.execute_query(query, (course_id,))
-        return self._dict_to_object(rows[0] if rows else None, Course)
+        return self._find_by_id("courses", Course, course_id)
     
     def get_all(self) -> List[Course]:
         """Obtiene todos los cursos (READ)"""
         query = "SELECT * FROM courses ORDER BY name"
-        rows = self.db.execute_query(query)
-        return [self._dict_to_object(row, Course) for row in rows]
+        return self.db.execute_query(query, (), model=Course)
     
-    def update(self, course: Course) -> bool:
-        """Actualiza un curso (UPDATE)"""
-        old_course = self.get_by_id(course.id)
-        if not old_course:
-            return False
-        
-        query = """
-        UPDATE courses 
-        SET name = ?, code = ?, description = ?, credits = ?, 
-            semester = ?, instructor = ?, capacity = ?
-        WHERE id = ?
+    def get_page(self, after: Union[str, Sequence[Any], None] = None, limit: int = 50,
+                 direction: Union[PageDirection, str] = PageDirection.NEXT,
+                 semester: str = None) -> Page:
+        """
+        Obtiene una página de cursos en el orden de get_all (READ paginado).
+        after: token de una página previa o clave (name, id).
         """
+        return self._get_page("courses", Course, ("name", "id"), False,
+                              after, limit, direction, {'semester': semester})
+    
+    def iter_all(self, batch_size: int = 500) -> Iterator[Course]:
+        """Recorre todos los cursos sin cargarlos todos en memoria (READ)"""
+        query = "SELECT * FROM courses ORDER BY name"
+        yield from self.db.iter_query(query, (), batch_size, model=Course)
+    
+    def update(self, course: Course) -> bool:
+        """Actualiza un curso (UPDATE) escribiendo solo las columnas modificadas"""
         try:
-            affected = self.db.execute_non_query(query, (
-                course.name, course.code, course.description, course.credits,
-                course.semester, course.instructor, course.capacity, course.id
+            return self._update_changed("courses", Course, course, (
+                "name", "code", "description", "credits", "semester", "instructor", "capacity"
             ))
-            
-            if affected > 0:
-                self._log_operation("courses", "UPDATE", course.id,
-                                  str(old_course.to_dict()), str(course.to_dict()))
-            return affected > 0
-            
         except sqlite3.IntegrityError as e:
             if "UNIQUE constraint failed: courses.code" in str(e):
                 raise ValueError("El código del curso ya existe en el sistema")
@@ -309,35 +847,122 @@ class CourseDAO(BaseDAO):
     
     def delete(self, course_id: int) -> bool:
         """Elimina un curso (DELETE)"""
-        old_course = self.get_by_id(course_id)
-        if not old_course:
-            return False
-        
         query = "DELETE FROM courses WHERE id = ?"
-        affected = self.db.execute_non_query(query, (course_id,))
-        
-        if affected > 0:
-            self._log_operation("courses", "DELETE", course_id, str(old_course.to_dict()), None)
-        return affected > 0
+        with self.db.transaction():
+            affected = self.db.execute_non_query(query, (course_id,))
+            # Las inscripciones eliminadas en cascada también dejan de ser válidas
+            self._invalidate("courses", [course_id], cascade=("enrollments",))
+            return affected > 0
+    
+    def create_many(self, courses: List[Course]) -> BulkResult:
+        """
+        Crea varios cursos en una sola transacción (CREATE masivo).
+        Las filas que violan una restricción se reportan en BulkResult.errors
+        sin abortar el resto del lote.
+        """
+        query = """
+        INSERT INTO courses (name, code, description, credits, semester, instructor, capacity) 
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+        return self._create_many("courses", query, courses, lambda course: (
+            course.name, course.code, course.description, course.credits,
+            course.semester, course.instructor, course.capacity
+        ))
+    
+    def update_many(self, courses: List[Course]) -> BulkResult:
+        """Actualiza varios cursos en una sola transacción (UPDATE masivo)"""
+        query = """
+        UPDATE courses 
+        SET name = ?, code = ?, description = ?, credits = ?, 
+            semester = ?, instructor = ?, capacity = ?
+        WHERE id = ?
+        """
+        return self._update_many("courses", query, courses, lambda course: (
+            course.name, course.code, course.description, course.credits,
+            course.semester, course.instructor, course.capacity, course.id
+        ))
+    
+    def delete_many(self, course_ids: List[int]) -> BulkResult:
+        """Elimina varios cursos en una sola transacción (DELETE masivo)"""
+        return self._delete_many("courses", course_ids, cascade=("enrollments",))
+
+    _UPSERT_BY_CODE = """
+        INSERT INTO courses (name, code, description, credits, semester, instructor, capacity)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(code) DO UPDATE SET
+            name = excluded.name, description = excluded.description, credits = excluded.credits,
+            semester = excluded.semester, instructor = excluded.instructor, capacity = excluded.capacity
+        RETURNING *
+        """
+
+    def upsert_by_code(self, course: Course) -> Tuple[int, bool]:
+        """
+        Inserta el curso o, si su código ya existe, actualiza esa fila
+        (INSERT ... ON CONFLICT DO UPDATE en una sola sentencia).
+        Retorna (id, insertado): insertado es False si se actualizó.
+        """
+        result = self.upsert_many_by_code([course])
+        if result.errors:
+            raise ValueError(result.errors[0]['error'])
+        return result.ids[0], bool(result.inserted)
+
+    def upsert_many_by_code(self, courses: List[Course]) -> UpsertResult:
+        """Upsert por código de varios cursos en una sola transacción (ver upsert_many_by_email)"""
+        return self._upsert_many("courses", "code", self._UPSERT_BY_CODE, courses,
+                                 lambda course: (
+            course.name, course.code, course.description, course.credits,
+            course.semester, course.instructor, course.capacity
+        ))
+
+    def _integrity_message(self, error: sqlite3.IntegrityError) -> str:
+        if "UNIQUE constraint failed: courses.code" in str(error):
+            return "El código del curso ya existe en el sistema"
+        return str(error)
     
     def search_by_code(self, code: str) -> Optional[Course]:
         """Busca un curso por código (SELECT ... WHERE)"""
         query = "SELECT * FROM courses WHERE code = ?"
-        rows = self.db.execute_query(query, (code,))
-        return self._dict_to_object(rows[0] if rows else None, Course)
+        rows = self.db.execute_query(query, (code,), model=Course)
+        return rows[0] if rows else None
     
     def search_by_name(self, name: str) -> List[Course]:
-        """Busca cursos por nombre (SELECT ... WHERE)"""
-        query = "SELECT * FROM courses WHERE name LIKE ? ORDER BY name"
-        name_pattern = f"%{name}%"
-        rows = self.db.execute_query(query, (name_pattern,))
-        return [self._dict_to_object(row, Course) for row in rows]
+        """
+        Busca cursos por nombre usando el índice FTS5 (prefijos, sin acentos,
+        ordenados por relevancia)
+        """
+        expression = build_match_expression(name, ("name",))
+        if expression is None:
+            # Sin palabras buscables (p. ej. solo signos): búsqueda literal
+            query = "SELECT * FROM courses WHERE name LIKE ? ORDER BY name"
+            name_pattern = f"%{name}%"
+            return self.db.execute_query(query, (name_pattern,), model=Course)
+        return self._search_fts(expression)
+    
+    def search(self, text: str, limit: Optional[int] = None) -> List[Course]:
+        """Búsqueda de texto completo en nombre, código y descripción"""
+        expression = build_match_expression(text)
+        if expression is None:
+            return []
+        return self._search_fts(expression, limit)
+    
+    def _search_fts(self, expression: str, limit: Optional[int] = None) -> List[Course]:
+        """Ejecuta una expresión MATCH sobre courses_fts, ordenada por bm25"""
+        query = """
+        SELECT c.* FROM courses_fts
+        JOIN courses c ON c.id = courses_fts.rowid
+        WHERE courses_fts MATCH ?
+        ORDER BY rank
+        """
+        params = [expression]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self.db.execute_query(query, tuple(params), model=Course)
     
     def get_by_semester(self, semester: str) -> List[Course]:
         """Obtiene cursos por semestre (SELECT ... WHERE)"""
         query = "SELECT * FROM courses WHERE semester = ? ORDER BY name"
-        rows = self.db.execute_query(query, (semester,))
-        return [self._dict_to_object(row, Course) for row in rows]
+        return self.db.execute_query(query, (semester,), model=Course)
 
 class EnrollmentDAO(BaseDAO):
     """DAO para operaciones con Inscripciones"""
@@ -349,13 +974,12 @@ class EnrollmentDAO(BaseDAO):
         VALUES (?, ?, ?, ?)
         """
         try:
-            with self.db.get_cursor() as cursor:
+            with self.db.transaction() as cursor:
                 cursor.execute(query, (
                     enrollment.student_id, enrollment.course_id, 
                     enrollment.grade, enrollment.status
                 ))
                 enrollment_id = cursor.lastrowid
-                self._log_operation("enrollments", "CREATE", enrollment_id, None, str(enrollment.to_dict()))
                 return enrollment_id
         except sqlite3.IntegrityError as e:
             if "UNIQUE constraint failed: enrollments.student_id, enrollments.course_id" in str(e):
@@ -366,38 +990,34 @@ class EnrollmentDAO(BaseDAO):
     
     def get_by_id(self, enrollment_id: int) -> Optional[Enrollment]:
         """Obtiene una inscripción por ID (READ)"""
-        query = "SELECT * FROM enrollments WHERE id = ?"
-        rows = self.db.execute_query(query, (enrollment_id,))
-        return self._dict_to_object(rows[0] if rows else None, Enrollment)
+        return self._find_by_id("enrollments", Enrollment, enrollment_id)
     
     def get_all(self) -> List[Enrollment]:
         """Obtiene todas las inscripciones (READ)"""
         query = "SELECT * FROM enrollments ORDER BY enrollment_date DESC"
-        rows = self.db.execute_query(query)
-        return [self._dict_to_object(row, Enrollment) for row in rows]
+        return self.db.execute_query(query, (), model=Enrollment)
     
-    def update(self, enrollment: Enrollment) -> bool:
-        """Actualiza una inscripción (UPDATE)"""
-        old_enrollment = self.get_by_id(enrollment.id)
-        if not old_enrollment:
-            return False
-        
-        query = """
-        UPDATE enrollments 
-        SET student_id = ?, course_id = ?, grade = ?, status = ?
-        WHERE id = ?
+    def get_page(self, after: Union[str, Sequence[Any], None] = None, limit: int = 50,
+                 direction: Union[PageDirection, str] = PageDirection.NEXT) -> Page:
+        """
+        Obtiene una página de inscripciones en el orden de get_all, de la más
+        reciente a la más antigua (READ paginado).
+        after: token de una página previa o clave (enrollment_date, id).
         """
+        return self._get_page("enrollments", Enrollment, ("enrollment_date", "id"), True,
+                              after, limit, direction)
+    
+    def iter_all(self, batch_size: int = 500) -> Iterator[Enrollment]:
+        """Recorre todas las inscripciones sin cargarlas todas en memoria (READ)"""
+        query = "SELECT * FROM enrollments ORDER BY enrollment_date DESC"
+        yield from self.db.iter_query(query, (), batch_size, model=Enrollment)
+    
+    def update(self, enrollment: Enrollment) -> bool:
+        """Actualiza una inscripción (UPDATE) escribiendo solo las columnas modificadas"""
         try:
-            affected = self.db.execute_non_query(query, (
-                enrollment.student_id, enrollment.course_id, 
-                enrollment.grade, enrollment.status, enrollment.id
+            return self._update_changed("enrollments", Enrollment, enrollment, (
+                "student_id", "course_id", "grade", "status"
             ))
-            
-            if affected > 0:
-                self._log_operation("enrollments", "UPDATE", enrollment.id,
-                                  str(old_enrollment.to_dict()), str(enrollment.to_dict()))
-            return affected > 0
-            
         except sqlite3.IntegrityError as e:
             if "UNIQUE constraint failed" in str(e):
                 raise ValueError("El estudiante ya está inscrito en este curso")
@@ -407,28 +1027,216 @@ class EnrollmentDAO(BaseDAO):
     
     def delete(self, enrollment_id: int) -> bool:
         """Elimina una inscripción (DELETE)"""
-        old_enrollment = self.get_by_id(enrollment_id)
-        if not old_enrollment:
-            return False
-        
         query = "DELETE FROM enrollments WHERE id = ?"
-        affected = self.db.execute_non_query(query, (enrollment_id,))
+        with self.db.transaction():
+            affected = self.db.execute_non_query(query, (enrollment_id,))
+            self._invalidate("enrollments", [enrollment_id])
+            return affected > 0
+    
+    def create_many(self, enrollments: List[Enrollment]) -> BulkResult:
+        """
+        Crea varias inscripciones en una sola transacción (CREATE masivo).
+        Las filas que violan una restricción se reportan en BulkResult.errors
+        sin abortar el resto del lote.
+        """
+        query = """
+        INSERT INTO enrollments (student_id, course_id, grade, status) 
+        VALUES (?, ?, ?, ?)
+        """
+        return self._create_many("enrollments", query, enrollments, lambda enrollment: (
+            enrollment.student_id, enrollment.course_id,
+            enrollment.grade, enrollment.status
+        ))
+    
+    def update_many(self, enrollments: List[Enrollment]) -> BulkResult:
+        """Actualiza varias inscripciones en una sola transacción (UPDATE masivo)"""
+        query = """
+        UPDATE enrollments 
+        SET student_id = ?, course_id = ?, grade = ?, status = ?
+        WHERE id = ?
+        """
+        return self._update_many("enrollments", query, enrollments, lambda enrollment: (
+            enrollment.student_id, enrollment.course_id,
+            enrollment.grade, enrollment.status, enrollment.id
+        ))
+    
+    def delete_many(self, enrollment_ids: List[int]) -> BulkResult:
+        """Elimina varias inscripciones en una sola transacción (DELETE masivo)"""
+        return self._delete_many("enrollments", enrollment_ids)
+    
+    # ========================================
+    # PUBLICACIÓN MASIVA DE CALIFICACIONES
+    # ========================================
+    
+    # Solo quedan en el área de carga las calificaciones que cambian
+    _GRADES_NOT_FOUND = """
+        DELETE FROM temp.grade_updates
+        WHERE NOT EXISTS (SELECT 1 FROM enrollments e WHERE e.id = grade_updates.enrollment_id)
+        RETURNING enrollment_id
+        """
+    
+    _GRADES_UNCHANGED = """
+        DELETE FROM temp.grade_updates
+        WHERE EXISTS (SELECT 1 FROM enrollments e
+                      WHERE e.id = grade_updates.enrollment_id
+                        AND e.grade IS grade_updates.grade)
+        RETURNING enrollment_id
+        """
+    
+    # Misma entrada que escribiría enrollments_audit_update, una por fila. La
+    # imagen nueva lleva el updated_at que el UPDATE asigna (:updated_at)
+    _GRADES_AUDIT = f"""
+        INSERT INTO audit_log (table_name, operation, record_id, old_values, new_values, user_id)
+        SELECT 'enrollments', 'UPDATE', e.id,
+               {audit_image('enrollments', 'e')},
+               {audit_image('enrollments', 'e', {'grade': 'g.grade', 'updated_at': ':updated_at'})},
+               'system'
+        FROM temp.grade_updates g
+        JOIN enrollments e ON e.id = g.enrollment_id
+        ORDER BY g.enrollment_id
+        """
+    
+    # El IN hace que SQLite recorra el área de carga y busque cada inscripción
+    # por clave, en lugar de recorrer toda la tabla enrollments
+    _GRADES_APPLY = """
+        UPDATE enrollments SET grade = g.grade, updated_at = :updated_at
+        FROM temp.grade_updates AS g
+        WHERE enrollments.id = g.enrollment_id
+          AND enrollments.id IN (SELECT enrollment_id FROM temp.grade_updates)
+        """
+    
+    # Los totales de calificaciones se recalculan solo para los estudiantes y
+    # cursos con alguna inscripción modificada (búsquedas por índice)
+    _GRADES_STUDENT_AGGREGATES = """
+        UPDATE student_aggregates SET grade_sum = t.grade_sum, grade_count = t.grade_count
+        FROM (SELECT e.student_id, COALESCE(SUM(e.grade), 0) AS grade_sum, COUNT(e.grade) AS grade_count
+              FROM enrollments e
+              WHERE e.student_id IN (SELECT m.student_id FROM enrollments m
+                                     WHERE m.id IN (SELECT enrollment_id FROM temp.grade_updates))
+              GROUP BY e.student_id) AS t
+        WHERE student_aggregates.student_id = t.student_id
+        """
+    
+    _GRADES_COURSE_AGGREGATES = """
+        UPDATE course_aggregates SET grade_sum = t.grade_sum, grade_count = t.grade_count,
+                                     grade_min = t.grade_min, grade_max = t.grade_max
+        FROM (SELECT e.course_id, COALESCE(SUM(e.grade), 0) AS grade_sum, COUNT(e.grade) AS grade_count,
+                     MIN(e.grade) AS grade_min, MAX(e.grade) AS grade_max
+              FROM enrollments e
+              WHERE e.course_id IN (SELECT m.course_id FROM enrollments m
+                                    WHERE m.id IN (SELECT enrollment_id FROM temp.grade_updates))
+              GROUP BY e.course_id) AS t
+        WHERE course_aggregates.course_id = t.course_id
+        """
+    
+    @staticmethod
+    def _grade_error(enrollment_id: Any, grade: Any) -> Optional[str]:
+        """Motivo por el que un par (id, calificación) no se puede aplicar, o None"""
+        if not isinstance(enrollment_id, int) or isinstance(enrollment_id, bool):
+            return "ID de inscripción inválido"
+        if grade is None:
+            return None
+        if not isinstance(grade, (int, float)) or isinstance(grade, bool) or not 0 <= grade <= 100:
+            # También rechaza NaN: ninguna comparación con NaN es verdadera
+            return "La calificación debe ser un número entre 0 y 100"
+        return None
+    
+    def update_grades(self, grade_updates: Sequence[Tuple[int, Optional[float]]]) -> GradeUpdateResult:
+        """
+        Aplica muchas calificaciones (enrollment_id, grade) como un conjunto.
+        grade None borra la calificación. Si un ID se repite, decide la última
+        entrada, sea válida o no.
         
-        if affected > 0:
-            self._log_operation("enrollments", "DELETE", enrollment_id, str(old_enrollment.to_dict()), None)
-        return affected > 0
+        1. Todo el lote se valida antes de escribir (el mismo rango que el
+           CHECK de la tabla), así que una fila inválida no aborta el resto
+        2. Las válidas se cargan en una tabla temporal (executemany), de la
+           que salen las inexistentes y las que no cambian la calificación
+        3. Un solo UPDATE ... FROM aplica el resto; la auditoría, updated_at y
+           los agregados se escriben con una sentencia por conjunto en lugar
+           de los triggers por fila, que se suspenden dentro de la transacción
+           (ver ENROLLMENTS_UPDATE_TRIGGERS en migrations.py)
+        
+        Retorna un GradeUpdateResult con el resultado de cada ID.
+        """
+        result = GradeUpdateResult()
+        latest: Dict[int, Tuple[int, Any]] = {}
+        for position, (enrollment_id, grade) in enumerate(grade_updates):
+            if not isinstance(enrollment_id, int) or isinstance(enrollment_id, bool):
+                result.add_error(position, self._grade_error(enrollment_id, grade), enrollment_id)
+                result.invalid.append(enrollment_id)
+            else:
+                latest[enrollment_id] = (position, grade)
+        
+        staged: Dict[int, Optional[float]] = {}
+        for enrollment_id, (position, grade) in latest.items():
+            error = self._grade_error(enrollment_id, grade)
+            if error:
+                result.add_error(position, error, enrollment_id)
+                result.invalid.append(enrollment_id)
+            else:
+                staged[enrollment_id] = None if grade is None else float(grade)
+        if staged:
+            self._apply_grades(staged, latest, result)
+        result.errors.sort(key=lambda error: error['index'])
+        return result
+    
+    def _apply_grades(self, staged: Dict[int, Optional[float]],
+                      latest: Dict[int, Tuple[int, Any]], result: GradeUpdateResult):
+        """Carga las calificaciones validadas y las aplica como un conjunto (ver update_grades)"""
+        with self.db.transaction() as cursor:
+            cursor.execute("CREATE TEMP TABLE grade_updates (enrollment_id INTEGER PRIMARY KEY, grade REAL)")
+            cursor.executemany("INSERT INTO temp.grade_updates (enrollment_id, grade) VALUES (?, ?)",
+                               staged.items())
+            missing = {row[0] for row in cursor.execute(self._GRADES_NOT_FOUND)}
+            unchanged = {row[0] for row in cursor.execute(self._GRADES_UNCHANGED)}
+            
+            # Un solo instante para la fila y su imagen en la auditoría
+            stamp = {'updated_at': cursor.execute("SELECT CURRENT_TIMESTAMP").fetchone()[0]}
+            
+            # Los triggers por fila se borran y se vuelven a crear con el mismo
+            # SQL antes del COMMIT (o vuelven con el ROLLBACK): ninguna otra
+            # conexión llega a ver la tabla sin ellos
+            triggers = cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' "
+                "AND name IN (SELECT value FROM json_each(?))",
+                (json.dumps(ENROLLMENTS_UPDATE_TRIGGERS),)
+            ).fetchall()
+            for name in ENROLLMENTS_UPDATE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(self._GRADES_AUDIT, stamp)
+            cursor.execute(self._GRADES_APPLY, stamp)
+            cursor.execute(self._GRADES_STUDENT_AGGREGATES)
+            cursor.execute(self._GRADES_COURSE_AGGREGATES)
+            for (sql,) in triggers:
+                cursor.execute(sql)
+            cursor.execute("DROP TABLE temp.grade_updates")
+            
+            for enrollment_id in staged:
+                if enrollment_id in missing:
+                    result.add_error(latest[enrollment_id][0], "Registro no encontrado", enrollment_id)
+                    result.not_found.append(enrollment_id)
+                elif enrollment_id in unchanged:
+                    result.unchanged.append(enrollment_id)
+                else:
+                    result.ids.append(enrollment_id)
+            self._invalidate("enrollments", result.ids)
+    
+    def _integrity_message(self, error: sqlite3.IntegrityError) -> str:
+        if "UNIQUE constraint failed" in str(error):
+            return "El estudiante ya está inscrito en este curso"
+        elif "FOREIGN KEY constraint failed" in str(error):
+            return "Estudiante o curso no válido"
+        return str(error)
     
     def get_by_student(self, student_id: int) -> List[Enrollment]:
         """Obtiene inscripciones de un estudiante (SELECT ... WHERE)"""
         query = "SELECT * FROM enrollments WHERE student_id = ? ORDER BY enrollment_date DESC"
-        rows = self.db.execute_query(query, (student_id,))
-        return [self._dict_to_object(row, Enrollment) for row in rows]
+        return self.db.execute_query(query, (student_id,), model=Enrollment)
     
     def get_by_course(self, course_id: int) -> List[Enrollment]:
         """Obtiene inscripciones de un curso (SELECT ... WHERE)"""
         query = "SELECT * FROM enrollments WHERE course_id = ? ORDER BY enrollment_date DESC"
-        rows = self.db.execute_query(query, (course_id,))
-        return [self._dict_to_object(row, Enrollment) for row in rows]
+        return self.db.execute_query(query, (course_id,), model=Enrollment)
     
     def get_enrollment_details(self) -> List[Dict[str, Any]]:
         """Obtiene detalles completos de inscripciones con JOIN"""
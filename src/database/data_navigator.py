@@ -11,12 +11,14 @@ conjunto de registros, manteniendo el estado actual y permitiendo operaciones
 de filtrado y ordenamiento.
 """
 
-from typing import List, Any, Optional, Callable, Dict
+from typing import List, Any, Optional, Callable, Dict, Sequence, Tuple
 from enum import Enum
 from datetime import datetime
 import sqlite3
+from .change_feed import Change, ChangeFeed
 from .connection import DatabaseConnection
 from .dao import Student, Course, Enrollment, StudentDAO, CourseDAO, EnrollmentDAO
+from .fts import build_match_expression
 
 class SortOrder(Enum):
     """Enum para definir el orden de clasificación"""
@@ -42,6 +44,9 @@ class RecordSet:
         self._sort_key = None
         self._sort_order = SortOrder.ASC
         self._original_records = self._records.copy()
+        self._by_id = self._index(self._original_records)
+        # Posición del flujo de cambios (ChangeFeed) con que se cargaron los registros
+        self.seq: Optional[int] = None
     
     @property
     def records(self) -> List[Any]:
@@ -157,11 +162,122 @@ class RecordSet:
         Actualiza el conjunto de registros manteniendo filtros y orden
         """
         self._original_records = new_records.copy()
+        self._by_id = self._index(self._original_records)
         self._records = new_records.copy()
         self._apply_filter()
         self._apply_sort()
         self._current_index = min(self._current_index, max(0, len(self._records) - 1))
     
+    def apply_changes(self, changes: Sequence[Change], model: type,
+                      belongs: Callable[[Any], bool] = None) -> int:
+        """
+        Aplica sobre los registros cargados los cambios de ChangeFeed.changes_since()
+        sin volver a leer la tabla.
+        
+        Los cambios se resuelven primero por ID en el índice _by_id (último
+        estado de cada registro) y las listas se reconstruyen una sola vez al
+        final, sin búsquedas lineales por cambio.
+        
+        belongs decide si un registro nuevo o modificado forma parte del
+        conjunto (p. ej. el estado con que se filtró la carga); por defecto
+        todos. Se conservan el filtro, el orden y el registro actual. Sin orden
+        explícito, un registro modificado mantiene su lugar y uno nuevo se
+        agrega al final. Retorna cuántos cambios modificaron el conjunto.
+        """
+        current_id = getattr(self.current_record, 'id', None)
+        applied = 0
+        # ID -> estado final del registro (None si salió del conjunto)
+        touched: Dict[Any, Any] = {}
+        
+        for change in changes:
+            old = self._by_id.pop(change.record_id, None)
+            new = None
+            if change.operation != "DELETE" and change.new_values is not None:
+                new = model(**change.new_values)
+                new.mark_clean()
+                if belongs is not None and not belongs(new):
+                    new = None
+            
+            if new is not None:
+                self._by_id[change.record_id] = new
+            if old is not None or new is not None:
+                touched[change.record_id] = new
+                applied += 1
+        
+        if changes:
+            self.seq = changes[-1].seq
+        if touched:
+            self._replace_records(touched)
+        
+        current = self._by_id.get(current_id)
+        position = None
+        if current is not None:
+            position = next((i for i, record in enumerate(self._records) if record is current), None)
+        if position is not None:
+            self._current_index = position
+        else:
+            self._current_index = min(self._current_index, max(0, len(self._records) - 1))
+        return applied
+    
+    def _replace_records(self, touched: Dict[Any, Any]):
+        """
+        Reemplaza o quita los registros modificados y agrega los nuevos con una
+        pasada por lista (ver apply_changes)
+        """
+        placed = set()
+        originals = []
+        for record in self._original_records:
+            record_id = getattr(record, 'id', None)
+            if record_id in touched:
+                placed.add(record_id)
+                record = touched[record_id]
+                if record is None:
+                    continue
+            originals.append(record)
+        originals.extend(record for record_id, record in touched.items()
+                         if record is not None and record_id not in placed)
+        self._original_records = originals
+        
+        # Con orden explícito los modificados se reinsertan por búsqueda binaria
+        keep_place = self._sort_key is None
+        visible = self._filter_function or (lambda record: True)
+        shown = set()
+        records = []
+        for record in self._records:
+            record_id = getattr(record, 'id', None)
+            if record_id in touched:
+                record = touched[record_id]
+                if not keep_place or record is None or not visible(record):
+                    continue
+                shown.add(record_id)
+            records.append(record)
+        self._records = records
+        for record_id, record in touched.items():
+            if record is not None and record_id not in shown and visible(record):
+                self._insert_record(record)
+    
+    def _insert_record(self, record: Any):
+        """Inserta un registro en _records respetando el orden actual (búsqueda binaria)"""
+        if self._sort_key is None:
+            self._records.append(record)
+            return
+        
+        key = self._sort_key(record)
+        descending = self._sort_order == SortOrder.DESC
+        low, high = 0, len(self._records)
+        while low < high:
+            middle = (low + high) // 2
+            other = self._sort_key(self._records[middle])
+            if (key > other) if descending else (key < other):
+                high = middle
+            else:
+                low = middle + 1
+        self._records.insert(low, record)
+    
+    @staticmethod
+    def _index(records: List[Any]) -> Dict[Any, Any]:
+        return {getattr(record, 'id', None): record for record in records}
+    
     def _apply_filter(self):
         """Aplica el filtro actual si existe"""
         if self._filter_function:
@@ -193,6 +309,12 @@ class DataNavigator:
         self.student_recordset = RecordSet()
         self.course_recordset = RecordSet()
         self.enrollment_recordset = RecordSet()
+        
+        # Flujo de cambios para sync(): por tabla, el recordset, su modelo, la
+        # condición de pertenencia de la última carga (None si no se puede
+        # evaluar en memoria, p. ej. una búsqueda FTS) y cómo recargarlo
+        self.change_feed = ChangeFeed(self.db)
+        self._live: Dict[str, Tuple[RecordSet, type, Optional[Callable[[Any], bool]], Callable[[], Any]]] = {}
     
     # ========================================
     # NAVEGACIÓN DE ESTUDIANTES
@@ -203,20 +325,29 @@ class DataNavigator:
         Carga todos los estudiantes en el recordset de navegación
         """
         try:
+            seq = self.change_feed.current_seq()
+            belongs = None
             if filter_criteria:
                 if filter_criteria.lower() == "active":
                     students = self.student_dao.get_by_status("active")
+                    belongs = lambda s: s.status == "active"
                 elif filter_criteria.lower() == "inactive":
                     students = self.student_dao.get_by_status("inactive")
+                    belongs = lambda s: s.status == "inactive"
                 elif "@" in filter_criteria:  # Búsqueda por email
                     student = self.student_dao.search_by_email(filter_criteria)
                     students = [student] if student else []
+                    belongs = lambda s: s.email == filter_criteria
                 else:  # Búsqueda por nombre
                     students = self.student_dao.search_by_name(filter_criteria)
             else:
                 students = self.student_dao.get_all()
+                belongs = lambda s: True
             
             self.student_recordset.refresh(students)
+            self.student_recordset.seq = seq
+            self._live['students'] = (self.student_recordset, Student, belongs,
+                                      lambda: self.load_students(filter_criteria))
             print(f"✓ Cargados {len(students)} estudiantes")
             return self.student_recordset
             
@@ -264,10 +395,13 @@ class DataNavigator:
         Carga todos los cursos en el recordset de navegación
         """
         try:
+            seq = self.change_feed.current_seq()
+            belongs = None
             if filter_criteria:
                 # Puede ser búsqueda por nombre, código o semestre
                 if filter_criteria.startswith("20"):  # Probablemente un semestre
                     courses = self.course_dao.get_by_semester(filter_criteria)
+                    belongs = lambda c: c.semester == filter_criteria
                 else:  # Búsqueda por nombre o código
                     courses_by_name = self.course_dao.search_by_name(filter_criteria)
                     course_by_code = self.course_dao.search_by_code(filter_criteria)
@@ -276,8 +410,12 @@ class DataNavigator:
                         courses.append(course_by_code)
             else:
                 courses = self.course_dao.get_all()
+                belongs = lambda c: True
             
             self.course_recordset.refresh(courses)
+            self.course_recordset.seq = seq
+            self._live['courses'] = (self.course_recordset, Course, belongs,
+                                     lambda: self.load_courses(filter_criteria))
             print(f"✓ Cargados {len(courses)} cursos")
             return self.course_recordset
             
@@ -326,14 +464,21 @@ class DataNavigator:
         Carga las inscripciones en el recordset de navegación
         """
         try:
+            seq = self.change_feed.current_seq()
             if student_id:
                 enrollments = self.enrollment_dao.get_by_student(student_id)
+                belongs = lambda e: e.student_id == student_id
             elif course_id:
                 enrollments = self.enrollment_dao.get_by_course(course_id)
+                belongs = lambda e: e.course_id == course_id
             else:
                 enrollments = self.enrollment_dao.get_all()
+                belongs = lambda e: True
             
             self.enrollment_recordset.refresh(enrollments)
+            self.enrollment_recordset.seq = seq
+            self._live['enrollments'] = (self.enrollment_recordset, Enrollment, belongs,
+                                         lambda: self.load_enrollments(student_id, course_id))
             print(f"✓ Cargadas {len(enrollments)} inscripciones")
             return self.enrollment_recordset
             
@@ -355,6 +500,40 @@ class DataNavigator:
             return self.enrollment_recordset.last()
         return self.enrollment_recordset.current_record
     
+    # ========================================
+    # SINCRONIZACIÓN INCREMENTAL
+    # ========================================
+    
+    def close(self):
+        """Cierra la conexión de sondeo del flujo de cambios"""
+        self.change_feed.close()
+    
+    def sync(self) -> Dict[str, int]:
+        """
+        Actualiza los recordsets cargados con los cambios confirmados desde su
+        carga, sin releer las tablas. Si ninguna conexión escribió desde la
+        llamada anterior (PRAGMA data_version) no se consulta nada.
+        
+        Las cargas que no se pueden evaluar en memoria (búsquedas por nombre o
+        código) y las que quedaron atrás de la rotación de la auditoría se
+        recargan completas. Retorna los cambios aplicados por tabla.
+        """
+        if not self.change_feed.has_changed():
+            return {}
+        
+        applied = {}
+        for table_name, (recordset, model, belongs, reload) in list(self._live.items()):
+            covered = self.change_feed.covers(recordset.seq)
+            changes = self.change_feed.changes_since(recordset.seq, tables=(table_name,))
+            if covered and not changes:
+                continue
+            if belongs is None or not covered:
+                reload()
+            else:
+                recordset.apply_changes(changes, model, belongs)
+            applied[table_name] = len(changes)
+        return applied
+    
     # ========================================
     # BÚSQUEDA Y FILTRADO AVANZADO
     # ========================================
@@ -363,32 +542,47 @@ class DataNavigator:
         """
         Búsqueda avanzada de estudiantes con múltiples criterios
         """
-        query_parts = ["SELECT * FROM students WHERE 1=1"]
+        # Nombre, email y teléfono se buscan en el índice FTS5 (por prefijo y
+        # sin acentos); si el texto no tiene palabras se usa LIKE literal
+        match_parts = []
+        conditions = []
         params = []
         
-        if criteria.get('name'):
-            query_parts.append("AND (first_name LIKE ? OR last_name LIKE ?)")
-            name_pattern = f"%{criteria['name']}%"
-            params.extend([name_pattern, name_pattern])
-        
-        if criteria.get('email'):
-            query_parts.append("AND email LIKE ?")
-            params.append(f"%{criteria['email']}%")
+        text_criteria = [
+            ('name', ("first_name", "last_name")),
+            ('email', ("email",)),
+            ('phone', ("phone",))
+        ]
+        for key, columns in text_criteria:
+            if not criteria.get(key):
+                continue
+            expression = build_match_expression(criteria[key], columns)
+            if expression:
+                match_parts.append(expression)
+            else:
+                pattern = f"%{criteria[key]}%"
+                conditions.append("(" + " OR ".join(f"s.{column} LIKE ?" for column in columns) + ")")
+                params.extend([pattern] * len(columns))
         
         if criteria.get('status'):
-            query_parts.append("AND status = ?")
+            conditions.append("s.status = ?")
             params.append(criteria['status'])
         
-        if criteria.get('phone'):
-            query_parts.append("AND phone LIKE ?")
-            params.append(f"%{criteria['phone']}%")
+        if match_parts:
+            query_parts = [
+                "SELECT s.* FROM students_fts JOIN students s ON s.id = students_fts.rowid",
+                "WHERE students_fts MATCH ?"
+            ]
+            params.insert(0, " AND ".join(match_parts))
+        else:
+            query_parts = ["SELECT s.* FROM students s WHERE 1=1"]
         
-        query_parts.append("ORDER BY last_name, first_name")
+        query_parts.extend(f"AND {condition}" for condition in conditions)
+        query_parts.append("ORDER BY rank" if match_parts else "ORDER BY s.last_name, s.first_name")
         query = " ".join(query_parts)
         
         try:
-            rows = self.db.execute_query(query, tuple(params))
-            students = [Student(**dict(row)) for row in rows]
+            students = self.db.execute_query(query, tuple(params), model=Student)
             print(f"✓ Búsqueda avanzada encontró {len(students)} estudiantes")
             return students
         except Exception as e:
@@ -397,7 +591,9 @@ class DataNavigator:
     
     def get_student_statistics(self, student_id: int) -> Dict[str, Any]:
         """
-        Obtiene estadísticas detalladas de un estudiante específico
+        Obtiene estadísticas detalladas de un estudiante específico.
+        Los totales se leen de student_aggregates (mantenida por triggers):
+        dos búsquedas por clave primaria en lugar de un JOIN con GROUP BY.
         """
         query = """
         SELECT 
@@ -405,15 +601,13 @@ class DataNavigator:
             s.last_name,
             s.email,
             s.status,
-            COUNT(e.id) as total_enrollments,
-            COUNT(CASE WHEN e.status = 'completed' THEN 1 END) as completed_courses,
-            AVG(CASE WHEN e.grade IS NOT NULL THEN e.grade END) as avg_grade,
-            SUM(CASE WHEN e.status = 'completed' THEN c.credits ELSE 0 END) as total_credits
+            a.enrollment_count as total_enrollments,
+            a.completed_count as completed_courses,
+            a.grade_sum / NULLIF(a.grade_count, 0) as avg_grade,
+            a.completed_credits as total_credits
         FROM students s
-        LEFT JOIN enrollments e ON s.id = e.student_id
-        LEFT JOIN courses c ON e.course_id = c.id
+        JOIN student_aggregates a ON a.student_id = s.id
         WHERE s.id = ?
-        GROUP BY s.id, s.first_name, s.last_name, s.email, s.status
         """
         
         try:
@@ -0,0 +1,43 @@
+"""
+Búsqueda de Texto Completo (FTS5)
+
+Las búsquedas con LIKE '%texto%' no pueden usar índices: cada búsqueda recorre
+la tabla completa. Las tablas virtuales FTS5 (students_fts, courses_fts) guardan
+un índice invertido de los tokens de cada registro, de modo que una búsqueda por
+prefijo se resuelve consultando solo ese índice.
+
+- El tokenizador unicode61 con remove_diacritics elimina acentos y mayúsculas:
+  "maria" encuentra "María" y "martinez" encuentra "Martínez".
+- Cada palabra buscada se trata como prefijo ("mar" encuentra "Martínez").
+- Los resultados se ordenan por relevancia (bm25).
+"""
+
+import re
+from typing import Optional, Sequence
+
+# Igual que unicode61: letras y dígitos forman tokens, lo demás separa
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> list:
+    """Divide el texto de búsqueda en los tokens que indexa FTS5"""
+    return _TOKEN.findall(text or "")
+
+
+def build_match_expression(text: str, columns: Optional[Sequence[str]] = None) -> Optional[str]:
+    """
+    Construye una expresión MATCH donde cada palabra es un prefijo obligatorio.
+
+    build_match_expression("Mar Gar", ["first_name", "last_name"])
+    -> '{first_name last_name} : ("mar"* AND "gar"*)'
+
+    Retorna None si el texto no contiene palabras buscables.
+    """
+    tokens = tokenize(text)
+    if not tokens:
+        return None
+
+    expression = " AND ".join(f'"{token.lower()}"*' for token in tokens)
+    if columns:
+        return f"{{{' '.join(columns)}}} : ({expression})"
+    return expression
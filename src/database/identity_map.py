@@ -0,0 +1,117 @@
+"""
+Mapa de Identidad (Identity Map)
+
+Dentro de una unidad de trabajo, cada registro se carga de la base de datos
+una sola vez: las siguientes llamadas a get_by_id con la misma clave retornan
+el mismo objeto sin ejecutar otra consulta. Esto evita viajes repetidos (por
+ejemplo, CRUDOperations.update_student lee el estudiante y StudentDAO.update
+lo vuelve a leer para saber qué columnas cambiaron) y garantiza que dos lecturas del mismo
+registro compartan un único objeto.
+
+Junto a cada objeto se guarda una copia de la fila tal como se leyó, de modo
+que la imagen "antes" con que se comparan los cambios no se vea afectada si
+el objeto se modifica en memoria.
+
+El mapa vive mientras dura la unidad de trabajo (DatabaseConnection.transaction()
+o DatabaseConnection.unit_of_work()) y solo es visible para el hilo que la abrió.
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+
+class IdentityMap:
+    """
+    Objetos cargados en la unidad de trabajo actual, indexados por (tabla, id)
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, int], Tuple[Any, Dict[str, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, table_name: str, record_id: int) -> Optional[Any]:
+        """Retorna el objeto cargado previamente, o None (y cuenta un fallo)"""
+        entry = self._entries.get((table_name, record_id))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def add(self, table_name: str, record_id: int, obj: Any, row: Dict[str, Any]):
+        """Registra un objeto recién leído junto con la fila original"""
+        self._entries[(table_name, record_id)] = (obj, dict(row))
+
+    def original(self, table_name: str, record_id: int) -> Optional[Dict[str, Any]]:
+        """Valores de la fila tal como se leyó de la base de datos"""
+        entry = self._entries.get((table_name, record_id))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return dict(entry[1])
+
+    def discard(self, table_name: str, record_id: int):
+        """Invalida un registro después de escribirlo"""
+        if self._entries.pop((table_name, record_id), None) is not None:
+            self.invalidations += 1
+
+    def discard_table(self, table_name: str):
+        """Invalida todos los registros de una tabla (p. ej. tras un borrado en cascada)"""
+        for key in [key for key in self._entries if key[0] == table_name]:
+            del self._entries[key]
+            self.invalidations += 1
+
+    def clear(self):
+        """Invalida todo el mapa (p. ej. al revertir una transacción)"""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class IdentityMapStats:
+    """
+    Contadores acumulados de todas las unidades de trabajo, seguros para hilos
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record(self, identity_map: IdentityMap):
+        """Suma los contadores de un mapa al cerrar su unidad de trabajo"""
+        with self._lock:
+            self._scopes += 1
+            self._hits += identity_map.hits
+            self._misses += identity_map.misses
+            self._invalidations += identity_map.invalidations
+
+    def snapshot(self, active: Optional[IdentityMap] = None) -> Dict[str, Any]:
+        """Contadores acumulados más los del mapa activo en el hilo actual"""
+        with self._lock:
+            hits, misses = self._hits, self._misses
+            invalidations, scopes = self._invalidations, self._scopes
+        if active is not None:
+            hits += active.hits
+            misses += active.misses
+            invalidations += active.invalidations
+        lookups = hits + misses
+        return {
+            'units_of_work': scopes,
+            'hits': hits,
+            'misses': misses,
+            'invalidations': invalidations,
+            'hit_ratio': round(hits / lookups, 3) if lookups else 0.0,
+            'active_entries': len(active) if active is not None else 0
+        }
+
+    def reset(self):
+        with self._lock:
+            self._scopes = 0
+            self._hits = 0
+            self._misses = 0
+            self._invalidations = 0
@@ -0,0 +1,704 @@
+"""
+Migraciones Versionadas del Esquema
+
+El esquema de la base de datos evoluciona con el proyecto: nuevas tablas,
+índices o triggers. En lugar de ejecutar todas las sentencias CREATE en cada
+arranque, cada cambio se registra como una "migración" numerada y la versión
+aplicada se guarda en la propia base de datos (PRAGMA user_version).
+
+Al iniciar:
+1. Se lee PRAGMA user_version (una sola lectura)
+2. Si la versión es la más reciente, no se ejecuta ninguna sentencia DDL
+3. Si no, se aplican solo las migraciones pendientes, en orden, cada una
+   dentro de su propia transacción
+
+Para agregar un cambio al esquema, añada una nueva Migration al final de
+MIGRATIONS con el siguiente número de versión. Nunca modifique una migración
+que ya fue publicada.
+"""
+
+import sqlite3
+from typing import Callable, Dict, List, Union
+
+# ========================================
+# VERSIÓN 1: ESQUEMA INICIAL
+# ========================================
+
+_INITIAL_TABLES = [
+    # Tabla de Estudiantes
+    """
+    CREATE TABLE IF NOT EXISTS students (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        phone TEXT,
+        birth_date DATE,
+        enrollment_date DATE NOT NULL DEFAULT CURRENT_DATE,
+        status TEXT CHECK(status IN ('active', 'inactive', 'graduated')) DEFAULT 'active',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+
+    # Tabla de Cursos
+    """
+    CREATE TABLE IF NOT EXISTS courses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        code TEXT UNIQUE NOT NULL,
+        description TEXT,
+        credits INTEGER NOT NULL DEFAULT 3,
+        semester TEXT,
+        instructor TEXT,
+        capacity INTEGER DEFAULT 30,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+
+    # Tabla de Inscripciones (Integridad Referencial)
+    """
+    CREATE TABLE IF NOT EXISTS enrollments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id INTEGER NOT NULL,
+        course_id INTEGER NOT NULL,
+        enrollment_date DATE NOT NULL DEFAULT CURRENT_DATE,
+        grade REAL CHECK(grade >= 0 AND grade <= 100),
+        status TEXT CHECK(status IN ('enrolled', 'completed', 'dropped')) DEFAULT 'enrolled',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+        FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
+        UNIQUE(student_id, course_id)
+    )
+    """,
+
+    # Tabla de Auditoría
+    """
+    CREATE TABLE IF NOT EXISTS audit_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        operation TEXT NOT NULL,
+        record_id INTEGER,
+        old_values TEXT,
+        new_values TEXT,
+        user_id TEXT,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """
+]
+
+
+# Triggers para actualizar updated_at automáticamente
+_TIMESTAMP_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS update_students_timestamp 
+    AFTER UPDATE ON students
+    FOR EACH ROW
+    BEGIN
+        UPDATE students SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+    END
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS update_courses_timestamp 
+    AFTER UPDATE ON courses
+    FOR EACH ROW
+    BEGIN
+        UPDATE courses SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+    END
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS update_enrollments_timestamp 
+    AFTER UPDATE ON enrollments
+    FOR EACH ROW
+    BEGIN
+        UPDATE enrollments SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+    END
+    """
+]
+
+# ========================================
+# VERSIÓN 2: ÍNDICES SECUNDARIOS
+# ========================================
+
+# Índices para los predicados y ordenamientos más usados por los DAO.
+# Los de inscripciones incluyen las columnas que leen los historiales
+# académicos y las listas de curso, de modo que esas consultas se
+# resuelven solo con el índice (covering index).
+_SECONDARY_INDEXES = [
+    # StudentDAO.get_all / search_by_name: ORDER BY last_name, first_name
+    "CREATE INDEX IF NOT EXISTS idx_students_name ON students(last_name, first_name)",
+    # StudentDAO.get_by_status: WHERE status = ? ORDER BY last_name, first_name
+    "CREATE INDEX IF NOT EXISTS idx_students_status_name ON students(status, last_name, first_name)",
+    # CourseDAO.get_all / search_by_name: ORDER BY name
+    "CREATE INDEX IF NOT EXISTS idx_courses_name ON courses(name)",
+    # CourseDAO.get_by_semester: WHERE semester = ? ORDER BY name
+    "CREATE INDEX IF NOT EXISTS idx_courses_semester_name ON courses(semester, name)",
+    # EnrollmentDAO.get_all / get_enrollment_details: ORDER BY enrollment_date DESC
+    "CREATE INDEX IF NOT EXISTS idx_enrollments_date ON enrollments(enrollment_date)",
+    # EnrollmentDAO.get_by_student y el historial académico
+    """
+    CREATE INDEX IF NOT EXISTS idx_enrollments_student_date
+    ON enrollments(student_id, enrollment_date, course_id, grade, status)
+    """,
+    # EnrollmentDAO.get_by_course y la lista de estudiantes de un curso
+    """
+    CREATE INDEX IF NOT EXISTS idx_enrollments_course_date
+    ON enrollments(course_id, enrollment_date, student_id, grade, status)
+    """
+]
+
+
+# ========================================
+# VERSIÓN 3: BÚSQUEDA DE TEXTO COMPLETO (FTS5)
+# ========================================
+
+# Tablas FTS5 de contenido externo: el texto vive en students/courses y el
+# índice invertido se mantiene con triggers. remove_diacritics 2 pliega los
+# acentos ("María" -> "maria") y prefix='2 3' acelera las búsquedas por prefijo.
+_FTS_TOKENIZER = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+
+_FULL_TEXT_SEARCH = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+        first_name, last_name, email, phone,
+        content = 'students', content_rowid = 'id', {_FTS_TOKENIZER}
+    )
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS students_fts_insert
+    AFTER INSERT ON students
+    BEGIN
+        INSERT INTO students_fts (rowid, first_name, last_name, email, phone)
+        VALUES (NEW.id, NEW.first_name, NEW.last_name, NEW.email, NEW.phone);
+    END
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS students_fts_delete
+    AFTER DELETE ON students
+    BEGIN
+        INSERT INTO students_fts (students_fts, rowid, first_name, last_name, email, phone)
+        VALUES ('delete', OLD.id, OLD.first_name, OLD.last_name, OLD.email, OLD.phone);
+    END
+    """,
+
+    # Solo cuando cambian columnas indexadas (no en la actualización de updated_at)
+    """
+    CREATE TRIGGER IF NOT EXISTS students_fts_update
+    AFTER UPDATE OF first_name, last_name, email, phone ON students
+    BEGIN
+        INSERT INTO students_fts (students_fts, rowid, first_name, last_name, email, phone)
+        VALUES ('delete', OLD.id, OLD.first_name, OLD.last_name, OLD.email, OLD.phone);
+        INSERT INTO students_fts (rowid, first_name, last_name, email, phone)
+        VALUES (NEW.id, NEW.first_name, NEW.last_name, NEW.email, NEW.phone);
+    END
+    """,
+
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS courses_fts USING fts5(
+        name, code, description,
+        content = 'courses', content_rowid = 'id', {_FTS_TOKENIZER}
+    )
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS courses_fts_insert
+    AFTER INSERT ON courses
+    BEGIN
+        INSERT INTO courses_fts (rowid, name, code, description)
+        VALUES (NEW.id, NEW.name, NEW.code, NEW.description);
+    END
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS courses_fts_delete
+    AFTER DELETE ON courses
+    BEGIN
+        INSERT INTO courses_fts (courses_fts, rowid, name, code, description)
+        VALUES ('delete', OLD.id, OLD.name, OLD.code, OLD.description);
+    END
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS courses_fts_update
+    AFTER UPDATE OF name, code, description ON courses
+    BEGIN
+        INSERT INTO courses_fts (courses_fts, rowid, name, code, description)
+        VALUES ('delete', OLD.id, OLD.name, OLD.code, OLD.description);
+        INSERT INTO courses_fts (rowid, name, code, description)
+        VALUES (NEW.id, NEW.name, NEW.code, NEW.description);
+    END
+    """,
+
+    # Indexar los registros existentes
+    "INSERT INTO students_fts (students_fts) VALUES ('rebuild')",
+    "INSERT INTO courses_fts (courses_fts) VALUES ('rebuild')"
+]
+
+
+# ========================================
+# VERSIÓN 4: RETENCIÓN DE LA AUDITORÍA
+# ========================================
+
+_AUDIT_RETENTION = [
+    # Historial de un registro: WHERE table_name = ? AND record_id = ? ORDER BY timestamp
+    """
+    CREATE INDEX IF NOT EXISTS idx_audit_log_record
+    ON audit_log(table_name, record_id, timestamp)
+    """,
+    # Rotación por antigüedad: WHERE timestamp < ?
+    "CREATE INDEX IF NOT EXISTS idx_audit_log_timestamp ON audit_log(timestamp)",
+    # Catálogo de archivos de auditoría (ver audit_archive.py): el rango de
+    # fechas de cada archivo permite descartarlo sin abrirlo
+    """
+    CREATE TABLE IF NOT EXISTS audit_archives (
+        path TEXT PRIMARY KEY,
+        first_timestamp TIMESTAMP,
+        last_timestamp TIMESTAMP,
+        row_count INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """
+]
+
+
+# ========================================
+# VERSIÓN 5: CAPTURA DE CAMBIOS CON TRIGGERS
+# ========================================
+
+# Columnas de cada tabla auditada; las imágenes "antes" y "después" se
+# guardan en audit_log como json_object(...) desde la misma sentencia que
+# modifica la fila, sin pasar por Python. Así también quedan auditadas las
+# escrituras hechas fuera de los DAO (operaciones por lotes, limpiezas,
+# borrados en cascada).
+_AUDITED_COLUMNS = {
+    'students': ['first_name', 'last_name', 'email', 'phone', 'birth_date',
+                 'enrollment_date', 'status'],
+    'courses': ['name', 'code', 'description', 'credits', 'semester', 'instructor', 'capacity'],
+    'enrollments': ['student_id', 'course_id', 'enrollment_date', 'grade', 'status'],
+}
+
+
+def audit_image(table_name: str, row: str, overrides: Dict[str, str] = None) -> str:
+    """
+    Expresión json_object(...) con la imagen de una fila auditada de
+    table_name (row: NEW, OLD o un alias); overrides reemplaza el valor de
+    algunas columnas por otras expresiones SQL
+    """
+    overrides = overrides or {}
+    fields = ['id'] + _AUDITED_COLUMNS[table_name] + ['created_at', 'updated_at']
+    return "json_object(" + ", ".join(f"'{field}', {overrides.get(field, f'{row}.{field}')}"
+                                      for field in fields) + ")"
+
+
+def _insert_audit(table_name: str, operation: str, row: str, old: str, new: str) -> str:
+    return ("INSERT INTO audit_log (table_name, operation, record_id, old_values, new_values, user_id) "
+            f"VALUES ('{table_name}', '{operation}', {row}.id, {old}, {new}, 'system');")
+
+
+def _audit_triggers(table_name: str, columns: List[str]) -> List[str]:
+    """Triggers AFTER INSERT/UPDATE/DELETE que escriben la auditoría de una tabla"""
+    changed = " OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in columns)
+    return [
+        f"""
+    CREATE TRIGGER IF NOT EXISTS {table_name}_audit_insert
+    AFTER INSERT ON {table_name}
+    BEGIN
+        {_insert_audit(table_name, 'CREATE', 'NEW', 'NULL', audit_image(table_name, 'NEW'))}
+    END
+    """,
+        # Solo columnas de datos: la actualización de updated_at que hace el
+        # trigger de timestamp no genera otra entrada, ni tampoco un UPDATE
+        # que deja los mismos valores
+        f"""
+    CREATE TRIGGER IF NOT EXISTS {table_name}_audit_update
+    AFTER UPDATE OF {', '.join(columns)} ON {table_name}
+    WHEN {changed}
+    BEGIN
+        {_insert_audit(table_name, 'UPDATE', 'NEW', audit_image(table_name, 'OLD'), audit_image(table_name, 'NEW'))}
+    END
+    """,
+        f"""
+    CREATE TRIGGER IF NOT EXISTS {table_name}_audit_delete
+    AFTER DELETE ON {table_name}
+    BEGIN
+        {_insert_audit(table_name, 'DELETE', 'OLD', audit_image(table_name, 'OLD'), 'NULL')}
+    END
+    """
+    ]
+
+
+_AUDIT_TRIGGERS = [statement
+                   for table_name, columns in _AUDITED_COLUMNS.items()
+                   for statement in _audit_triggers(table_name, columns)]
+
+
+
+# ========================================
+# VERSIÓN 6: AGREGADOS POR ESTUDIANTE
+# ========================================
+
+def _student_aggregates_delta(row: str, sign: str) -> str:
+    """UPDATE que suma (sign '+') o resta (sign '-') la inscripción row a su estudiante"""
+    return f"""UPDATE student_aggregates SET
+            enrollment_count = enrollment_count {sign} 1,
+            completed_count = completed_count {sign} ({row}.status = 'completed'),
+            grade_count = grade_count {sign} ({row}.grade IS NOT NULL),
+            -- Sin calificaciones la suma vuelve a 0 exacto (sin residuos de coma flotante)
+            grade_sum = CASE WHEN grade_count {sign} ({row}.grade IS NOT NULL) = 0 THEN 0
+                             ELSE grade_sum {sign} COALESCE({row}.grade, 0) END,
+            completed_credits = completed_credits {sign} CASE WHEN {row}.status = 'completed'
+                THEN COALESCE((SELECT credits FROM courses WHERE id = {row}.course_id), 0) ELSE 0 END
+        WHERE student_id = {row}.student_id;"""
+
+
+# Totales por estudiante que antes se calculaban con LEFT JOIN + GROUP BY (o
+# en Python) en cada consulta; los triggers los mantienen exactos en cada
+# escritura de enrollments y courses, de modo que leerlos es una búsqueda
+# por clave primaria.
+_STUDENT_AGGREGATES = [
+    """
+    CREATE TABLE IF NOT EXISTS student_aggregates (
+        student_id INTEGER PRIMARY KEY,
+        enrollment_count INTEGER NOT NULL DEFAULT 0,
+        completed_count INTEGER NOT NULL DEFAULT 0,
+        grade_sum REAL NOT NULL DEFAULT 0,
+        grade_count INTEGER NOT NULL DEFAULT 0,
+        completed_credits INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS student_aggregates_student_insert
+    AFTER INSERT ON students
+    BEGIN
+        INSERT INTO student_aggregates (student_id) VALUES (NEW.id);
+    END
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS student_aggregates_student_delete
+    AFTER DELETE ON students
+    BEGIN
+        DELETE FROM student_aggregates WHERE student_id = OLD.id;
+    END
+    """,
+
+    f"""
+    CREATE TRIGGER IF NOT EXISTS student_aggregates_enrollment_insert
+    AFTER INSERT ON enrollments
+    BEGIN
+        {_student_aggregates_delta('NEW', '+')}
+    END
+    """,
+
+    f"""
+    CREATE TRIGGER IF NOT EXISTS student_aggregates_enrollment_delete
+    AFTER DELETE ON enrollments
+    BEGIN
+        {_student_aggregates_delta('OLD', '-')}
+    END
+    """,
+
+    f"""
+    CREATE TRIGGER IF NOT EXISTS student_aggregates_enrollment_update
+    AFTER UPDATE OF student_id, course_id, grade, status ON enrollments
+    WHEN OLD.student_id IS NOT NEW.student_id OR OLD.course_id IS NOT NEW.course_id
+      OR OLD.grade IS NOT NEW.grade OR OLD.status IS NOT NEW.status
+    BEGIN
+        {_student_aggregates_delta('OLD', '-')}
+        {_student_aggregates_delta('NEW', '+')}
+    END
+    """,
+
+    # Cambio de créditos: se ajustan los estudiantes que completaron el curso
+    """
+    CREATE TRIGGER IF NOT EXISTS student_aggregates_course_credits
+    AFTER UPDATE OF credits ON courses
+    WHEN OLD.credits IS NOT NEW.credits
+    BEGIN
+        UPDATE student_aggregates SET completed_credits = completed_credits
+            + (COALESCE(NEW.credits, 0) - COALESCE(OLD.credits, 0))
+            * (SELECT COUNT(*) FROM enrollments e
+               WHERE e.course_id = NEW.id AND e.status = 'completed'
+                 AND e.student_id = student_aggregates.student_id)
+        WHERE student_id IN (SELECT student_id FROM enrollments
+                             WHERE course_id = NEW.id AND status = 'completed');
+    END
+    """,
+
+    # Al borrar un curso, sus inscripciones se eliminan en cascada cuando el
+    # curso ya no existe (los triggers de enrollments restan 0 créditos):
+    # los créditos se descuentan antes, mientras el curso todavía se puede leer
+    """
+    CREATE TRIGGER IF NOT EXISTS student_aggregates_course_delete
+    BEFORE DELETE ON courses
+    BEGIN
+        UPDATE student_aggregates SET completed_credits = completed_credits
+            - COALESCE(OLD.credits, 0)
+            * (SELECT COUNT(*) FROM enrollments e
+               WHERE e.course_id = OLD.id AND e.status = 'completed'
+                 AND e.student_id = student_aggregates.student_id)
+        WHERE student_id IN (SELECT student_id FROM enrollments
+                             WHERE course_id = OLD.id AND status = 'completed');
+    END
+    """,
+
+    # Valores iniciales a partir de los datos existentes
+    """
+    INSERT OR REPLACE INTO student_aggregates
+        (student_id, enrollment_count, completed_count, grade_sum, grade_count, completed_credits)
+    SELECT s.id,
+           COUNT(e.id),
+           COUNT(CASE WHEN e.status = 'completed' THEN 1 END),
+           COALESCE(SUM(e.grade), 0),
+           COUNT(e.grade),
+           COALESCE(SUM(CASE WHEN e.status = 'completed' THEN c.credits ELSE 0 END), 0)
+    FROM students s
+    LEFT JOIN enrollments e ON e.student_id = s.id
+    LEFT JOIN courses c ON c.id = e.course_id
+    GROUP BY s.id
+    """
+]
+
+
+
+# ========================================
+# VERSIÓN 7: AGREGADOS POR CURSO
+# ========================================
+
+def _course_aggregates_delta(row: str, sign: str) -> str:
+    """UPDATE que suma (sign '+') o resta (sign '-') la inscripción row a su curso"""
+    if sign == '+':
+        grade_min = f"CASE WHEN grade_min IS NULL OR {row}.grade < grade_min THEN {row}.grade ELSE grade_min END"
+        grade_max = f"CASE WHEN grade_max IS NULL OR {row}.grade > grade_max THEN {row}.grade ELSE grade_max END"
+    else:
+        # Si se retira el mínimo o el máximo, se recalcula sobre las
+        # inscripciones del curso (búsqueda por idx_enrollments_course_date)
+        grade_min = (f"CASE WHEN {row}.grade > grade_min THEN grade_min ELSE "
+                     f"(SELECT MIN(grade) FROM enrollments WHERE course_id = {row}.course_id) END")
+        grade_max = (f"CASE WHEN {row}.grade < grade_max THEN grade_max ELSE "
+                     f"(SELECT MAX(grade) FROM enrollments WHERE course_id = {row}.course_id) END")
+    return f"""UPDATE course_aggregates SET
+            enrollment_count = enrollment_count {sign} 1,
+            enrolled_count = enrolled_count {sign} ({row}.status = 'enrolled'),
+            completed_count = completed_count {sign} ({row}.status = 'completed'),
+            dropped_count = dropped_count {sign} ({row}.status = 'dropped'),
+            grade_count = grade_count {sign} ({row}.grade IS NOT NULL),
+            grade_sum = CASE WHEN grade_count {sign} ({row}.grade IS NOT NULL) = 0 THEN 0
+                             ELSE grade_sum {sign} COALESCE({row}.grade, 0) END,
+            grade_min = CASE WHEN {row}.grade IS NULL THEN grade_min ELSE {grade_min} END,
+            grade_max = CASE WHEN {row}.grade IS NULL THEN grade_max ELSE {grade_max} END
+        WHERE course_id = {row}.course_id;"""
+
+
+# Totales por curso para los reportes y el "top N" de cursos: se leen por
+# clave primaria (o por el índice de popularidad) en lugar de agrupar todas
+# las inscripciones. Los cupos disponibles descuentan las inscripciones no
+# abandonadas de la capacidad del curso (copiada aquí por trigger).
+_COURSE_AGGREGATES = [
+    """
+    CREATE TABLE IF NOT EXISTS course_aggregates (
+        course_id INTEGER PRIMARY KEY,
+        capacity INTEGER,
+        enrollment_count INTEGER NOT NULL DEFAULT 0,
+        enrolled_count INTEGER NOT NULL DEFAULT 0,
+        completed_count INTEGER NOT NULL DEFAULT 0,
+        dropped_count INTEGER NOT NULL DEFAULT 0,
+        grade_sum REAL NOT NULL DEFAULT 0,
+        grade_count INTEGER NOT NULL DEFAULT 0,
+        grade_min REAL,
+        grade_max REAL,
+        seats_remaining INTEGER GENERATED ALWAYS AS
+            (capacity - enrollment_count + dropped_count) VIRTUAL
+    )
+    """,
+
+    # "Top N cursos": lectura de las primeras N entradas del índice
+    """
+    CREATE INDEX IF NOT EXISTS idx_course_aggregates_popularity
+    ON course_aggregates(enrollment_count DESC, course_id)
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS course_aggregates_course_insert
+    AFTER INSERT ON courses
+    BEGIN
+        INSERT INTO course_aggregates (course_id, capacity) VALUES (NEW.id, NEW.capacity);
+    END
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS course_aggregates_course_capacity
+    AFTER UPDATE OF capacity ON courses
+    WHEN OLD.capacity IS NOT NEW.capacity
+    BEGIN
+        UPDATE course_aggregates SET capacity = NEW.capacity WHERE course_id = NEW.id;
+    END
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS course_aggregates_course_delete
+    AFTER DELETE ON courses
+    BEGIN
+        DELETE FROM course_aggregates WHERE course_id = OLD.id;
+    END
+    """,
+
+    f"""
+    CREATE TRIGGER IF NOT EXISTS course_aggregates_enrollment_insert
+    AFTER INSERT ON enrollments
+    BEGIN
+        {_course_aggregates_delta('NEW', '+')}
+    END
+    """,
+
+    f"""
+    CREATE TRIGGER IF NOT EXISTS course_aggregates_enrollment_delete
+    AFTER DELETE ON enrollments
+    BEGIN
+        {_course_aggregates_delta('OLD', '-')}
+    END
+    """,
+
+    f"""
+    CREATE TRIGGER IF NOT EXISTS course_aggregates_enrollment_update
+    AFTER UPDATE OF course_id, grade, status ON enrollments
+    WHEN OLD.course_id IS NOT NEW.course_id OR OLD.grade IS NOT NEW.grade
+      OR OLD.status IS NOT NEW.status
+    BEGIN
+        {_course_aggregates_delta('OLD', '-')}
+        {_course_aggregates_delta('NEW', '+')}
+    END
+    """,
+
+    # Valores iniciales a partir de los datos existentes
+    """
+    INSERT OR REPLACE INTO course_aggregates
+        (course_id, capacity, enrollment_count, enrolled_count, completed_count, dropped_count,
+         grade_sum, grade_count, grade_min, grade_max)
+    SELECT c.id, c.capacity,
+           COUNT(e.id),
+           COUNT(CASE WHEN e.status = 'enrolled' THEN 1 END),
+           COUNT(CASE WHEN e.status = 'completed' THEN 1 END),
+           COUNT(CASE WHEN e.status = 'dropped' THEN 1 END),
+           COALESCE(SUM(e.grade), 0),
+           COUNT(e.grade),
+           MIN(e.grade),
+           MAX(e.grade)
+    FROM courses c
+    LEFT JOIN enrollments e ON e.course_id = c.id
+    GROUP BY c.id
+    """
+]
+
+
+
+# Triggers por fila que dispara un UPDATE de enrollments. Una escritura por
+# conjunto (EnrollmentDAO.update_grades) los suspende dentro de su propia
+# transacción y escribe lo mismo con una sentencia por conjunto; las
+# escrituras fila a fila no pagan ninguna comprobación adicional.
+ENROLLMENTS_UPDATE_TRIGGERS = (
+    'update_enrollments_timestamp',
+    'enrollments_audit_update',
+    'student_aggregates_enrollment_update',
+    'course_aggregates_enrollment_update',
+)
+
+
+class Migration:
+    """
+    Un cambio versionado del esquema.
+    Cada paso puede ser una sentencia SQL o una función que recibe el cursor.
+    """
+
+    def __init__(self, version: int, description: str,
+                 steps: List[Union[str, Callable[[sqlite3.Cursor], None]]]):
+        self.version = version
+        self.description = description
+        self.steps = steps
+
+    def apply(self, cursor: sqlite3.Cursor):
+        """Ejecuta los pasos de la migración"""
+        for step in self.steps:
+            if callable(step):
+                step(cursor)
+            else:
+                cursor.execute(step)
+
+    def __str__(self):
+        return f"Migration({self.version}, {self.description})"
+
+
+# Lista ordenada de migraciones; la versión del esquema es la de la última
+MIGRATIONS = [
+    Migration(1, "Esquema inicial: tablas, integridad referencial y triggers",
+              _INITIAL_TABLES + _TIMESTAMP_TRIGGERS),
+    Migration(2, "Índices secundarios para las consultas de los DAO",
+              _SECONDARY_INDEXES),
+    Migration(3, "Búsqueda de texto completo (FTS5) en estudiantes y cursos",
+              _FULL_TEXT_SEARCH),
+    Migration(4, "Índices y catálogo de archivos para la retención de la auditoría",
+              _AUDIT_RETENTION),
+    Migration(5, "Captura de cambios para la auditoría con triggers (json_object)",
+              _AUDIT_TRIGGERS),
+    Migration(6, "Agregados por estudiante mantenidos con triggers (student_aggregates)",
+              _STUDENT_AGGREGATES),
+    Migration(7, "Agregados por curso mantenidos con triggers (course_aggregates)",
+              _COURSE_AGGREGATES),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+class MigrationRunner:
+    """
+    Aplica las migraciones pendientes sobre una DatabaseConnection
+    """
+
+    def __init__(self, db, migrations: List[Migration] = None):
+        self.db = db
+        self.migrations = migrations or MIGRATIONS
+
+    @property
+    def latest_version(self) -> int:
+        return self.migrations[-1].version if self.migrations else 0
+
+    def current_version(self) -> int:
+        """Versión del esquema almacenada en la base de datos"""
+        with self.db.pool.connection() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def pending(self, current_version: int = None) -> List[Migration]:
+        """Migraciones que aún no se han aplicado"""
+        if current_version is None:
+            current_version = self.current_version()
+        return [m for m in self.migrations if m.version > current_version]
+
+    def migrate(self) -> List[Migration]:
+        """
+        Aplica las migraciones pendientes y retorna las aplicadas.
+        Si el esquema está al día, solo se ejecuta la lectura de user_version.
+        """
+        if self.current_version() >= self.latest_version:
+            return []
+
+        applied = []
+        for migration in self.migrations:
+            with self.db.transaction() as cursor:
+                # Volver a leer la versión dentro de la transacción de escritura:
+                # otro proceso pudo haber aplicado la migración mientras tanto
+                version = cursor.execute("PRAGMA user_version").fetchone()[0]
+                if migration.version <= version:
+                    continue
+                migration.apply(cursor)
+                cursor.execute(f"PRAGMA user_version = {int(migration.version)}")
+            applied.append(migration)
+            print(f"✓ Migración {migration.version} aplicada: {migration.description}")
+
+        return applied
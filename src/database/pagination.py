@@ -0,0 +1,103 @@
+"""
+Paginación por Clave (Keyset Pagination)
+
+Con LIMIT/OFFSET la base de datos tiene que leer y descartar todas las filas
+anteriores a la página pedida: la página 1000 cuesta mil veces más que la
+primera. La paginación por clave recuerda la clave de ordenamiento de la
+última fila mostrada y pide "las siguientes N filas después de esta clave":
+
+    SELECT * FROM students
+    WHERE (last_name, first_name, id) > (?, ?, ?)
+    ORDER BY last_name, first_name, id
+    LIMIT ?
+
+Con un índice sobre las columnas de la clave, cualquier página cuesta lo
+mismo que la primera. El ID se incluye al final de la clave para que el
+orden sea total aunque haya nombres repetidos.
+"""
+
+import base64
+import binascii
+import json
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+class PageDirection(Enum):
+    """Dirección en la que se lee una página respecto a la clave de referencia"""
+    NEXT = "next"
+    PREVIOUS = "prev"
+
+
+def encode_cursor(key: Sequence[Any], direction: PageDirection) -> str:
+    """Codifica una clave y una dirección como token opaco (seguro para URLs)"""
+    payload = json.dumps({'key': list(key), 'dir': direction.value}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(token: str) -> Tuple[Tuple[Any, ...], PageDirection]:
+    """Decodifica un token generado por encode_cursor"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        return tuple(payload['key']), PageDirection(payload['dir'])
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        raise ValueError("Cursor de paginación inválido")
+
+
+class Page:
+    """
+    Una página de resultados con los tokens para pedir la siguiente y la anterior
+    """
+
+    def __init__(self, items: List[Any], next_cursor: Optional[str] = None,
+                 prev_cursor: Optional[str] = None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __str__(self):
+        return f"Page({len(self.items)} registros, siguiente={self.has_next}, anterior={self.has_prev})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'items': [item.to_dict() if hasattr(item, 'to_dict') else item for item in self.items],
+            'next_cursor': self.next_cursor,
+            'prev_cursor': self.prev_cursor
+        }
+
+
+def build_page_query(table_name: str, key_columns: Sequence[str], descending: bool,
+                     forward: bool, has_key: bool, filters: Sequence[str] = ()) -> str:
+    """
+    Construye la consulta de una página.
+
+    El orden natural es ascendente (o descendente si descending); al leer
+    hacia atrás se invierten la comparación y el orden, y el llamador invierte
+    las filas obtenidas.
+    """
+    ascending = forward != descending
+    conditions = [f"{column} = ?" for column in filters]
+    if has_key:
+        placeholders = ", ".join("?" for _ in key_columns)
+        conditions.append(f"({', '.join(key_columns)}) {'>' if ascending else '<'} ({placeholders})")
+
+    query = f"SELECT * FROM {table_name}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    order = "ASC" if ascending else "DESC"
+    query += " ORDER BY " + ", ".join(f"{column} {order}" for column in key_columns)
+    return query + " LIMIT ?"
@@ -0,0 +1,265 @@
+"""
+Estadísticas de Consultas y Registro de Consultas Lentas
+
+Para saber qué consultas SQL son lentas hay que medirlas. Este módulo registra
+cada sentencia ejecutada a través de DatabaseConnection, agrupada por su forma
+"normalizada" (sin literales ni espacios redundantes), y calcula:
+
+- Número de ejecuciones y tiempo total
+- Percentiles de duración (p50, p95, p99)
+- Filas retornadas (o afectadas, en INSERT/UPDATE/DELETE)
+
+Las sentencias que superan un umbral configurable se guardan en un registro de
+consultas lentas junto con su plan de ejecución (EXPLAIN QUERY PLAN).
+"""
+
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """
+    Normaliza una sentencia: reemplaza literales por ? y compacta espacios
+
+    El resultado se guarda en caché por texto original: las sentencias
+    parametrizadas se repiten, y así las expresiones regulares no se
+    aplican en cada ejecución.
+    """
+    normalized = _STRING_LITERAL.sub("?", sql)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentil por el método del rango más cercano"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class _StatementStats:
+    """Acumulador de métricas para una sentencia normalizada"""
+
+    __slots__ = ('count', 'total', 'max', 'rows', 'samples')
+
+    def __init__(self, max_samples: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.samples = deque(maxlen=max_samples)
+
+
+class QueryStatistics:
+    """
+    Registro de tiempos por sentencia, seguro para múltiples hilos
+    """
+
+    def __init__(self, slow_query_threshold_ms: float = 100.0,
+                 slow_query_log: Optional[str] = None, max_samples: int = 1000):
+        self.slow_query_threshold_ms = slow_query_threshold_ms
+        self.slow_query_log = slow_query_log
+        self.max_samples = max_samples
+
+        self._statements: Dict[str, _StatementStats] = {}
+        self._slow_queries = deque(maxlen=100)
+        self._lock = threading.Lock()
+
+    def record(self, sql: str, duration: float, rows: int = 0,
+               connection: Optional[sqlite3.Connection] = None, params: Any = ()):
+        """Registra una ejecución; duration se expresa en segundos"""
+        normalized = normalize_sql(sql)
+
+        with self._lock:
+            stats = self._statements.get(normalized)
+            if stats is None:
+                stats = self._statements[normalized] = _StatementStats(self.max_samples)
+            stats.count += 1
+            stats.total += duration
+            stats.max = max(stats.max, duration)
+            stats.rows += max(rows, 0)
+            stats.samples.append(duration)
+
+        duration_ms = duration * 1000
+        if duration_ms >= self.slow_query_threshold_ms:
+            self._record_slow_query(sql, normalized, duration_ms, rows, connection, params)
+
+    def _record_slow_query(self, sql: str, normalized: str, duration_ms: float, rows: int,
+                           connection: Optional[sqlite3.Connection], params: Any):
+        """Guarda la consulta lenta con su plan de ejecución"""
+        entry = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'duration_ms': round(duration_ms, 3),
+            'rows': rows,
+            'statement': normalized,
+            'plan': self.explain(connection, sql, params) if connection else []
+        }
+
+        with self._lock:
+            self._slow_queries.append(entry)
+            if self.slow_query_log:
+                try:
+                    with open(self.slow_query_log, 'a', encoding='utf-8') as log_file:
+                        log_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                except OSError as e:
+                    print(f"✗ No se pudo escribir el registro de consultas lentas: {e}")
+
+    @staticmethod
+    def explain(connection: sqlite3.Connection, sql: str, params: Any = ()) -> List[str]:
+        """Retorna las líneas de EXPLAIN QUERY PLAN de una sentencia"""
+        if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+            return []
+        try:
+            rows = connection.execute(f"EXPLAIN QUERY PLAN {sql}", params or ()).fetchall()
+            return [row[3] for row in rows]
+        except sqlite3.Error:
+            return []
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retorna las métricas acumuladas, ordenadas por tiempo total"""
+        with self._lock:
+            items = [(sql, stats.count, stats.total, stats.max, stats.rows, sorted(stats.samples))
+                     for sql, stats in self._statements.items()]
+            slow_queries = list(self._slow_queries)
+
+        statements = []
+        for sql, count, total, maximum, rows, samples in sorted(items, key=lambda item: item[2], reverse=True):
+            statements.append({
+                'statement': sql,
+                'count': count,
+                'total_ms': round(total * 1000, 3),
+                'avg_ms': round(total * 1000 / count, 3),
+                'p50_ms': round(_percentile(samples, 0.50) * 1000, 3),
+                'p95_ms': round(_percentile(samples, 0.95) * 1000, 3),
+                'p99_ms': round(_percentile(samples, 0.99) * 1000, 3),
+                'max_ms': round(maximum * 1000, 3),
+                'rows': rows
+            })
+
+        return {
+            'slow_query_threshold_ms': self.slow_query_threshold_ms,
+            'total_queries': sum(item['count'] for item in statements),
+            'statements': statements,
+            'slow_queries': slow_queries
+        }
+
+    def reset(self):
+        """Elimina todas las métricas acumuladas"""
+        with self._lock:
+            self._statements.clear()
+            self._slow_queries.clear()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Cursor que mide cada sentencia ejecutada (incluyendo la lectura de filas)
+    y la registra en QueryStatistics al ejecutar la siguiente o al cerrarse.
+
+    Al iterar el cursor fila por fila no se mide cada fila: la lectura se
+    cuenta como un solo intervalo, desde la primera fila hasta agotar el
+    cursor (o hasta la siguiente sentencia), para no añadir dos llamadas al
+    reloj por fila.
+    """
+
+    stats: Optional[QueryStatistics] = None
+    _sql: Optional[str] = None
+    _params: Any = ()
+    _elapsed = 0.0
+    _rows = 0
+    _fetched = False
+    _iter_started: Optional[float] = None
+
+    def execute(self, sql: str, parameters: Any = ()):
+        self._finish()
+        self._start(sql, parameters)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._elapsed += time.perf_counter() - started
+
+    def executemany(self, sql: str, seq_of_parameters):
+        self._finish()
+        self._start(sql, ())
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._elapsed += time.perf_counter() - started
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._count(1 if row is not None else 0, started)
+        return row
+
+    def fetchmany(self, size: int = None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._count(len(rows), started)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._count(len(rows), started)
+        return rows
+
+    def __next__(self):
+        if self._iter_started is None:
+            self._iter_started = time.perf_counter()
+            self._fetched = True
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._stop_iteration()
+            raise
+        self._rows += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def _start(self, sql: str, parameters: Any):
+        self._sql = sql
+        self._params = parameters
+        self._elapsed = 0.0
+        self._rows = 0
+        self._fetched = False
+        self._iter_started = None
+
+    def _stop_iteration(self):
+        """Suma el intervalo de iteración en curso, si existe"""
+        if self._iter_started is not None:
+            self._elapsed += time.perf_counter() - self._iter_started
+            self._iter_started = None
+
+    def _count(self, rows: int, started: float):
+        self._elapsed += time.perf_counter() - started
+        self._rows += rows
+        self._fetched = True
+
+    def _finish(self):
+        """Registra la sentencia en curso, si existe"""
+        if self._sql is None or self.stats is None:
+            return
+        self._stop_iteration()
+        sql, self._sql = self._sql, None
+        rows = self._rows if self._fetched else self.rowcount
+        self.stats.record(sql, self._elapsed, rows, self.connection, self._params)
@@ -16,7 +16,7 @@ Utiliza librerías como ReportLab para PDF, pandas para Excel/CSV,
 y genera reportes estructurados con gráficos y tablas.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable
 import sqlite3
 from datetime import datetime, date
 import os
@@ -99,31 +99,40 @@ class ReportGenerator:
             filter_status: "active", "inactive", "graduated" o None para todos
         """
         try:
-            # Obtener datos de estudiantes
-            if filter_status:
-                students = self.student_dao.get_by_status(filter_status)
+            # Estudiantes con sus totales (student_aggregates, mantenida por
+            # triggers) en una sola consulta, en el orden de get_all. El filtro
+            # solo se agrega si se pide: con "? IS NULL OR s.status = ?" SQLite
+            # no puede usar idx_students_status_name y recorre todos los estudiantes
+            query = """
+            SELECT s.id, s.first_name, s.last_name, s.email, s.phone, s.status,
+                   s.enrollment_date, a.enrollment_count, a.completed_count,
+                   a.grade_sum / NULLIF(a.grade_count, 0) AS avg_grade
+            FROM students s
+            JOIN student_aggregates a ON a.student_id = s.id
+            {where}
+            ORDER BY s.last_name, s.first_name
+            """
+            params = ()
+            if filter_status is not None:
+                query = query.format(where="WHERE s.status = ?")
+                params = (filter_status,)
             else:
-                students = self.student_dao.get_all()
+                query = query.format(where="")
             
             report_data = []
-            for student in students:
-                # Obtener inscripciones del estudiante
-                enrollments = self.enrollment_dao.get_by_student(student.id)
-                total_courses = len(enrollments)
-                completed_courses = len([e for e in enrollments if e.status == 'completed'])
-                avg_grade = sum([e.grade for e in enrollments if e.grade is not None]) / len([e for e in enrollments if e.grade is not None]) if enrollments else 0
-                
+            for row in self.db.iter_query(query, params):
+                avg_grade = row['avg_grade']
                 report_data.append({
-                    'ID': student.id,
-                    'Nombre': student.first_name,
-                    'Apellido': student.last_name,
-                    'Email': student.email,
-                    'Teléfono': student.phone or '',
-                    'Estado': student.status,
-                    'Fecha Inscripción': student.enrollment_date,
-                    'Cursos Inscritos': total_courses,
-                    'Cursos Completados': completed_courses,
-                    'Promedio': round(avg_grade, 2) if avg_grade > 0 else 'N/A'
+                    'ID': row['id'],
+                    'Nombre': row['first_name'],
+                    'Apellido': row['last_name'],
+                    'Email': row['email'],
+                    'Teléfono': row['phone'] or '',
+                    'Estado': row['status'],
+                    'Fecha Inscripción': row['enrollment_date'],
+                    'Cursos Inscritos': row['enrollment_count'],
+                    'Cursos Completados': row['completed_count'],
+                    'Promedio': round(avg_grade, 2) if avg_grade else 'N/A'
                 })
             
             # Generar reporte según el formato
@@ -225,27 +234,32 @@ class ReportGenerator:
         Genera un reporte completo de cursos
         """
         try:
-            courses = self.course_dao.get_all()
+            # Cursos con sus totales (course_aggregates, mantenida por
+            # triggers) en una sola consulta, en el orden de get_all
+            query = """
+            SELECT c.id, c.code, c.name, c.credits, c.instructor, c.semester, c.capacity,
+                   a.enrollment_count, a.completed_count, a.seats_remaining,
+                   a.grade_sum / NULLIF(a.grade_count, 0) AS avg_grade
+            FROM courses c
+            JOIN course_aggregates a ON a.course_id = c.id
+            ORDER BY c.name
+            """
             
             report_data = []
-            for course in courses:
-                # Obtener estadísticas del curso
-                enrollments = self.enrollment_dao.get_by_course(course.id)
-                enrolled_count = len(enrollments)
-                completed_count = len([e for e in enrollments if e.status == 'completed'])
-                avg_grade = sum([e.grade for e in enrollments if e.grade is not None]) / len([e for e in enrollments if e.grade is not None]) if enrollments else 0
-                
+            for row in self.db.iter_query(query):
+                avg_grade = row['avg_grade']
                 report_data.append({
-                    'ID': course.id,
-                    'Código': course.code,
-                    'Nombre': course.name,
-                    'Créditos': course.credits,
-                    'Instructor': course.instructor or 'Sin asignar',
-                    'Semestre': course.semester or 'N/A',
-                    'Capacidad': course.capacity,
-                    'Inscritos': enrolled_count,
-                    'Completados': completed_count,
-                    'Promedio': round(avg_grade, 2) if avg_grade > 0 else 'N/A'
+                    'ID': row['id'],
+                    'Código': row['code'],
+                    'Nombre': row['name'],
+                    'Créditos': row['credits'],
+                    'Instructor': row['instructor'] or 'Sin asignar',
+                    'Semestre': row['semester'] or 'N/A',
+                    'Capacidad': row['capacity'],
+                    'Inscritos': row['enrollment_count'],
+                    'Completados': row['completed_count'],
+                    'Cupos Disponibles': row['seats_remaining'],
+                    'Promedio': round(avg_grade, 2) if avg_grade else 'N/A'
                 })
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -320,6 +334,23 @@ class ReportGenerator:
             print(f"✗ Error generando lista de curso: {e}")
             raise
     
+    def export_enrollments_csv(self, batch_size: int = 1000) -> str:
+        """
+        Exporta todas las inscripciones a CSV en memoria constante:
+        las filas se leen por bloques y se escriben a medida que llegan
+        """
+        try:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"inscripciones_{timestamp}"
+            rows = (enrollment.to_dict() for enrollment in self.enrollment_dao.iter_all(batch_size))
+            filepath = self._generate_csv_report(rows, filename)
+            # Evento de aplicación: los datos salieron del sistema
+            self.db.audit.log("enrollments", "EXPORT", None, None, {'format': "csv", 'file': filepath})
+            return filepath
+        except Exception as e:
+            print(f"✗ Error exportando inscripciones: {e}")
+            raise
+    
     # ========================================
     # REPORTES ESTADÍSTICOS
     # ========================================
@@ -329,52 +360,25 @@ class ReportGenerator:
         Genera un reporte con estadísticas generales del sistema
         """
         try:
-            # Obtener estadísticas generales
-            stats = {}
-            
-            # Estadísticas de estudiantes
-            stats['total_estudiantes'] = self.db.execute_scalar("SELECT COUNT(*) FROM students")
-            stats['estudiantes_activos'] = self.db.execute_scalar("SELECT COUNT(*) FROM students WHERE status = 'active'")
-            stats['estudiantes_graduados'] = self.db.execute_scalar("SELECT COUNT(*) FROM students WHERE status = 'graduated'")
-            
-            # Estadísticas de cursos
-            stats['total_cursos'] = self.db.execute_scalar("SELECT COUNT(*) FROM courses")
-            
-            # Estadísticas de inscripciones
-            stats['total_inscripciones'] = self.db.execute_scalar("SELECT COUNT(*) FROM enrollments")
-            stats['inscripciones_activas'] = self.db.execute_scalar("SELECT COUNT(*) FROM enrollments WHERE status = 'enrolled'")
-            stats['cursos_completados'] = self.db.execute_scalar("SELECT COUNT(*) FROM enrollments WHERE status = 'completed'")
-            
-            # Promedio general de calificaciones
-            avg_grade = self.db.execute_scalar("SELECT AVG(grade) FROM enrollments WHERE grade IS NOT NULL")
-            stats['promedio_general'] = round(avg_grade, 2) if avg_grade else 0
-            
-            # Top 5 cursos más populares
-            popular_courses = self.db.execute_query("""
-                SELECT c.name, c.code, COUNT(e.id) as enrollments
-                FROM courses c
-                LEFT JOIN enrollments e ON c.id = e.course_id
-                GROUP BY c.id, c.name, c.code
-                ORDER BY enrollments DESC
-                LIMIT 5
-            """)
-            
-            # Distribución de calificaciones
-            grade_distribution = self.db.execute_query("""
-                SELECT 
-                    CASE 
-                        WHEN grade >= 90 THEN 'A (90-100)'
-                        WHEN grade >= 80 THEN 'B (80-89)'
-                        WHEN grade >= 70 THEN 'C (70-79)'
-                        WHEN grade >= 60 THEN 'D (60-69)'
-                        WHEN grade < 60 THEN 'F (0-59)'
-                    END as grade_range,
-                    COUNT(*) as count
-                FROM enrollments 
-                WHERE grade IS NOT NULL
-                GROUP BY grade_range
-                ORDER BY grade_range
-            """)
+            # Estadísticas generales del servicio compartido (statistics.py):
+            # una pasada agregada por tabla, en caché hasta la siguiente escritura
+            counters = self.db.statistics.get()
+            students = counters['students']
+            enrollments = counters['enrollments']
+            stats = {
+                'total_estudiantes': students['total'],
+                'estudiantes_activos': students['active'],
+                'estudiantes_graduados': students['graduated'],
+                'total_cursos': counters['courses']['total'],
+                'total_inscripciones': enrollments['total'],
+                'inscripciones_activas': enrollments['enrolled'],
+                'cursos_completados': enrollments['completed'],
+                'promedio_general': enrollments['average_grade']
+            }
+            
+            # Top 5 cursos más populares y distribución de calificaciones
+            popular_courses = counters['popular_courses']
+            grade_distribution = enrollments['grade_distribution']
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"estadisticas_{timestamp}"
@@ -465,18 +469,24 @@ class ReportGenerator:
         print(f"✓ Reporte Excel generado: {filepath}")
         return str(filepath)
     
-    def _generate_csv_report(self, data: List[Dict[str, Any]], filename: str) -> str:
-        """Genera un reporte en formato CSV"""
+    def _generate_csv_report(self, data: Iterable[Dict[str, Any]], filename: str) -> str:
+        """
+        Genera un reporte en formato CSV
+        Acepta cualquier iterable, por lo que las filas pueden generarse bajo demanda
+        """
         filepath = self.output_dir / f"{filename}.csv"
         
-        if data:
+        rows = iter(data)
+        first_row = next(rows, None)
+        if first_row is not None:
             import csv
             with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = data[0].keys()
+                fieldnames = first_row.keys()
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
                 
                 writer.writeheader()
-                for row in data:
+                writer.writerow(first_row)
+                for row in rows:
                     writer.writerow(row)
         
         print(f"✓ Reporte CSV generado: {filepath}")
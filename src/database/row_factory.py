@@ -0,0 +1,94 @@
+"""
+Fábricas de Filas Compiladas
+
+Convertir una fila en objeto con obj_class(**dict(row)) crea un sqlite3.Row,
+luego un diccionario y luego una llamada con argumentos por nombre que llena
+el __dict__ del objeto. En listados grandes ese trabajo domina el tiempo total.
+
+Este módulo genera, para cada combinación (modelo, columnas de la consulta),
+una función que construye el objeto directamente desde la tupla que entrega
+SQLite, asignando cada atributo por posición:
+
+    def build(cursor, row):
+        obj = new(Student)
+        obj.id = row[0]
+        obj.first_name = row[1]
+        ...
+        return obj
+
+Las funciones se generan una sola vez y se reutilizan. Se usan como
+row_factory del cursor, de modo que sqlite3 las invoca por cada fila.
+
+Si el modelo rastrea cambios (TrackedModel), la función también guarda la
+tupla original y la posición de cada atributo en ella, para que el DAO sepa
+después qué columnas se modificaron.
+"""
+
+import inspect
+import threading
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+RowFactory = Callable[[Any, tuple], Any]
+
+_compiled: Dict[Tuple[type, Tuple[str, ...]], RowFactory] = {}
+_lock = threading.Lock()
+
+
+def _model_defaults(model: type) -> Dict[str, Any]:
+    """Valores por defecto de los parámetros de __init__ del modelo"""
+    return {
+        name: parameter.default
+        for name, parameter in inspect.signature(model.__init__).parameters.items()
+        if parameter.default is not inspect.Parameter.empty
+    }
+
+
+def compile_row_factory(model: type, columns: Sequence[str]) -> RowFactory:
+    """
+    Retorna la función que construye un modelo a partir de una fila con las
+    columnas indicadas. Las columnas que el modelo no declara en __slots__ se
+    ignoran; los atributos sin columna toman el valor por defecto de __init__.
+    """
+    key = (model, tuple(columns))
+    factory = _compiled.get(key)
+    if factory is not None:
+        return factory
+
+    fields = model.__slots__
+    defaults = _model_defaults(model)
+    positions = {}
+    for index, column in enumerate(columns):
+        if column in fields and column not in positions:
+            positions[column] = index
+
+    namespace = {'new': object.__new__, 'model': model}
+    lines = ["def build(cursor, row):", "    obj = new(model)"]
+    for field in fields:
+        if field in positions:
+            lines.append(f"    obj.{field} = row[{positions[field]}]")
+        else:
+            namespace[f"default_{field}"] = defaults.get(field)
+            lines.append(f"    obj.{field} = default_{field}")
+    if hasattr(model, '_loaded_row'):
+        namespace['layout'] = tuple(positions.items())
+        lines.append("    obj._loaded_row = row")
+        lines.append("    obj._loaded_layout = layout")
+    lines.append("    return obj")
+
+    exec("\n".join(lines), namespace)
+    factory = namespace['build']
+    with _lock:
+        return _compiled.setdefault(key, factory)
+
+
+def model_row_factory(model: type) -> RowFactory:
+    """
+    row_factory para un cursor que todavía no se ejecutó: en la primera fila
+    lee cursor.description, obtiene la función compilada y la instala en el
+    cursor para el resto de las filas.
+    """
+    def first_row(cursor, row):
+        factory = compile_row_factory(model, [column[0] for column in cursor.description])
+        cursor.row_factory = factory
+        return factory(cursor, row)
+    return first_row
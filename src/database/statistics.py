@@ -0,0 +1,171 @@
+"""
+Servicio de Estadísticas con Caché
+
+CRUDOperations.get_statistics() y ReportGenerator.generate_statistics_report()
+necesitan los mismos contadores. Antes cada uno los pedía con su propia serie
+de consultas (un COUNT por contador, cada uno recorriendo la tabla). Este
+servicio los calcula con una sola pasada agregada por tabla:
+
+    SELECT COUNT(*),
+           COUNT(CASE WHEN status = 'active' THEN 1 END), ...
+    FROM students
+
+El "top N" de cursos sale del índice de popularidad de course_aggregates
+(migración 7). El resultado queda en caché hasta que cambian los datos, lo
+que se detecta con PRAGMA data_version sobre una conexión de sondeo (ver
+change_feed.py): el valor cambia con cualquier COMMIT de otra conexión, del
+pool o de otro proceso. Mientras los datos no cambian, repetir la consulta
+cuesta un PRAGMA.
+
+Dentro de una transacción abierta no se usa la caché: el hilo puede estar
+viendo escrituras que todavía no se confirmaron.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .change_feed import ChangeFeed
+
+# Rangos de la distribución de calificaciones, en el orden del reporte
+GRADE_RANGES = [
+    ('A (90-100)', "grade >= 90"),
+    ('B (80-89)', "grade >= 80 AND grade < 90"),
+    ('C (70-79)', "grade >= 70 AND grade < 80"),
+    ('D (60-69)', "grade >= 60 AND grade < 70"),
+    ('F (0-59)', "grade < 60"),
+]
+
+_STUDENT_COUNTERS = """
+SELECT COUNT(*) AS total,
+       COUNT(CASE WHEN status = 'active' THEN 1 END) AS active,
+       COUNT(CASE WHEN status = 'inactive' THEN 1 END) AS inactive,
+       COUNT(CASE WHEN status = 'graduated' THEN 1 END) AS graduated
+FROM students
+"""
+
+_ENROLLMENT_COUNTERS = f"""
+SELECT COUNT(*) AS total,
+       COUNT(CASE WHEN status = 'enrolled' THEN 1 END) AS enrolled,
+       COUNT(CASE WHEN status = 'completed' THEN 1 END) AS completed,
+       COUNT(CASE WHEN status = 'dropped' THEN 1 END) AS dropped,
+       AVG(grade) AS average_grade,
+       {", ".join(f"COUNT(CASE WHEN {condition} THEN 1 END) AS range_{i}"
+                  for i, (_label, condition) in enumerate(GRADE_RANGES))}
+FROM enrollments
+"""
+
+_POPULAR_COURSES = """
+SELECT c.name, c.code, a.enrollment_count AS enrollments
+FROM course_aggregates a
+JOIN courses c ON c.id = a.course_id
+ORDER BY a.enrollment_count DESC, a.course_id
+LIMIT ?
+"""
+
+
+class StatisticsService:
+    """
+    Contadores generales del sistema, calculados en una pasada por tabla y
+    guardados en caché hasta la siguiente escritura confirmada
+    """
+
+    def __init__(self, db, top_courses: int = 5):
+        self.db = db
+        self.top_courses = top_courses
+        self._feed: Optional[ChangeFeed] = None
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._version: Optional[int] = None
+        self.reset_stats()
+
+    def get(self) -> Dict[str, Any]:
+        """
+        Retorna los contadores:
+
+            {'students': {'total', 'active', 'inactive', 'graduated'},
+             'courses': {'total'},
+             'enrollments': {'total', 'enrolled', 'completed', 'dropped',
+                             'average_grade', 'grade_distribution'},
+             'popular_courses': [{'name', 'code', 'enrollments'}, ...]}
+
+        El resultado se comparte entre llamadas: no debe modificarse.
+        """
+        if self.db.in_transaction:
+            return self._compute()
+
+        # La versión se lee antes de calcular: si una escritura se confirma
+        # en medio, la próxima llamada verá otra versión y recalculará
+        version = self._data_version()
+        with self._lock:
+            if self._snapshot is not None and version == self._version:
+                self._hits += 1
+                return self._snapshot
+
+        snapshot = self._compute()
+        with self._lock:
+            self._snapshot, self._version = snapshot, version
+        return snapshot
+
+    def invalidate(self):
+        """Descarta el resultado en caché"""
+        with self._lock:
+            self._snapshot = self._version = None
+
+    def close(self):
+        """Cierra la conexión de sondeo"""
+        if self._feed is not None:
+            self._feed.close()
+            self._feed = None
+
+    def _data_version(self) -> int:
+        if self._feed is None:
+            self._feed = ChangeFeed(self.db)
+        return self._feed.data_version()
+
+    def _compute(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        students = dict(self.db.execute_query(_STUDENT_COUNTERS)[0])
+        enrollments = dict(self.db.execute_query(_ENROLLMENT_COUNTERS)[0])
+        total_courses = self.db.execute_scalar("SELECT COUNT(*) FROM course_aggregates")
+        popular = [dict(row) for row in self.db.execute_query(_POPULAR_COURSES, (self.top_courses,))]
+
+        distribution: List[Dict[str, Any]] = []
+        for i, (label, _condition) in enumerate(GRADE_RANGES):
+            count = enrollments.pop(f"range_{i}")
+            if count:
+                distribution.append({'grade_range': label, 'count': count})
+        average = enrollments['average_grade']
+        enrollments['average_grade'] = round(average, 2) if average else 0
+        enrollments['grade_distribution'] = distribution
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._computations += 1
+            self._last_compute_ms = elapsed_ms
+        return {
+            'students': students,
+            'courses': {'total': total_courses},
+            'enrollments': enrollments,
+            'popular_courses': popular
+        }
+
+    # ========================================
+    # MÉTRICAS
+    # ========================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Aciertos de la caché, cálculos completos y duración del último"""
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'computations': self._computations,
+                'last_compute_ms': round(self._last_compute_ms, 3),
+                'cached': self._snapshot is not None
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._hits = 0
+            self._computations = 0
+            self._last_compute_ms = 0.0
@@ -51,6 +51,7 @@ def test_database_module():
         navigator = DataNavigator()
         recordset = navigator.load_students()
         print(f"✅ Navegación cargada con {recordset.record_count} registros")
+        navigator.close()
         
         # Probar generación de reportes
         report_gen = ReportGenerator()
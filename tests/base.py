@@ -0,0 +1,48 @@
+"""
+Base común para las pruebas que usan DatabaseConnection
+
+Cada prueba trabaja sobre una base de datos en un directorio temporal con una
+instancia nueva del singleton; al terminar se cierran sus conexiones y se
+restaura la instancia anterior.
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.connection import DatabaseConnection
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Base para las pruebas: crea una base de datos temporal por prueba
+
+    database_options son los argumentos de DatabaseConnection para la base
+    abierta en setUp (por ejemplo, {'sample_data': True}); con None, la
+    prueba la abre cuando la necesite con open_database().
+    """
+
+    database_options = {}
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "school.db")
+        self._previous_instance = DatabaseConnection._instance
+        self.db = None
+        if self.database_options is not None:
+            self.open_database(**self.database_options)
+
+    def tearDown(self):
+        if self.db is not None:
+            self.db.disconnect()
+        DatabaseConnection._instance = self._previous_instance
+        self.temp_dir.cleanup()
+
+    def open_database(self, **kwargs) -> DatabaseConnection:
+        """Abre una instancia nueva de DatabaseConnection (ignorando el singleton)"""
+        DatabaseConnection._instance = None
+        self.db = DatabaseConnection(self.db_path, **kwargs)
+        return self.db
@@ -0,0 +1,237 @@
+"""
+Pruebas unitarias para las tablas de agregados mantenidas con triggers
+"""
+
+import csv
+import unittest
+import sys
+import os
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base import DatabaseTestCase
+from src.database.crud_operations import CRUDOperations
+from src.database.dao import Student, Course, Enrollment, StudentDAO, CourseDAO, EnrollmentDAO
+from src.database.data_navigator import DataNavigator
+from src.database.report_generator import ReportGenerator
+
+# Los mismos totales calculados desde cero con JOIN + GROUP BY
+STUDENT_TOTALS = """
+SELECT s.id AS student_id,
+       COUNT(e.id) AS enrollment_count,
+       COUNT(CASE WHEN e.status = 'completed' THEN 1 END) AS completed_count,
+       COALESCE(SUM(e.grade), 0) AS grade_sum,
+       COUNT(e.grade) AS grade_count,
+       COALESCE(SUM(CASE WHEN e.status = 'completed' THEN c.credits ELSE 0 END), 0) AS completed_credits
+FROM students s
+LEFT JOIN enrollments e ON e.student_id = s.id
+LEFT JOIN courses c ON c.id = e.course_id
+GROUP BY s.id
+ORDER BY s.id
+"""
+
+COURSE_TOTALS = """
+SELECT c.id AS course_id, c.capacity,
+       COUNT(e.id) AS enrollment_count,
+       COUNT(CASE WHEN e.status = 'enrolled' THEN 1 END) AS enrolled_count,
+       COUNT(CASE WHEN e.status = 'completed' THEN 1 END) AS completed_count,
+       COUNT(CASE WHEN e.status = 'dropped' THEN 1 END) AS dropped_count,
+       COALESCE(SUM(e.grade), 0) AS grade_sum,
+       COUNT(e.grade) AS grade_count,
+       MIN(e.grade) AS grade_min,
+       MAX(e.grade) AS grade_max,
+       c.capacity - COUNT(CASE WHEN e.status <> 'dropped' THEN 1 END) AS seats_remaining
+FROM courses c
+LEFT JOIN enrollments e ON e.course_id = c.id
+GROUP BY c.id
+ORDER BY c.id
+"""
+
+class AggregatesTestCase(DatabaseTestCase):
+    """
+    Base para las pruebas: base de datos temporal con datos de ejemplo
+    """
+
+    database_options = {'sample_data': True}
+
+    def setUp(self):
+        super().setUp()
+        self.student_dao = StudentDAO()
+        self.course_dao = CourseDAO()
+        self.enrollment_dao = EnrollmentDAO()
+
+    def rows(self, query: str):
+        return [tuple(round(value, 6) if isinstance(value, float) else value for value in row)
+                for row in self.db.execute_query(query)]
+
+class TestStudentAggregates(AggregatesTestCase):
+    """
+    Clase para probar student_aggregates
+    """
+
+    def assertStudentAggregatesExact(self):
+        self.assertEqual(
+            self.rows("SELECT student_id, enrollment_count, completed_count, grade_sum, grade_count, "
+                      "completed_credits FROM student_aggregates ORDER BY student_id"),
+            self.rows(STUDENT_TOTALS)
+        )
+
+    def test_triggers_keep_totals_exact(self):
+        """
+        Prueba que cada tipo de escritura deje los agregados iguales a recalcularlos
+        """
+        self.assertStudentAggregatesExact()
+
+        student_id = self.student_dao.create(Student(first_name="Ada", last_name="Agg", email="ada@test.com"))
+        self.assertStudentAggregatesExact()
+
+        enrollment_id = self.enrollment_dao.create(Enrollment(student_id=student_id, course_id=1))
+        self.enrollment_dao.create(Enrollment(student_id=student_id, course_id=2, grade=70.5,
+                                              status="completed"))
+        self.assertStudentAggregatesExact()
+
+        enrollment = self.enrollment_dao.get_by_id(enrollment_id)
+        enrollment.grade = 91.25
+        enrollment.status = "completed"
+        self.enrollment_dao.update(enrollment)
+        self.assertStudentAggregatesExact()
+
+        enrollment.course_id = 3
+        enrollment.student_id = 1
+        self.enrollment_dao.update(enrollment)
+        self.assertStudentAggregatesExact()
+
+        CRUDOperations().batch_update_grades([(1, 10.0), (2, None), (enrollment_id, 55.5)])
+        self.assertStudentAggregatesExact()
+
+        course = self.course_dao.get_by_id(2)
+        course.credits = 6
+        self.course_dao.update(course)
+        self.assertStudentAggregatesExact()
+
+        self.course_dao.delete(3)
+        self.assertStudentAggregatesExact()
+
+        self.enrollment_dao.delete(self.enrollment_dao.get_by_student(student_id)[0].id)
+        self.student_dao.delete(1)
+        self.assertStudentAggregatesExact()
+        self.assertIsNone(self.db.execute_scalar("SELECT 1 FROM student_aggregates WHERE student_id = 1"))
+
+    def test_student_statistics_read_aggregates(self):
+        """
+        Prueba que get_student_statistics lea los agregados con una búsqueda por clave
+        """
+        stats = DataNavigator().get_student_statistics(1)
+        expected = dict(self.db.execute_query(STUDENT_TOTALS)[0])
+        self.assertEqual(stats['total_enrollments'], expected['enrollment_count'])
+        self.assertEqual(stats['completed_courses'], expected['completed_count'])
+        self.assertEqual(stats['total_credits'], expected['completed_credits'])
+        if expected['grade_count']:
+            self.assertEqual(stats['avg_grade'], round(expected['grade_sum'] / expected['grade_count'], 2))
+
+        plan = " ".join(row['detail'] for row in self.db.execute_query(
+            "EXPLAIN QUERY PLAN SELECT * FROM student_aggregates WHERE student_id = ?", (1,)))
+        self.assertIn("INTEGER PRIMARY KEY", plan)
+        self.assertEqual(DataNavigator().get_student_statistics(999), {})
+
+    def test_student_report_uses_aggregates(self):
+        """
+        Prueba el reporte de estudiantes (también con inscripciones sin calificar)
+        """
+        student_id = self.student_dao.create(Student(first_name="Sin", last_name="Notas", email="sin@test.com"))
+        self.enrollment_dao.create(Enrollment(student_id=student_id, course_id=1))
+
+        path = ReportGenerator(self.temp_dir.name).generate_student_report("csv", "active")
+        with open(path, newline='', encoding='utf-8') as report:
+            rows = {int(row['ID']): row for row in csv.DictReader(report)}
+
+        self.assertEqual(set(rows), {s.id for s in self.student_dao.get_by_status("active")})
+        self.assertEqual((rows[student_id]['Cursos Inscritos'], rows[student_id]['Promedio']), ("1", "N/A"))
+        totals = {row['student_id']: row for row in self.db.execute_query(STUDENT_TOTALS)}
+        for record_id, row in rows.items():
+            self.assertEqual(int(row['Cursos Completados']), totals[record_id]['completed_count'])
+
+class TestCourseAggregates(AggregatesTestCase):
+    """
+    Clase para probar course_aggregates y el "top N" de cursos
+    """
+
+    def assertCourseAggregatesExact(self):
+        self.assertEqual(
+            self.rows("SELECT course_id, capacity, enrollment_count, enrolled_count, completed_count, "
+                      "dropped_count, grade_sum, grade_count, grade_min, grade_max, seats_remaining "
+                      "FROM course_aggregates ORDER BY course_id"),
+            self.rows(COURSE_TOTALS)
+        )
+
+    def test_triggers_keep_totals_exact(self):
+        """
+        Prueba altas, bajas, cambios de estado y de curso, y el retiro del mínimo o el máximo
+        """
+        self.assertCourseAggregatesExact()
+
+        course_id = self.course_dao.create(Course(name="Agregados", code="AGG101", capacity=2))
+        low = self.enrollment_dao.create(Enrollment(student_id=1, course_id=course_id, grade=40.0))
+        high = self.enrollment_dao.create(Enrollment(student_id=2, course_id=course_id, grade=99.5,
+                                                     status="completed"))
+        self.enrollment_dao.create(Enrollment(student_id=3, course_id=course_id, status="dropped"))
+        self.assertCourseAggregatesExact()
+        self.assertEqual(self.db.execute_scalar(
+            "SELECT seats_remaining FROM course_aggregates WHERE course_id = ?", (course_id,)), 0)
+
+        self.enrollment_dao.delete(low)
+        self.assertCourseAggregatesExact()
+
+        enrollment = self.enrollment_dao.get_by_id(high)
+        enrollment.grade = 12.0
+        enrollment.status = "dropped"
+        self.enrollment_dao.update(enrollment)
+        self.assertCourseAggregatesExact()
+
+        enrollment.course_id = 4
+        self.enrollment_dao.update(enrollment)
+        CRUDOperations().batch_update_grades([(1, 100.0), (2, None)])
+        self.assertCourseAggregatesExact()
+
+        course = self.course_dao.get_by_id(course_id)
+        course.capacity = 10
+        self.course_dao.update(course)
+        self.student_dao.delete(3)
+        self.assertCourseAggregatesExact()
+
+        self.course_dao.delete(course_id)
+        self.assertCourseAggregatesExact()
+
+    def test_top_courses_read_popularity_index(self):
+        """
+        Prueba el curso más popular y que el "top N" no agrupe ni ordene en memoria
+        """
+        for student_id in (1, 2, 3, 4):
+            self.enrollment_dao.create(Enrollment(student_id=student_id, course_id=5))
+        popular = CRUDOperations().get_statistics()['most_popular_course']
+        self.assertEqual((popular['code'], popular['enrollments']),
+                         (self.course_dao.get_by_id(5).code, 4))
+
+        plan = " ".join(row['detail'] for row in self.db.execute_query(
+            "EXPLAIN QUERY PLAN SELECT course_id FROM course_aggregates "
+            "ORDER BY enrollment_count DESC, course_id LIMIT 5"))
+        self.assertIn("idx_course_aggregates_popularity", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_course_report_uses_aggregates(self):
+        """
+        Prueba el reporte de cursos con los cupos disponibles
+        """
+        path = ReportGenerator(self.temp_dir.name).generate_course_report("csv")
+        with open(path, newline='', encoding='utf-8') as report:
+            rows = {int(row['ID']): row for row in csv.DictReader(report)}
+
+        totals = {row['course_id']: row for row in self.db.execute_query(COURSE_TOTALS)}
+        self.assertEqual(set(rows), set(totals))
+        for course_id, row in rows.items():
+            self.assertEqual(int(row['Inscritos']), totals[course_id]['enrollment_count'])
+            self.assertEqual(int(row['Cupos Disponibles']), totals[course_id]['seats_remaining'])
+
+if __name__ == '__main__':
+    unittest.main()
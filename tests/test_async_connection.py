@@ -0,0 +1,107 @@
+"""
+Pruebas unitarias para la fachada asíncrona de la base de datos
+"""
+
+import unittest
+import asyncio
+import time
+import sys
+import os
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base import DatabaseTestCase
+from src.database.dao import Student, StudentDAO
+from src.database.async_connection import AsyncDatabaseConnection, AsyncDAO, TkAsyncBridge
+
+class FakeRoot:
+    """
+    Sustituto mínimo de tk.Tk: guarda los callbacks programados con after()
+    """
+
+    def __init__(self):
+        self.scheduled = {}
+        self._next_id = 0
+
+    def after(self, delay, callback):
+        self._next_id += 1
+        self.scheduled[self._next_id] = callback
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        self.scheduled.pop(after_id, None)
+
+    def run_pending(self):
+        pending, self.scheduled = self.scheduled, {}
+        for callback in pending.values():
+            callback()
+
+class TestAsyncDatabase(DatabaseTestCase):
+    """
+    Clase para probar AsyncDatabaseConnection, AsyncDAO y TkAsyncBridge
+    """
+
+    def setUp(self):
+        """
+        Configuración inicial para cada prueba
+        """
+        super().setUp()
+        self.async_db = AsyncDatabaseConnection(self.db)
+
+    def tearDown(self):
+        self.async_db.shutdown()
+        super().tearDown()
+
+    def test_awaitable_queries_and_dao(self):
+        """
+        Prueba consultas y operaciones del DAO como corutinas
+        """
+        students = AsyncDAO(StudentDAO(), self.async_db)
+
+        async def scenario():
+            student_id = await students.create(
+                Student(first_name="Async", last_name="Test", email="async@test.com")
+            )
+            count, rows = await asyncio.gather(
+                self.async_db.execute_scalar("SELECT COUNT(*) FROM students WHERE email = ?", ("async@test.com",)),
+                self.async_db.execute_query("SELECT * FROM students WHERE id = ?", (student_id,))
+            )
+            return student_id, count, rows
+
+        student_id, count, rows = asyncio.run(scenario())
+        self.assertEqual(count, 1)
+        self.assertEqual(rows[0]['id'], student_id)
+
+    def test_bridge_delivers_results_on_tk_thread(self):
+        """
+        Prueba que el puente entregue los resultados mediante root.after
+        """
+        root = FakeRoot()
+        bridge = TkAsyncBridge(root, self.async_db)
+        results = []
+        errors = []
+
+        try:
+            future = bridge.submit(
+                self.async_db.execute_scalar("SELECT 41 + 1"),
+                on_success=results.append
+            )
+            bridge.run_in_background(
+                self.db.execute_query, "SELECT * FROM tabla_inexistente",
+                on_error=errors.append
+            )
+            future.result(timeout=5)
+
+            deadline = time.time() + 5
+            while (not results or not errors) and time.time() < deadline:
+                root.run_pending()
+                time.sleep(0.01)
+        finally:
+            bridge.close()
+
+        self.assertEqual(results, [42])
+        self.assertEqual(len(errors), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,322 @@
+"""
+Pruebas unitarias para el registro de auditoría con buffer (AuditWriter)
+"""
+
+import json
+import sqlite3
+import unittest
+import sys
+import os
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base import DatabaseTestCase
+from src.database.audit import AuditSink
+from src.database.audit_archive import AuditArchive
+from src.database.connection import DatabaseConnection
+from src.database.crud_operations import CRUDOperations
+from src.database.dao import Student, StudentDAO
+from src.database.report_generator import ReportGenerator
+
+class MemoryAuditSink(AuditSink):
+    """Destino de prueba: guarda los lotes recibidos"""
+
+    def __init__(self):
+        self.batches = []
+
+    def write(self, cursor, entries):
+        self.batches.append(list(entries))
+
+class TestAuditWriter(DatabaseTestCase):
+    """
+    Clase para probar los niveles de durabilidad y las métricas de la auditoría
+    """
+
+    database_options = None
+
+    def open(self, **kwargs) -> DatabaseConnection:
+        self.open_database(**kwargs)
+        self.dao = StudentDAO()
+        return self.db
+
+    def audit_rows(self, operation: str = "EXPORT"):
+        return self.db.execute_query(
+            "SELECT operation, record_id, old_values, new_values FROM audit_log WHERE operation = ?",
+            (operation,)
+        )
+
+    def create(self, name: str):
+        # Evento de aplicación: los cambios de filas los registran los triggers
+        self.db.audit.log("students", "EXPORT", None, None, {'first_name': name})
+
+    def test_payloads_are_json(self):
+        """
+        Prueba que las imágenes se guarden como JSON
+        """
+        self.open()
+        student_id = self.dao.create(Student(first_name="json", last_name="Audit", email="json@test.com"))
+        student = self.dao.get_by_id(student_id)
+        student.phone = "555-0001"
+        self.dao.update(student)
+        self.create("json")
+
+        create = self.audit_rows("CREATE")[-1]
+        update, = self.audit_rows("UPDATE")
+        self.assertEqual(json.loads(self.audit_rows()[0]['new_values']), {'first_name': "json"})
+        self.assertIsNone(create['old_values'])
+        self.assertEqual(json.loads(create['new_values'])['email'], "json@test.com")
+        self.assertEqual(json.loads(update['old_values'])['phone'], "")
+        self.assertEqual(json.loads(update['new_values'])['phone'], "555-0001")
+
+    def test_on_commit_batches_and_discards_rollbacks(self):
+        """
+        Prueba que on-commit escriba un solo lote por transacción y descarte lo revertido
+        """
+        sink = MemoryAuditSink()
+        self.open(audit_sink=sink)
+        with self.db.transaction():
+            self.create("uno")
+            self.create("dos")
+            with self.assertRaises(RuntimeError):
+                with self.db.transaction():
+                    self.create("tres")
+                    raise RuntimeError("revertir")
+            self.assertEqual(self.db.get_audit_stats()['pending_in_transaction'], 2)
+            self.assertEqual(sink.batches, [])
+
+        self.assertEqual(len(sink.batches), 1)
+        self.assertEqual([json.loads(entry[4])['first_name'] for entry in sink.batches[0]], ["uno", "dos"])
+
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.create("cuatro")
+                raise RuntimeError("revertir")
+        self.assertEqual(len(sink.batches), 1)
+
+        stats = self.db.get_audit_stats()
+        self.assertEqual((stats['durability'], stats['flushes'], stats['entries_written']), ("on-commit", 1, 2))
+        self.assertEqual(stats['pending_in_transaction'], 0)
+
+    def test_transaction_inside_cursor(self):
+        """
+        Prueba que la auditoría de un transaction() anidado en get_cursor()
+        (SAVEPOINT) se escriba con el COMMIT del cursor o se descarte con él
+        """
+        self.open()
+        with self.db.get_cursor() as cursor:
+            cursor.execute("UPDATE students SET phone = '1' WHERE id = 0")
+            with self.db.transaction():
+                self.create("anidado")
+        self.assertEqual(len(self.audit_rows()), 1)
+
+        with self.assertRaises(sqlite3.OperationalError):
+            with self.db.get_cursor() as cursor:
+                cursor.execute("UPDATE students SET phone = '1' WHERE id = 0")
+                with self.db.transaction():
+                    self.create("revertido")
+                cursor.execute("SELECT * FROM tabla_inexistente")
+        self.assertEqual(len(self.audit_rows()), 1)
+        self.assertEqual(self.db.audit.mark(), 0)
+
+    def test_sync_writes_each_entry(self):
+        """
+        Prueba que sync entregue cada entrada por separado
+        """
+        sink = MemoryAuditSink()
+        self.open(audit_durability="sync", audit_sink=sink)
+        with self.db.transaction():
+            self.create("uno")
+            self.create("dos")
+            self.assertEqual(len(sink.batches), 2)
+
+    def test_best_effort_buffers_until_flush(self):
+        """
+        Prueba que best-effort acumule en el buffer y escriba al vaciarlo
+        """
+        self.open(audit_durability="best-effort")
+        self.db.audit.flush_interval = 60
+        for name in ("uno", "dos", "tres"):
+            self.create(name)
+
+        stats = self.db.get_audit_stats()
+        self.assertEqual(stats['buffer_depth'], 3)
+        self.assertEqual(self.audit_rows(), [])
+
+        self.assertEqual(self.db.flush_audit(), 3)
+        self.assertEqual(len(self.audit_rows()), 3)
+        stats = self.db.get_audit_stats()
+        self.assertEqual((stats['buffer_depth'], stats['max_buffer_depth'], stats['flushes']), (0, 3, 1))
+        self.assertGreater(stats['flush_ms']['max'], 0)
+
+    def test_best_effort_full_buffer_flushes(self):
+        """
+        Prueba que el buffer acotado se vacíe al llenarse y al cerrar la conexión
+        """
+        self.open(audit_durability="best-effort")
+        self.db.audit.flush_interval = 60
+        self.db.audit.max_buffer = 2
+        self.db.audit.batch_size = 100
+        for name in ("uno", "dos", "tres"):
+            self.create(name)
+
+        stats = self.db.get_audit_stats()
+        self.assertEqual(stats['forced_flushes'], 1)
+        self.assertEqual(stats['buffer_depth'], 1)
+
+        self.db.disconnect()
+        self.open(audit_durability="best-effort")
+        self.assertEqual(len(self.audit_rows()), 3)
+
+    def test_unknown_durability(self):
+        DatabaseConnection._instance = None
+        with self.assertRaises(ValueError):
+            DatabaseConnection(self.db_path, audit_durability="nunca")
+
+class TestTriggerCapture(DatabaseTestCase):
+    """
+    Clase para probar la captura de cambios con triggers (migración 5)
+    """
+
+    database_options = {'sample_data': True}
+
+    def setUp(self):
+        super().setUp()
+        self.db.execute_non_query("DELETE FROM audit_log")
+        self.dao = StudentDAO()
+
+    def audit_rows(self, table_name: str):
+        return self.db.execute_query(
+            "SELECT operation, record_id, old_values, new_values FROM audit_log WHERE table_name = ? ORDER BY id",
+            (table_name,)
+        )
+
+    def test_dao_write_is_single_statement(self):
+        """
+        Prueba que el DAO emita una sola sentencia y el trigger agregue la auditoría
+        """
+        statements = []
+        connection = self.db.pool.acquire()
+        connection.set_trace_callback(
+            lambda sql: statements.append(sql) if sql.lstrip().startswith(("INSERT", "UPDATE", "DELETE")) else None
+        )
+        self.db.pool.release(connection)
+
+        student_id = self.dao.create(Student(first_name="Uno", last_name="Trigger", email="uno@test.com"))
+        # Los pasos de los triggers se reportan con el texto de la sentencia que los dispara
+        self.assertEqual(len(set(statements)), 1)
+
+        (operation, record_id, old_values, new_values), = self.audit_rows("students")
+        self.assertEqual((operation, record_id, old_values), ("CREATE", student_id, None))
+        self.assertEqual(json.loads(new_values)['email'], "uno@test.com")
+
+    def test_set_based_writes_are_audited(self):
+        """
+        Prueba que las operaciones fuera de los DAO y los borrados en cascada queden auditados
+        """
+        CRUDOperations().batch_update_grades([(1, 42.0), (2, 43.0)])
+        updates = self.audit_rows("enrollments")
+        self.assertEqual([(row['operation'], row['record_id']) for row in updates], [("UPDATE", 1), ("UPDATE", 2)])
+        self.assertEqual(json.loads(updates[0]['new_values'])['grade'], 42.0)
+
+        enrolled = self.db.execute_scalar("SELECT COUNT(*) FROM enrollments WHERE student_id = 1")
+        self.assertTrue(self.dao.delete(1))
+        deletes = [row for row in self.audit_rows("enrollments") if row['operation'] == "DELETE"]
+        self.assertEqual(len(deletes), enrolled)
+        (operation, _, old_values, new_values), = self.audit_rows("students")
+        self.assertEqual((operation, json.loads(old_values)['email'], new_values),
+                         ("DELETE", "juan.perez@email.com", None))
+
+    def test_noop_update_is_not_audited(self):
+        """
+        Prueba que un UPDATE que deja los mismos valores no genere entrada
+        """
+        self.db.execute_non_query("UPDATE students SET status = status")
+        self.assertEqual(self.audit_rows("students"), [])
+
+    def test_export_is_application_event(self):
+        """
+        Prueba que la exportación de inscripciones quede registrada como evento de aplicación
+        """
+        path = ReportGenerator(self.temp_dir.name).export_enrollments_csv()
+        (operation, record_id, old_values, new_values), = self.audit_rows("enrollments")
+        self.assertEqual((operation, record_id, old_values), ("EXPORT", None, None))
+        self.assertEqual(json.loads(new_values), {'format': "csv", 'file': path})
+
+class TestAuditArchive(DatabaseTestCase):
+    """
+    Clase para probar la rotación, la compactación y el historial de la auditoría
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.archive = AuditArchive(self.db)
+        # Historial del estudiante 1 repartido en tres años, más ruido de otros registros
+        rows = [("students", "UPDATE", 1, None, json.dumps({'n': year}), "system", f"{year}-06-01 10:00:00")
+                for year in (2022, 2023)]
+        rows += [("students", "UPDATE", record_id, None, None, "system", "2023-01-01 00:00:00")
+                 for record_id in range(2, 50)]
+        with self.db.transaction() as cursor:
+            cursor.executemany(
+                """INSERT INTO audit_log (table_name, operation, record_id, old_values, new_values,
+                                          user_id, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)""", rows
+            )
+        StudentDAO().create(Student(first_name="Vivo", last_name="Actual", email="vivo@test.com"))
+
+    def live_count(self) -> int:
+        return self.db.execute_scalar("SELECT COUNT(*) FROM audit_log")
+
+    def test_rollover_by_age_and_history(self):
+        """
+        Prueba que las filas antiguas pasen a un archivo por año y el historial las una
+        """
+        moved = self.archive.rollover(max_age_days=365)
+        self.assertEqual(sorted(os.path.basename(path) for path in moved),
+                         ["school_audit_2022.db", "school_audit_2023.db"])
+        self.assertEqual(sum(moved.values()), 50)
+        self.assertEqual(self.live_count(), 1)
+        self.assertEqual([a['row_count'] for a in self.archive.list_archives()], [1, 49])
+
+        history = self.archive.history("students", 1)
+        self.assertEqual([e['operation'] for e in history], ["UPDATE", "UPDATE", "CREATE"])
+        self.assertEqual([e['source'] for e in history],
+                         ["school_audit_2022.db", "school_audit_2023.db", "live"])
+        self.assertEqual(history[0]['new_values'], {'n': 2022})
+        self.assertEqual(history[2]['new_values']['email'], "vivo@test.com")
+
+        self.assertEqual(len(self.archive.history("students", 1, since="2023-01-01")), 2)
+        self.assertEqual(self.archive.rollover(max_age_days=365), {})
+
+    def test_rollover_by_size_and_compact(self):
+        """
+        Prueba la rotación por número de filas y la compactación posterior
+        """
+        self.archive.rollover(max_rows=10)
+        self.assertEqual(self.live_count(), 10)
+        self.assertEqual(len(self.archive.history("students", 1)), 3)
+
+        sizes = self.archive.compact()
+        self.assertEqual(len(sizes), 3)
+        for size in sizes.values():
+            self.assertGreater(size['bytes_after'], 0)
+
+        with self.assertRaises(ValueError):
+            self.archive.rollover()
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.archive.rollover(max_rows=1)
+
+    def test_history_uses_index(self):
+        """
+        Prueba que el historial de un registro no recorra la tabla
+        """
+        plan = self.db.execute_query(
+            "EXPLAIN QUERY PLAN SELECT * FROM audit_log WHERE table_name = ? AND record_id = ? "
+            "ORDER BY timestamp, id", ("students", 1)
+        )
+        details = " ".join(row['detail'] for row in plan)
+        self.assertIn("idx_audit_log_record", details)
+        self.assertNotIn("TEMP B-TREE", details)
+
+if __name__ == '__main__':
+    unittest.main()
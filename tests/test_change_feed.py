@@ -0,0 +1,218 @@
+"""
+Pruebas unitarias para el flujo de cambios (ChangeFeed) y RecordSet.apply_changes
+"""
+
+import unittest
+import sys
+import os
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base import DatabaseTestCase
+from src.database.audit_archive import AuditArchive
+from src.database.change_feed import Change, ChangeFeed
+from src.database.crud_operations import CRUDOperations
+from src.database.dao import Student, StudentDAO, Enrollment, EnrollmentDAO
+from src.database.data_navigator import DataNavigator, RecordSet, SortOrder
+
+class ChangeFeedTestCase(DatabaseTestCase):
+    """
+    Base para las pruebas: base de datos temporal con datos de ejemplo
+    """
+
+    database_options = {'sample_data': True}
+
+    def setUp(self):
+        super().setUp()
+        self.student_dao = StudentDAO()
+        self.enrollment_dao = EnrollmentDAO()
+
+class TestChangeFeed(ChangeFeedTestCase):
+    """
+    Clase para probar la secuencia de cambios y el sondeo con data_version
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.feed = ChangeFeed(self.db)
+
+    def tearDown(self):
+        self.feed.close()
+        super().tearDown()
+
+    def test_changes_since_in_order(self):
+        """
+        Prueba que changes_since retorne solo lo posterior a seq, en orden y por tabla
+        """
+        seq = self.feed.current_seq()
+        student_id = self.student_dao.create(Student(first_name="Ana", last_name="Feed", email="ana@test.com"))
+        self.enrollment_dao.create(Enrollment(student_id=student_id, course_id=1))
+        student = self.student_dao.get_by_id(student_id)
+        student.phone = "555-0101"
+        self.student_dao.update(student)
+
+        changes = self.feed.changes_since(seq)
+        self.assertEqual([(c.table_name, c.operation) for c in changes],
+                         [("students", "CREATE"), ("enrollments", "CREATE"), ("students", "UPDATE")])
+        self.assertEqual([c.seq for c in changes], sorted(c.seq for c in changes))
+        self.assertEqual(changes[-1].seq, self.feed.current_seq())
+        self.assertEqual(changes[-1].new_values['phone'], "555-0101")
+
+        students = self.feed.changes_since(seq, tables=("students",))
+        self.assertEqual([c.record_id for c in students], [student_id, student_id])
+        self.assertEqual(len(self.feed.changes_since(seq, limit=1)), 1)
+        self.assertEqual(self.feed.changes_since(self.feed.current_seq()), [])
+
+    def test_covers_detects_rotated_changes(self):
+        """
+        Prueba que covers detecte cambios que ya no están en audit_log
+        """
+        seq = self.feed.current_seq()
+        self.student_dao.delete(1)
+        self.assertTrue(self.feed.covers(seq))
+        self.assertTrue(self.feed.covers(0))
+
+        self.db.execute_non_query("DELETE FROM audit_log WHERE id <= ?", (seq + 1,))
+        self.assertFalse(self.feed.covers(seq))
+        self.assertTrue(self.feed.covers(self.feed.current_seq()))
+
+    def test_has_changed_probe(self):
+        """
+        Prueba que el sondeo detecte escrituras de otras conexiones y se reinicie
+        """
+        self.assertFalse(self.feed.has_changed())
+        self.student_dao.create(Student(first_name="Beto", last_name="Feed", email="beto@test.com"))
+        self.assertTrue(self.feed.has_changed())
+        self.assertFalse(self.feed.has_changed())
+
+    def test_disconnect_closes_probes(self):
+        """
+        Prueba que disconnect cierre las conexiones de sondeo de todos los flujos
+        """
+        navigator = DataNavigator()
+        self.assertIsNotNone(navigator.change_feed._probe)
+        navigator.close()
+        self.assertIsNone(navigator.change_feed._probe)
+
+        navigator = DataNavigator()
+        self.db.disconnect()
+        self.assertIsNone(navigator.change_feed._probe)
+        self.assertIsNone(self.feed._probe)
+
+class TestRecordSetSync(ChangeFeedTestCase):
+    """
+    Clase para probar la actualización incremental de los recordsets
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.navigator = DataNavigator()
+
+    def tearDown(self):
+        self.navigator.close()
+        super().tearDown()
+
+    def ids(self, records):
+        return [record.id for record in records]
+
+    def test_sync_patches_filtered_sorted_recordset(self):
+        """
+        Prueba que sync aplique altas, bajas y cambios sin releer la tabla
+        """
+        recordset = self.navigator.load_students("active")
+        self.navigator.sort_students('name', SortOrder.DESC)
+        recordset.go_to(1)
+        current = recordset.current_record
+        untouched = [s for s in recordset.records if s.id not in (1, 2)]
+
+        new_id = self.student_dao.create(Student(first_name="Zoe", last_name="Aaron", email="zoe@test.com"))
+        self.student_dao.create(Student(first_name="Ina", last_name="Activa", email="ina@test.com",
+                                        status="inactive"))
+        juan = self.student_dao.get_by_id(1)
+        juan.status = "inactive"
+        self.student_dao.update(juan)
+        CRUDOperations().update_student(2, phone="555-0202")
+
+        self.assertEqual(self.navigator.sync(), {'students': 4})
+        expected = self.student_dao.get_by_status("active")
+        expected.sort(key=lambda s: f"{s.last_name} {s.first_name}", reverse=True)
+        self.assertEqual(self.ids(recordset.records), self.ids(expected))
+        self.assertEqual(recordset.records[-1].id, new_id)
+        self.assertEqual(next(s for s in recordset.records if s.id == 2).phone, "555-0202")
+        # Los registros sin cambios son los mismos objetos y el actual se conserva
+        for student in untouched:
+            self.assertTrue(any(student is record for record in recordset.records))
+        if current.id not in (1, 2):
+            self.assertIs(recordset.current_record, current)
+
+        self.assertEqual(self.navigator.sync(), {})
+
+    def test_apply_changes_keeps_unsorted_positions(self):
+        """
+        Prueba que sin orden los modificados conserven su lugar y los nuevos vayan al final
+        """
+        students = self.student_dao.get_all()
+        recordset = RecordSet(students)
+        recordset.go_to(2)
+        current = recordset.current_record
+        image = lambda student, **values: dict(student.to_dict(), **values)
+        changes = [
+            Change(1, "students", "UPDATE", students[1].id, image(students[1], phone="555-0001")),
+            Change(2, "students", "CREATE", 99, image(students[0], id=99, email="nuevo@test.com")),
+            Change(3, "students", "DELETE", students[0].id, None),
+            Change(4, "students", "UPDATE", 99, image(students[0], id=99, phone="555-0099")),
+            Change(5, "students", "DELETE", 500, None)
+        ]
+
+        self.assertEqual(recordset.apply_changes(changes, Student), 4)
+        self.assertEqual(self.ids(recordset.records), [s.id for s in students[1:]] + [99])
+        self.assertEqual(recordset.records[0].phone, "555-0001")
+        self.assertEqual(recordset.records[-1].phone, "555-0099")
+        self.assertIs(recordset.current_record, current)
+        self.assertEqual(recordset.seq, 5)
+
+    def test_rollover_forces_full_reload(self):
+        """
+        Prueba que un recordset cuya posición quedó antes de una rotación se
+        recargue completo en lugar de saltarse los cambios archivados
+        """
+        recordset = self.navigator.load_students()
+        new_id = self.student_dao.create(Student(first_name="Rita", last_name="Rotada", email="rita@test.com"))
+        CRUDOperations().update_student(2, phone="555-0202")
+        self.assertTrue(AuditArchive(self.db).rollover(max_rows=1))
+        self.assertFalse(self.navigator.change_feed.covers(recordset.seq))
+
+        # Solo queda el último cambio (el teléfono); el alta está en el archivo
+        self.assertEqual(self.navigator.sync(), {'students': 1})
+        self.assertIn(new_id, self.ids(recordset.records))
+        self.assertEqual(self.ids(recordset.records), self.ids(self.student_dao.get_all()))
+        self.assertTrue(self.navigator.change_feed.covers(recordset.seq))
+
+    def test_sync_enrollments_and_deletes(self):
+        """
+        Prueba el borrado en cascada y la pertenencia por estudiante
+        """
+        recordset = self.navigator.load_enrollments(student_id=1)
+        before = recordset.record_count
+        enrollment_id = self.enrollment_dao.create(Enrollment(student_id=1, course_id=5))
+        self.enrollment_dao.create(Enrollment(student_id=2, course_id=5))
+        self.assertEqual(self.navigator.sync(), {'enrollments': 2})
+        self.assertEqual(recordset.record_count, before + 1)
+        self.assertEqual(recordset.records[-1].id, enrollment_id)
+
+        self.student_dao.delete(1)
+        self.navigator.sync()
+        self.assertEqual(recordset.record_count, 0)
+
+    def test_search_reloads(self):
+        """
+        Prueba que una carga por búsqueda de nombre se recargue completa
+        """
+        recordset = self.navigator.load_students("Pérez")
+        self.student_dao.create(Student(first_name="Luis", last_name="Pérez", email="luis@test.com"))
+        self.assertEqual(self.navigator.sync(), {'students': 1})
+        self.assertEqual(self.ids(recordset.records), self.ids(self.student_dao.search_by_name("Pérez")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+"""
+Pruebas unitarias para el pool de conexiones
+"""
+
+import unittest
+import sqlite3
+import tempfile
+import threading
+import sys
+import os
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base import DatabaseTestCase
+from src.database.connection_pool import ConnectionPool, PoolTimeoutError
+
+class TestConnectionPool(unittest.TestCase):
+    """
+    Clase para probar el pool de conexiones
+    """
+
+    def setUp(self):
+        """
+        Configuración inicial para cada prueba
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "pool.db")
+        self.pool = ConnectionPool(
+            lambda: sqlite3.connect(self.db_path, check_same_thread=False),
+            size=2, timeout=0.2
+        )
+
+    def tearDown(self):
+        self.pool.close_all()
+        self.temp_dir.cleanup()
+
+    def test_checkout_is_reentrant_per_thread(self):
+        """
+        Prueba que las operaciones anidadas reutilicen la misma conexión
+        """
+        with self.pool.connection() as outer:
+            with self.pool.connection() as inner:
+                self.assertIs(outer, inner)
+
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['idle'], 1)
+        self.assertEqual(stats['checkouts'], 1)
+
+    def test_threads_get_different_connections(self):
+        """
+        Prueba que cada hilo reciba su propia conexión
+        """
+        seen = []
+        barrier = threading.Barrier(2)
+
+        def worker():
+            with self.pool.connection() as conn:
+                seen.append(conn)
+                barrier.wait()
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(seen), 2)
+        self.assertIsNot(seen[0], seen[1])
+        self.assertEqual(self.pool.get_stats()['in_use'], 0)
+
+    def test_wait_timeout_when_exhausted(self):
+        """
+        Prueba que se respete el tiempo de espera cuando el pool está lleno
+        """
+        holding = threading.Event()
+        done = threading.Event()
+
+        def holder():
+            with self.pool.connection():
+                holding.set()
+                done.wait(2)
+
+        threads = [threading.Thread(target=holder) for _ in range(2)]
+        for thread in threads:
+            holding.clear()
+            thread.start()
+            holding.wait(2)
+
+        try:
+            with self.assertRaises(PoolTimeoutError):
+                self.pool.acquire()
+        finally:
+            done.set()
+            for thread in threads:
+                thread.join()
+
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['waits'], 1)
+        self.assertEqual(stats['timeouts'], 1)
+        self.assertGreater(stats['total_wait_time'], 0)
+
+    def test_reset_closes_connections(self):
+        """
+        Prueba que reset() descarte las conexiones existentes
+        """
+        with self.pool.connection() as first:
+            pass
+        self.pool.reset()
+        with self.pool.connection() as second:
+            self.assertIsNot(first, second)
+        self.assertEqual(self.pool.get_stats()['created'], 1)
+
+class TestDatabaseConnectionPool(DatabaseTestCase):
+    """
+    Clase para probar el uso del pool desde DatabaseConnection
+    """
+
+    database_options = {'pool_size': 3}
+
+    def test_concurrent_queries(self):
+        """
+        Prueba consultas y escrituras desde varios hilos a la vez
+        """
+        errors = []
+
+        def worker(index):
+            try:
+                for i in range(10):
+                    self.db.execute_non_query(
+                        "INSERT INTO students (first_name, last_name, email) VALUES (?, ?, ?)",
+                        ("Hilo", str(index), f"hilo{index}_{i}@test.com")
+                    )
+                    self.db.execute_query("SELECT * FROM students")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        count = self.db.execute_scalar("SELECT COUNT(*) FROM students WHERE first_name = 'Hilo'")
+        self.assertEqual(count, 40)
+        self.assertLessEqual(self.db.get_pool_stats()['created'], 3)
+
+    def test_performance_profiles(self):
+        """
+        Prueba que los perfiles de rendimiento se apliquen a las conexiones
+        """
+        active = self.db.get_active_profile()
+        self.assertEqual(active['name'], 'interactive')
+        self.assertEqual(active['effective']['journal_mode'], 'wal')
+        self.assertEqual(active['effective']['synchronous'], 1)
+
+        self.db.set_profile('bulk-load')
+        active = self.db.get_active_profile()
+        self.assertEqual(active['effective']['synchronous'], 0)
+        self.assertEqual(active['effective']['cache_size'], -131072)
+
+        with self.assertRaises(ValueError):
+            self.db.set_profile('inexistente')
+
+class TestDatabaseInfo(DatabaseTestCase):
+    """
+    Clase para probar get_database_info en modo rápido y exacto
+    """
+
+    database_options = {'sample_data': True}
+
+    def tables(self, **kwargs) -> dict:
+        return {t['name']: t for t in self.db.get_database_info(**kwargs)['tables']}
+
+    def test_fast_mode_avoids_count_scans(self):
+        """
+        Prueba que el modo rápido no ejecute COUNT(*) y use sqlite_stat1
+        """
+        self.db.update_statistics()
+        self.db.reset_query_stats()
+        tables = self.tables()
+
+        statements = [s['statement'] for s in self.db.get_query_stats()['statements']]
+        self.assertFalse(any("COUNT(*)" in statement for statement in statements))
+        self.assertEqual(tables['students']['records'], 5)
+        self.assertEqual(tables['students']['count_source'], 'sqlite_stat1')
+
+    def test_exact_counts_and_sizes(self):
+        """
+        Prueba los conteos exactos, los tamaños y las páginas libres
+        """
+        self.db.execute_non_query("DELETE FROM enrollments WHERE id = 1")
+        info = self.db.get_database_info(exact_counts=True)
+        tables = {t['name']: t for t in info['tables']}
+
+        self.assertEqual(tables['enrollments']['records'], 4)
+        self.assertEqual(tables['enrollments']['count_source'], 'exact')
+        self.assertGreater(tables['students']['bytes'], 0)
+        self.assertIn('sqlite_autoindex_students_1', [i['name'] for i in info['indexes']])
+        self.assertGreaterEqual(info['free_pages'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,753 @@
+"""
+Pruebas unitarias para los Objetos de Acceso a Datos (DAO)
+"""
+
+import json
+import sqlite3
+import threading
+import unittest
+import sys
+import os
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base import DatabaseTestCase
+from src.database.dao import Student, Course, Enrollment, StudentDAO, CourseDAO, EnrollmentDAO
+from src.database.data_navigator import DataNavigator
+from src.database.crud_operations import CRUDOperations
+from src.database.fts import build_match_expression
+from src.database.pagination import PageDirection
+from src.database.row_factory import compile_row_factory
+
+class DAOTestCase(DatabaseTestCase):
+    """
+    Base para las pruebas: crea una base de datos temporal por prueba
+    """
+
+    database_options = {'sample_data': True}
+
+    def setUp(self):
+        """
+        Configuración inicial para cada prueba
+        """
+        super().setUp()
+        # Los triggers también auditan los datos de ejemplo: cada prueba parte del log vacío
+        self.db.execute_non_query("DELETE FROM audit_log")
+        self.student_dao = StudentDAO()
+        self.course_dao = CourseDAO()
+        self.enrollment_dao = EnrollmentDAO()
+
+class TestStreaming(DAOTestCase):
+    """
+    Clase para probar la lectura por bloques (iter_query / iter_all)
+    """
+
+    def test_iter_query_yields_all_rows(self):
+        """
+        Prueba que iter_query retorne las mismas filas que execute_query
+        """
+        query = "SELECT id FROM students ORDER BY id"
+        streamed = [row['id'] for row in self.db.iter_query(query, batch_size=2)]
+        fetched = [row['id'] for row in self.db.execute_query(query)]
+        self.assertEqual(streamed, fetched)
+        self.assertEqual(self.db.get_pool_stats()['in_use'], 0)
+
+    def test_iter_all_matches_get_all(self):
+        """
+        Prueba que iter_all construya los mismos objetos que get_all
+        """
+        self.assertEqual(
+            [s.to_dict() for s in self.student_dao.iter_all(batch_size=2)],
+            [s.to_dict() for s in self.student_dao.get_all()]
+        )
+        self.assertEqual(
+            [c.id for c in self.course_dao.iter_all(batch_size=3)],
+            [c.id for c in self.course_dao.get_all()]
+        )
+        self.assertEqual(
+            [e.id for e in self.enrollment_dao.iter_all(batch_size=1)],
+            [e.id for e in self.enrollment_dao.get_all()]
+        )
+
+    def test_abandoned_iteration_releases_connection(self):
+        """
+        Prueba que cerrar el generador devuelva la conexión al pool
+        """
+        rows = self.student_dao.iter_all(batch_size=1)
+        next(rows)
+        self.assertEqual(self.db.get_pool_stats()['in_use'], 1)
+        rows.close()
+        self.assertEqual(self.db.get_pool_stats()['in_use'], 0)
+
+    def test_nested_read_and_write_inside_iteration(self):
+        """
+        Prueba lecturas y escrituras dentro de iter_all: se confirman al
+        momento y la iteración conserva su instantánea
+        """
+        other = sqlite3.connect(self.db.db_path)
+        self.addCleanup(other.close)
+        initial = [s.id for s in self.student_dao.get_all()]
+        seen = []
+
+        for student in self.student_dao.iter_all(batch_size=1):
+            seen.append(student.id)
+            with self.db.transaction():
+                new_id = self.student_dao.create(Student(first_name="Nuevo", last_name=str(student.id),
+                                                         email=f"nuevo{student.id}@test.com"))
+                self.db.audit.log("students", "REVIEW", new_id)
+            # Visible desde otra conexión antes de terminar el bucle (COMMIT propio)
+            self.assertEqual(other.execute("SELECT COUNT(*) FROM audit_log WHERE operation = 'REVIEW' "
+                                           "AND record_id = ?", (new_id,)).fetchone()[0], 1)
+            self.assertIsNotNone(other.execute("SELECT id FROM students WHERE id = ?", (new_id,)).fetchone())
+            self.assertEqual(self.student_dao.get_by_id(student.id).email, student.email)
+            self.assertEqual(self.student_dao.get_by_id(new_id).last_name, str(student.id))
+
+        self.assertEqual(seen, initial)
+        self.assertEqual(self.db.execute_scalar("SELECT COUNT(*) FROM students"), 2 * len(initial))
+        self.assertEqual(self.db.get_pool_stats()['in_use'], 0)
+
+    def test_iteration_consumed_by_another_thread(self):
+        """
+        Prueba que el generador pueda recorrerse y cerrarse desde otro hilo
+        """
+        rows = self.student_dao.iter_all(batch_size=1)
+        first = next(rows)
+        result = {}
+        worker = threading.Thread(target=lambda: result.update(rest=[s.id for s in rows]))
+        worker.start()
+        worker.join()
+        self.assertEqual([first.id] + result['rest'], [s.id for s in self.student_dao.get_all()])
+        self.assertEqual(self.db.get_pool_stats()['in_use'], 0)
+
+    def test_iteration_reuses_thread_connection(self):
+        """
+        Prueba que iter_query dentro de get_cursor use la conexión del hilo
+        (con un pool de una sola conexión no queda otra que tomar)
+        """
+        self.db.disconnect()
+        self.open_database(sample_data=True, pool_size=1, pool_timeout=0.5)
+        with self.db.get_cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM students")
+            total = cursor.fetchone()[0]
+            ids = [row['id'] for row in self.db.iter_query("SELECT id FROM students", batch_size=2)]
+        self.assertEqual(len(ids), total)
+        self.assertEqual(self.db.get_pool_stats()['in_use'], 0)
+
+class TestRowMaterialization(DAOTestCase):
+    """
+    Clase para probar los modelos con __slots__ y las fábricas compiladas
+    """
+
+    def test_models_have_no_instance_dict(self):
+        """
+        Prueba que los modelos no creen __dict__ por objeto
+        """
+        for model in (Student, Course, Enrollment):
+            self.assertFalse(hasattr(model(), '__dict__'))
+
+    def test_compiled_factory_matches_dict_path(self):
+        """
+        Prueba que la fábrica compilada construya los mismos objetos que **dict(row)
+        """
+        for table, model in (("students", Student), ("courses", Course), ("enrollments", Enrollment)):
+            rows = self.db.execute_query(f"SELECT * FROM {table} ORDER BY id")
+            objects = self.db.execute_query(f"SELECT * FROM {table} ORDER BY id", model=model)
+            self.assertTrue(all(isinstance(obj, model) for obj in objects))
+            self.assertEqual([obj.to_dict() for obj in objects],
+                             [model(**dict(row)).to_dict() for row in rows])
+
+    def test_partial_and_extra_columns(self):
+        """
+        Prueba que las columnas faltantes tomen el valor por defecto y las extra se ignoren
+        """
+        build = compile_row_factory(Student, ["rank", "id", "email"])
+        student = build(None, (0.5, 7, "x@test.com"))
+        self.assertEqual((student.id, student.email, student.status, student.first_name),
+                         (7, "x@test.com", "active", ""))
+        self.assertIs(compile_row_factory(Student, ["rank", "id", "email"]), build)
+
+        streamed = list(self.db.iter_query("SELECT id, grade FROM enrollments", batch_size=2, model=Enrollment))
+        self.assertEqual(len(streamed), self.db.execute_scalar("SELECT COUNT(*) FROM enrollments"))
+        self.assertEqual(streamed[0].status, "enrolled")
+
+class TestDirtyTracking(DAOTestCase):
+    """
+    Clase para probar que las actualizaciones escriban solo las columnas modificadas
+    """
+
+    def traced_updates(self):
+        """Registra las sentencias UPDATE emitidas por las conexiones del pool"""
+        updates = []
+        connection = self.db.pool.acquire()
+        connection.set_trace_callback(lambda sql: updates.append(sql) if sql.startswith("UPDATE") else None)
+        self.db.pool.release(connection)
+        return updates
+
+    def test_loaded_objects_track_changes(self):
+        """
+        Prueba que los objetos leídos sepan qué atributos cambiaron
+        """
+        student = self.student_dao.get_by_id(1)
+        self.assertEqual(student.changed_fields(["phone", "status"]), [])
+        student.status = "inactive"
+        self.assertEqual(student.changed_fields(["phone", "status"]), ["status"])
+        self.assertEqual(student.loaded_values()['status'], "active")
+
+        self.assertIsNone(Student(id=1).changed_fields(["phone"]))
+        partial = self.db.execute_query("SELECT id, email FROM students", model=Student)[0]
+        self.assertIsNone(partial.changed_fields(["phone"]))
+
+    def test_update_writes_only_changed_columns(self):
+        """
+        Prueba el UPDATE parcial y su auditoría
+        """
+        updates = self.traced_updates()
+        student = self.student_dao.get_by_id(1)
+        student.phone = "555-4321"
+        self.assertTrue(self.student_dao.update(student))
+
+        self.assertEqual(updates[0], "UPDATE students SET phone = '555-4321' WHERE id = 1 RETURNING *")
+        self.assertEqual(student.changed_fields(["phone"]), [])
+        old_values = self.db.execute_scalar("SELECT old_values FROM audit_log WHERE operation = 'UPDATE'")
+        self.assertEqual(json.loads(old_values)['phone'], "123-456-7890")
+        self.assertEqual(self.student_dao.get_by_id(1).phone, "555-4321")
+
+    def test_unchanged_update_skips_write(self):
+        """
+        Prueba que sin cambios no se escriba ni se dispare el trigger de updated_at
+        """
+        updates = self.traced_updates()
+        self.assertTrue(self.student_dao.update(self.student_dao.get_by_id(1)))
+        self.assertTrue(CRUDOperations().update_course(1, credits=self.course_dao.get_by_id(1).credits))
+
+        # Un objeto sin rastreo se compara contra la fila guardada
+        enrollment = self.enrollment_dao.get_by_id(1)
+        self.assertTrue(self.enrollment_dao.update(Enrollment(**enrollment.to_dict())))
+
+        self.assertEqual(updates, [])
+        self.assertEqual(self.db.execute_scalar("SELECT COUNT(*) FROM audit_log"), 0)
+        self.assertFalse(self.student_dao.update(Student(id=999, first_name="No")))
+
+    def test_bulk_writes_refresh_loaded_values(self):
+        """
+        Prueba que update_many y el upsert actualicen los valores leídos:
+        un update() posterior que revierte el cambio debe escribirse
+        """
+        student = self.student_dao.get_by_id(1)
+        student.status = "inactive"
+        self.assertEqual(self.student_dao.update_many([student]).ids, [1])
+        student.status = "active"
+        self.assertTrue(self.student_dao.update(student))
+        self.assertEqual(self.db.execute_scalar("SELECT status FROM students WHERE id = 1"), "active")
+
+        course = self.course_dao.get_by_id(1)
+        course.capacity = 99
+        self.course_dao.upsert_by_code(course)
+        course.capacity = 30
+        self.assertTrue(self.course_dao.update(course))
+        self.assertEqual(self.db.execute_scalar("SELECT capacity FROM courses WHERE id = 1"), 30)
+
+    def test_repeated_key_takes_last_write(self):
+        """
+        Prueba que, si la clave se repite en el lote, todos los objetos tomen
+        como valores leídos la fila que quedó guardada
+        """
+        first, second = self.student_dao.get_by_id(2), self.student_dao.get_by_id(2)
+        first.status, second.status = "graduated", "inactive"
+        self.student_dao.upsert_many_by_email([first, second])
+        self.assertEqual(first.loaded_values()['status'], "inactive")
+        self.assertTrue(self.student_dao.update(first))
+        self.assertEqual(self.db.execute_scalar("SELECT status FROM students WHERE id = 2"), "graduated")
+
+class TestFullTextSearch(DAOTestCase):
+    """
+    Clase para probar la búsqueda de texto completo (FTS5)
+    """
+
+    def test_match_expression(self):
+        """
+        Prueba que cada palabra se convierta en un prefijo obligatorio
+        """
+        self.assertEqual(
+            build_match_expression("Mar  Gar-", ["first_name", "last_name"]),
+            '{first_name last_name} : ("mar"* AND "gar"*)'
+        )
+        self.assertEqual(build_match_expression("o'brien"), '"o"* AND "brien"*')
+        self.assertIsNone(build_match_expression(" %- "))
+
+    def test_prefix_search_folds_diacritics(self):
+        """
+        Prueba que la búsqueda ignore acentos y mayúsculas
+        """
+        names = [s.full_name for s in self.student_dao.search_by_name("maria")]
+        self.assertEqual(names, ["María García"])
+        names = [s.full_name for s in self.student_dao.search_by_name("MARTI")]
+        self.assertEqual(names, ["Ana Martínez"])
+        self.assertEqual(self.student_dao.search_by_name("artínez"), [])
+
+    def test_index_follows_writes(self):
+        """
+        Prueba que los triggers mantengan el índice al insertar, editar y borrar
+        """
+        student_id = self.student_dao.create(
+            Student(first_name="Íñigo", last_name="Zúñiga", email="inigo@test.com")
+        )
+        self.assertEqual([s.id for s in self.student_dao.search_by_name("zuniga")], [student_id])
+
+        student = self.student_dao.get_by_id(student_id)
+        student.last_name = "Ortega"
+        self.student_dao.update(student)
+        self.assertEqual(self.student_dao.search_by_name("zuniga"), [])
+        self.assertEqual([s.id for s in self.student_dao.search_by_name("orteg")], [student_id])
+
+        self.student_dao.delete(student_id)
+        self.assertEqual(self.student_dao.search_by_name("ortega"), [])
+
+    def test_results_are_ranked(self):
+        """
+        Prueba que las coincidencias más relevantes aparezcan primero
+        """
+        self.course_dao.create(Course(name="Historia", code="HIS101",
+                                      description="Historia de la programación"))
+        self.course_dao.create(Course(name="Programación Avanzada", code="PRG201",
+                                      description="Programación, programación y más programación"))
+        courses = self.course_dao.search("programacion")
+        self.assertEqual(courses[0].code, "PRG201")
+        self.assertTrue({c.code for c in courses} >= {"HIS101", "PRG201"})
+        self.assertEqual(self.course_dao.search("programacion", limit=1)[0].code, "PRG201")
+
+    def test_advanced_search_combines_criteria(self):
+        """
+        Prueba la búsqueda avanzada combinando FTS5 con filtros normales
+        """
+        navigator = DataNavigator()
+        found = navigator.search_students_advanced({'name': 'juan', 'email': 'perez', 'status': 'active'})
+        self.assertEqual([s.full_name for s in found], ["Juan Pérez"])
+        self.assertEqual(navigator.search_students_advanced({'name': 'juan', 'status': 'graduated'}), [])
+        self.assertEqual(len(navigator.search_students_advanced({'status': 'active'})), 5)
+
+class TestBulkOperations(DAOTestCase):
+    """
+    Clase para probar create_many, update_many y delete_many
+    """
+
+    def count_commits(self):
+        """Registra los COMMIT emitidos por las conexiones del pool"""
+        commits = []
+        connection = self.db.pool.acquire()
+        connection.set_trace_callback(lambda sql: commits.append(sql) if sql.startswith("COMMIT") else None)
+        self.db.pool.release(connection)
+        return commits
+
+    def audit_count(self, operation: str) -> int:
+        return self.db.execute_scalar(
+            "SELECT COUNT(*) FROM audit_log WHERE table_name = 'students' AND operation = ?", (operation,)
+        )
+
+    def test_create_many_returns_ids_in_one_commit(self):
+        """
+        Prueba que el lote use una sola transacción y retorne los IDs nuevos
+        """
+        commits = self.count_commits()
+        students = [Student(first_name=f"Bulk{i}", last_name="Test", email=f"bulk{i}@test.com")
+                    for i in range(50)]
+        result = self.student_dao.create_many(students)
+
+        self.assertEqual(len(commits), 1)
+        self.assertEqual(result.succeeded, 50)
+        self.assertEqual(result.errors, [])
+        self.assertEqual([self.student_dao.get_by_id(i).email for i in result.ids],
+                         [s.email for s in students])
+        self.assertEqual(self.audit_count("CREATE"), 50)
+
+    def test_bad_rows_do_not_abort_batch(self):
+        """
+        Prueba que las violaciones de restricciones se reporten por fila
+        """
+        students = [
+            Student(first_name="Uno", last_name="Test", email="uno@test.com"),
+            Student(first_name="Dup", last_name="Test", email="juan.perez@email.com"),
+            Student(first_name="Dos", last_name="Test", email="dos@test.com"),
+            Student(first_name="Mal", last_name="Test", email="mal@test.com", status="desconocido")
+        ]
+        result = self.student_dao.create_many(students)
+
+        self.assertEqual(result.succeeded, 2)
+        self.assertEqual([e['index'] for e in result.errors], [1, 3])
+        self.assertEqual(result.errors[0]['error'], "El email ya existe en el sistema")
+        self.assertEqual([self.student_dao.get_by_id(i).first_name for i in result.ids], ["Uno", "Dos"])
+        self.assertEqual(self.audit_count("CREATE"), 2)
+
+    def test_update_many_and_delete_many(self):
+        """
+        Prueba la actualización y el borrado masivos con IDs inexistentes
+        """
+        students = self.student_dao.get_all()[:3]
+        for student in students:
+            student.phone = "000-0000"
+        students.append(Student(id=9999, first_name="No", last_name="Existe", email="no@test.com"))
+
+        result = self.student_dao.update_many(students)
+        self.assertEqual(result.ids, [s.id for s in students[:3]])
+        self.assertEqual(result.errors, [{'index': 3, 'id': 9999, 'error': "Registro no encontrado"}])
+        self.assertEqual(self.student_dao.get_by_id(students[0].id).phone, "000-0000")
+        self.assertEqual(self.audit_count("UPDATE"), 3)
+
+        duplicate = self.student_dao.get_by_id(students[1].id)
+        duplicate.email = students[0].email
+        result = self.student_dao.update_many([duplicate])
+        self.assertEqual(result.errors[0]['id'], duplicate.id)
+
+        result = self.student_dao.delete_many([students[0].id, 9999])
+        self.assertEqual(result.ids, [students[0].id])
+        self.assertEqual(result.failed, 1)
+        self.assertIsNone(self.student_dao.get_by_id(students[0].id))
+        self.assertEqual(self.audit_count("DELETE"), 1)
+
+    def test_enrollment_foreign_keys_are_reported(self):
+        """
+        Prueba los errores de integridad referencial en inscripciones
+        """
+        result = self.enrollment_dao.create_many([
+            Enrollment(student_id=1, course_id=5),
+            Enrollment(student_id=999, course_id=1)
+        ])
+        self.assertEqual(result.succeeded, 1)
+        self.assertEqual(result.errors[0]['error'], "Estudiante o curso no válido")
+
+class TestUpsert(DAOTestCase):
+    """
+    Clase para probar upsert_by_email / upsert_by_code y sus variantes masivas
+    """
+
+    def audit_rows(self, table_name: str):
+        return self.db.execute_query(
+            "SELECT operation, record_id, old_values FROM audit_log WHERE table_name = ? ORDER BY id",
+            (table_name,)
+        )
+
+    def test_upsert_inserts_then_updates(self):
+        """
+        Prueba que la misma llamada inserte la primera vez y actualice la segunda
+        """
+        student = Student(first_name="Nuevo", last_name="Registro", email="nuevo@test.com")
+        student_id, inserted = self.student_dao.upsert_by_email(student)
+        self.assertTrue(inserted)
+
+        student.phone = "555-9999"
+        self.assertEqual(self.student_dao.upsert_by_email(student), (student_id, False))
+        self.assertEqual(self.student_dao.get_by_id(student_id).phone, "555-9999")
+
+        audit = [(row['operation'], row['record_id']) for row in self.audit_rows("students")]
+        self.assertEqual(audit, [("CREATE", student_id), ("UPDATE", student_id)])
+        self.assertEqual(json.loads(self.audit_rows("students")[1]['old_values'])['phone'], "")
+
+    def test_upsert_many_reports_each_row(self):
+        """
+        Prueba el lote mixto: filas nuevas, existentes, repetidas e inválidas
+        """
+        juan = self.student_dao.search_by_email("juan.perez@email.com")
+        result = self.student_dao.upsert_many_by_email([
+            Student(first_name="Juan", last_name="Pérez", email="juan.perez@email.com", status="graduated"),
+            Student(first_name="Nueva", last_name="Alumna", email="nueva@test.com"),
+            Student(first_name="Nueva", last_name="Alumna", email="nueva@test.com", phone="555-1234"),
+            Student(first_name="Mal", last_name="Estado", email="mal@test.com", status="desconocido")
+        ])
+
+        self.assertEqual(result.inserted, [result.ids[1]])
+        self.assertEqual(result.updated, [juan.id, result.ids[1]])
+        self.assertEqual([e['index'] for e in result.errors], [3])
+        self.assertEqual(self.student_dao.get_by_id(juan.id).status, "graduated")
+        self.assertEqual(self.student_dao.get_by_id(result.ids[1]).phone, "555-1234")
+        self.assertIsNone(self.student_dao.search_by_email("mal@test.com"))
+
+        operations = [row['operation'] for row in self.audit_rows("students")]
+        self.assertEqual(operations.count("CREATE"), 1)
+        self.assertEqual(operations.count("UPDATE"), 2)
+
+    def test_upsert_by_code_invalidates_identity_map(self):
+        """
+        Prueba el upsert de cursos dentro de una unidad de trabajo
+        """
+        with self.db.unit_of_work():
+            course = self.course_dao.search_by_code("MAT101")
+            self.assertEqual(self.course_dao.get_by_id(course.id).capacity, course.capacity)
+            course_id, inserted = self.course_dao.upsert_by_code(
+                Course(name=course.name, code="MAT101", credits=course.credits, capacity=99)
+            )
+            self.assertEqual((course_id, inserted), (course.id, False))
+            self.assertEqual(self.course_dao.get_by_id(course.id).capacity, 99)
+
+        with self.assertRaises(ValueError):
+            self.course_dao.upsert_by_code(Course(name=None, code="BAD1"))
+
+class TestGradeUpdates(DAOTestCase):
+    """
+    Clase para probar la publicación masiva de calificaciones (update_grades)
+    """
+
+    def audit_rows(self):
+        return self.db.execute_query(
+            "SELECT record_id, old_values, new_values FROM audit_log "
+            "WHERE table_name = 'enrollments' AND operation = 'UPDATE' ORDER BY id"
+        )
+
+    def test_outcome_per_id(self):
+        """
+        Prueba que el lote se valide completo y retorne el resultado de cada ID
+        """
+        result = self.enrollment_dao.update_grades([
+            (1, 95.0), (9999, 80.0), (2, 150), (3, "A"), ("x", 10),
+            (4, None), (1, 96.5), (True, 10), (5, float("nan"))
+        ])
+
+        self.assertEqual(result.updated, [1, 4])
+        self.assertEqual(result.not_found, [9999])
+        self.assertEqual(result.invalid, ["x", True, 2, 3, 5])
+        self.assertEqual(sorted(e['index'] for e in result.errors), [1, 2, 3, 4, 7, 8])
+        outcomes = dict(result.outcomes())
+        self.assertEqual((outcomes[1], outcomes[9999], outcomes[2]),
+                         ("updated", "not_found", "invalid"))
+
+        grades = {e.id: e.grade for e in self.enrollment_dao.get_all()}
+        self.assertEqual((grades[1], grades[4], grades[2], grades[3]), (96.5, None, 90.0, 78.0))
+        self.assertEqual(self.enrollment_dao.update_grades([(2, -1)]).updated, [])
+
+    def test_set_based_audit_matches_triggers(self):
+        """
+        Prueba que la auditoría por conjunto tenga la forma de la de los triggers
+        """
+        enrollment = self.enrollment_dao.get_by_id(1)
+        enrollment.grade = 70.0
+        self.enrollment_dao.update(enrollment)
+        triggers_sql = "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' ORDER BY name"
+        triggers = [tuple(row) for row in self.db.execute_query(triggers_sql)]
+        # Un updated_at antiguo (sin el trigger de timestamp, que lo renovaría)
+        with self.db.transaction() as cursor:
+            timestamp = cursor.execute("SELECT sql FROM sqlite_master "
+                                       "WHERE name = 'update_enrollments_timestamp'").fetchone()[0]
+            cursor.execute("DROP TRIGGER update_enrollments_timestamp")
+            cursor.execute("UPDATE enrollments SET updated_at = '2000-01-01 00:00:00' WHERE id = 2")
+            cursor.execute(timestamp)
+        result = self.enrollment_dao.update_grades([(2, 71.0)])
+
+        self.assertEqual(result.updated, [2])
+        by_trigger, set_based = self.audit_rows()
+        self.assertEqual(set_based['record_id'], 2)
+        old, new = json.loads(set_based['old_values']), json.loads(set_based['new_values'])
+        self.assertEqual(set(old), set(json.loads(by_trigger['new_values'])))
+        self.assertEqual((old['grade'], new['grade']), (90.0, 71.0))
+        self.assertEqual({k: v for k, v in new.items() if k not in ('grade', 'updated_at')},
+                         {k: v for k, v in old.items() if k not in ('grade', 'updated_at')})
+
+        # La imagen nueva lleva el updated_at que quedó en la fila
+        self.assertEqual(old['updated_at'], '2000-01-01 00:00:00')
+        self.assertEqual(new['updated_at'], self.db.execute_scalar(
+            "SELECT updated_at FROM enrollments WHERE id = 2"))
+
+        # Los triggers por fila vuelven a quedar activos, con el mismo SQL, al terminar
+        self.assertEqual([tuple(row) for row in self.db.execute_query(triggers_sql)], triggers)
+        self.db.execute_non_query("UPDATE enrollments SET grade = 50 WHERE id = 3")
+        self.assertEqual(len(self.audit_rows()), 3)
+        self.assertEqual(self.db.execute_scalar(
+            "SELECT grade_min FROM course_aggregates WHERE course_id = 1"), 50)
+
+    def test_last_duplicate_decides(self):
+        """
+        Prueba que, si un ID se repite, decida la última entrada aunque sea inválida
+        """
+        result = self.enrollment_dao.update_grades([(1, 95.0), (2, 150), (1, 150), (2, 70.0)])
+
+        self.assertEqual(result.updated, [2])
+        self.assertEqual(result.invalid, [1])
+        self.assertEqual([e['index'] for e in result.errors], [2])
+        self.assertEqual(result.outcomes(), [(1, "invalid"), (2, "updated")])
+        self.assertEqual(self.enrollment_dao.get_by_id(1).grade, 85.5)
+        self.assertEqual(self.enrollment_dao.get_by_id(2).grade, 70.0)
+
+    def test_unhashable_invalid_ids(self):
+        """
+        Prueba que los IDs inválidos no hashables se reporten sin fallar
+        """
+        result = self.enrollment_dao.update_grades([([1], 50.0), (1, 60.0), (True, 70.0)])
+
+        self.assertEqual(result.outcomes(), [([1], "invalid"), (True, "invalid"), (1, "updated")])
+        self.assertEqual([e['index'] for e in result.errors], [0, 2])
+        self.assertIn("GradeUpdateResult(1 actualizadas", str(result))
+
+    def test_unchanged_rows(self):
+        """
+        Prueba que las calificaciones iguales se reporten aparte y no se auditen
+        """
+        result = self.enrollment_dao.update_grades([(3, 78.0), (4, 93.0), (5, 88)])
+
+        self.assertEqual(result.updated, [4])
+        self.assertEqual(result.unchanged, [3, 5])
+        self.assertIn((3, "unchanged"), result.outcomes())
+        self.assertEqual(result.to_dict()['unchanged'], [3, 5])
+        self.assertEqual([row['record_id'] for row in self.audit_rows()], [4])
+
+    def test_identity_map_and_rollback(self):
+        """
+        Prueba la invalidación del mapa de identidad y que un error revierta todo el lote
+        """
+        with self.db.unit_of_work():
+            self.assertEqual(self.enrollment_dao.get_by_id(1).grade, 85.5)
+            self.enrollment_dao.update_grades([(1, 60.0)])
+            self.assertEqual(self.enrollment_dao.get_by_id(1).grade, 60.0)
+
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.enrollment_dao.update_grades([(1, 10.0), (2, 20.0)])
+                raise RuntimeError("fallo posterior")
+        self.assertEqual(self.enrollment_dao.get_by_id(1).grade, 60.0)
+        self.assertEqual(len(self.audit_rows()), 1)
+        # La tabla temporal también se deshizo: el siguiente lote la vuelve a crear
+        self.assertEqual(self.enrollment_dao.update_grades([(1, 61.0)]).updated, [1])
+
+class TestKeysetPagination(DAOTestCase):
+    """
+    Clase para probar la paginación por clave (get_page)
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.student_dao.create_many([
+            Student(first_name=f"Nombre{i % 3}", last_name=f"Apellido{i % 7}", email=f"page{i}@test.com")
+            for i in range(40)
+        ])
+
+    def walk(self, dao, limit, **kwargs):
+        """Recorre todas las páginas hacia adelante y retorna la lista de páginas"""
+        pages = [dao.get_page(limit=limit, **kwargs)]
+        while pages[-1].has_next:
+            pages.append(dao.get_page(after=pages[-1].next_cursor, limit=limit, **kwargs))
+        return pages
+
+    def test_pages_cover_get_all_order(self):
+        """
+        Prueba que las páginas sigan el orden de get_all sin repetir ni omitir filas
+        """
+        pages = self.walk(self.student_dao, 6)
+        ids = [s.id for page in pages for s in page]
+        expected = [s.id for s in sorted(self.student_dao.get_all(),
+                                         key=lambda s: (s.last_name, s.first_name, s.id))]
+        self.assertEqual(ids, expected)
+        self.assertFalse(pages[0].has_prev)
+        self.assertTrue(all(len(page) == 6 for page in pages[:-1]))
+
+    def test_previous_page_returns_same_rows(self):
+        """
+        Prueba que volver atrás con prev_cursor reproduzca la página anterior
+        """
+        pages = self.walk(self.student_dao, 7)
+        back = self.student_dao.get_page(after=pages[2].prev_cursor, limit=7)
+        self.assertEqual([s.id for s in back], [s.id for s in pages[1]])
+        self.assertTrue(back.has_next)
+
+        first = self.student_dao.get_page(after=pages[1].prev_cursor, limit=7)
+        self.assertEqual([s.id for s in first], [s.id for s in pages[0]])
+        self.assertFalse(first.has_prev)
+
+    def test_key_tuple_and_filters(self):
+        """
+        Prueba la clave explícita, los filtros y el orden descendente
+        """
+        students = sorted(self.student_dao.get_all(), key=lambda s: (s.last_name, s.first_name, s.id))
+        anchor = students[10]
+        page = self.student_dao.get_page(after=(anchor.last_name, anchor.first_name, anchor.id), limit=3)
+        self.assertEqual([s.id for s in page], [s.id for s in students[11:14]])
+
+        page = self.student_dao.get_page(after=(anchor.last_name, anchor.first_name, anchor.id),
+                                         limit=3, direction=PageDirection.PREVIOUS)
+        self.assertEqual([s.id for s in page], [s.id for s in students[7:10]])
+
+        courses = self.walk(self.course_dao, 2, semester="2024-1")
+        self.assertEqual(sum(len(p) for p in courses), len(self.course_dao.get_by_semester("2024-1")))
+
+        enrollments = [e.id for p in self.walk(self.enrollment_dao, 2) for e in p]
+        self.assertEqual(sorted(enrollments), sorted(e.id for e in self.enrollment_dao.get_all()))
+
+    def test_invalid_cursor(self):
+        """
+        Prueba que un token o una clave inválidos produzcan ValueError
+        """
+        with self.assertRaises(ValueError):
+            self.student_dao.get_page(after="no-es-un-token")
+        with self.assertRaises(ValueError):
+            self.student_dao.get_page(after=("solo-apellido",))
+
+class TestIdentityMap(DAOTestCase):
+    """
+    Clase para probar el mapa de identidad por unidad de trabajo
+    """
+
+    LOOKUP = "SELECT * FROM students WHERE id = ?"
+
+    def lookups(self) -> int:
+        """Número de consultas por ID ejecutadas contra la tabla students"""
+        for item in self.db.get_query_stats()['statements']:
+            if item['statement'] == self.LOOKUP:
+                return item['count']
+        return 0
+
+    def test_repeated_reads_hit_the_map(self):
+        """
+        Prueba que la misma clave retorne el mismo objeto con una sola consulta
+        """
+        self.db.reset_query_stats()
+        with self.db.unit_of_work():
+            first = self.student_dao.get_by_id(1)
+            second = self.student_dao.get_by_id(1)
+            self.assertIs(first, second)
+            self.assertIsNone(self.student_dao.get_by_id(999))
+        self.assertEqual(self.lookups(), 2)
+
+        stats = self.db.get_identity_map_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+        self.assertEqual(stats['active_entries'], 0)
+
+        # Fuera de una unidad de trabajo no hay caché
+        self.assertIsNot(self.student_dao.get_by_id(1), self.student_dao.get_by_id(1))
+
+    def test_update_reads_once_and_audits_original(self):
+        """
+        Prueba que update_student consulte una sola vez y audite los valores originales
+        """
+        self.db.reset_query_stats()
+        CRUDOperations().update_student(1, email="nuevo@test.com")
+        self.assertEqual(self.lookups(), 1)
+
+        old_values = self.db.execute_scalar(
+            "SELECT old_values FROM audit_log WHERE table_name = 'students' AND operation = 'UPDATE'"
+        )
+        self.assertIn("juan.perez@email.com", old_values)
+        self.assertEqual(self.student_dao.get_by_id(1).email, "nuevo@test.com")
+
+    def test_writes_and_rollbacks_invalidate(self):
+        """
+        Prueba que escribir, borrar en cascada o revertir invalide el mapa
+        """
+        with self.db.unit_of_work() as identity_map:
+            student = self.student_dao.get_by_id(1)
+            student.phone = "111-1111"
+            self.student_dao.update(student)
+            reloaded = self.student_dao.get_by_id(1)
+            self.assertIsNot(reloaded, student)
+            self.assertEqual(reloaded.phone, "111-1111")
+
+            enrollment_id = self.enrollment_dao.get_by_student(1)[0].id
+            self.assertIsNotNone(self.enrollment_dao.get_by_id(enrollment_id))
+            self.student_dao.delete(1)
+            self.assertIsNone(self.enrollment_dao.get_by_id(enrollment_id))
+
+            self.course_dao.get_by_id(1)
+            with self.assertRaises(RuntimeError):
+                with self.db.transaction():
+                    self.course_dao.get_by_id(2)
+                    raise RuntimeError("revertir")
+            self.assertEqual(len(identity_map), 0)
+
+if __name__ == '__main__':
+    unittest.main()
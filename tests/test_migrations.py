@@ -0,0 +1,73 @@
+"""
+Pruebas unitarias para las migraciones versionadas del esquema
+"""
+
+import unittest
+import sys
+import os
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base import DatabaseTestCase
+from src.database.connection import DatabaseConnection
+from src.database.migrations import Migration, MigrationRunner, MIGRATIONS, LATEST_VERSION
+
+class TestMigrations(DatabaseTestCase):
+    """
+    Clase para probar el control de versiones del esquema
+    """
+
+    def test_fresh_database_is_at_latest_version(self):
+        """
+        Prueba que una base nueva quede en la última versión y sin datos de ejemplo
+        """
+        runner = MigrationRunner(self.db)
+        self.assertEqual(runner.current_version(), LATEST_VERSION)
+        self.assertEqual(runner.pending(), [])
+        self.assertEqual(self.db.execute_scalar("SELECT COUNT(*) FROM students"), 0)
+
+    def test_current_schema_skips_ddl(self):
+        """
+        Prueba que un arranque con el esquema al día no ejecute DDL
+        """
+        self.db.disconnect()
+        statements = []
+        original_connect = DatabaseConnection.connect
+
+        def traced_connect(db):
+            connection = original_connect(db)
+            connection.set_trace_callback(statements.append)
+            return connection
+
+        DatabaseConnection.connect = traced_connect
+        try:
+            self.open_database()
+        finally:
+            DatabaseConnection.connect = original_connect
+
+        self.assertEqual(statements, ["PRAGMA user_version"])
+
+    def test_only_missing_migrations_are_applied(self):
+        """
+        Prueba que solo se apliquen las migraciones pendientes
+        """
+        extra = Migration(LATEST_VERSION + 1, "Tabla de prueba",
+                          ["CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)"])
+        runner = MigrationRunner(self.db, MIGRATIONS + [extra])
+
+        self.assertEqual([m.version for m in runner.pending()], [extra.version])
+        self.assertEqual(runner.migrate(), [extra])
+        self.assertEqual(runner.current_version(), extra.version)
+        self.assertEqual(runner.migrate(), [])
+
+    def test_sample_data_is_opt_in(self):
+        """
+        Prueba que los datos de ejemplo se inserten solo cuando se solicitan
+        """
+        self.db.disconnect()
+        self.open_database(sample_data=True)
+        self.assertEqual(self.db.execute_scalar("SELECT COUNT(*) FROM students"), 5)
+
+if __name__ == '__main__':
+    unittest.main()
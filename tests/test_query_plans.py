@@ -0,0 +1,217 @@
+"""
+Pruebas de regresión de los planes de ejecución (EXPLAIN QUERY PLAN)
+
+Ejecuta las consultas de lectura de los DAO, de CRUDOperations, de
+DataNavigator, de ReportGenerator y de StatisticsService, captura el SQL que realmente llega a SQLite y verifica que
+ninguna recorra una tabla completa ("SCAN tabla" sin índice) ni necesite un
+B-tree temporal para ordenar o agrupar ("USE TEMP B-TREE"). Una consulta con
+WHERE tampoco puede recorrer un índice completo ("SCAN tabla USING INDEX"):
+eso es un recorrido de toda la tabla que descarta filas una a una.
+
+Los recorridos inevitables se documentan en ALLOWED_PLANS junto con su motivo.
+"""
+
+import contextlib
+import unittest
+import sys
+import os
+import re
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base import DatabaseTestCase
+from src.database.connection import DatabaseConnection
+from src.database.dao import StudentDAO, CourseDAO, EnrollmentDAO
+from src.database.crud_operations import CRUDOperations
+from src.database.data_navigator import DataNavigator
+from src.database.report_generator import ReportGenerator
+
+# Recorrido completo de una tabla sin índice ("SCAN students", "SCAN e")
+_FULL_SCAN = re.compile(r"^SCAN \w+$")
+# Recorrido de un índice completo ("SCAN s USING INDEX idx_students_name")
+_INDEX_WALK = re.compile(r"^SCAN \w+ USING (?:COVERING )?INDEX \w+$")
+_WHERE = re.compile(r"\bWHERE\b", re.IGNORECASE)
+_TEMP_BTREE = "USE TEMP B-TREE"
+
+# (fragmento del SQL, fragmento de la línea del plan, motivo)
+ALLOWED_PLANS = [
+    ("JOIN students s ON e.student_id = s.id", "USE TEMP B-TREE FOR ORDER BY",
+     "La lista de un curso se ordena por apellido después del JOIN; "
+     "el ordenamiento está acotado por el número de inscritos del curso"),
+    ("+s.status =", "SCAN e USING COVERING INDEX idx_enrollments_student_date",
+     "get_student_transcripts(status=...) recorre las inscripciones en el orden del "
+     "estudiante para agrupar al vuelo; ordenar por estudiante desde el índice de "
+     "estado obligaría a un B-tree temporal sobre todo el resultado"),
+]
+
+
+def _is_allowed(sql: str, plan_line: str) -> bool:
+    """Indica si un paso del plan está documentado en ALLOWED_PLANS"""
+    return any(sql_part in sql and plan_part in plan_line
+               for sql_part, plan_part, _reason in ALLOWED_PLANS)
+
+
+class TestQueryPlans(DatabaseTestCase):
+    """
+    Clase para verificar que las consultas frecuentes usen índices
+    """
+
+    analyze = False
+    database_options = {'sample_data': True}
+
+    def setUp(self):
+        """
+        Configuración inicial: base temporal con datos y SQL capturado
+        """
+        self.statements = []
+        original_connect = DatabaseConnection.connect
+
+        def traced_connect(db):
+            connection = original_connect(db)
+            connection.set_trace_callback(self.statements.append)
+            return connection
+
+        DatabaseConnection.connect = traced_connect
+        try:
+            super().setUp()
+        finally:
+            DatabaseConnection.connect = original_connect
+
+        self._populate()
+        if self.analyze:
+            self.db.update_statistics()
+        del self.statements[:]
+
+    def _populate(self, students: int = 200, courses: int = 20):
+        """Agrega datos suficientes para que el planificador elija índices reales"""
+        with self.db.transaction() as cursor:
+            cursor.executemany(
+                "INSERT INTO students (first_name, last_name, email, status) VALUES (?, ?, ?, ?)",
+                [(f"Nombre{i}", f"Apellido{i % 50}", f"alumno{i}@test.com",
+                  'active' if i % 4 else 'inactive') for i in range(students)]
+            )
+            cursor.executemany(
+                "INSERT INTO courses (name, code, credits, semester) VALUES (?, ?, ?, ?)",
+                [(f"Curso {i}", f"TST{i:03d}", 3, f"2024-{i % 2 + 1}") for i in range(courses)]
+            )
+            cursor.execute(
+                """
+                INSERT OR IGNORE INTO enrollments (student_id, course_id, grade, status)
+                SELECT s.id, c.id, (s.id * 7 + c.id) % 11, 'completed'
+                FROM students s JOIN courses c ON (s.id + c.id) % 4 = 0
+                """
+            )
+
+    def _run_read_paths(self):
+        """Ejecuta las consultas de lectura de la capa de acceso a datos"""
+        student_dao = StudentDAO()
+        course_dao = CourseDAO()
+        enrollment_dao = EnrollmentDAO()
+        crud = CRUDOperations()
+        navigator = DataNavigator()
+
+        student_dao.get_by_id(1)
+        student_dao.get_all()
+        list(student_dao.iter_all())
+        student_dao.search_by_name("Juan")
+        student_dao.search("juan perez", limit=10)
+        student_dao.search_by_email("juan.perez@email.com")
+        student_dao.get_by_status("active")
+        page = student_dao.get_page(limit=20)
+        student_dao.get_page(after=page.next_cursor, limit=20)
+        student_dao.get_page(after=page.next_cursor, limit=20, status="active")
+        student_dao.get_page(after=("Apellido3", "Nombre3", 4), direction="prev", limit=20)
+
+        course_dao.get_by_id(1)
+        course_dao.get_all()
+        list(course_dao.iter_all())
+        course_dao.search_by_code("MAT101")
+        course_dao.search_by_name("Curso")
+        course_dao.search("progra")
+        course_dao.get_by_semester("2024-1")
+        course_dao.get_page(after=("Curso 5", 10), limit=5)
+        course_dao.get_page(after=("Curso 5", 10), limit=5, semester="2024-1")
+
+        enrollment_dao.get_by_id(1)
+        enrollment_dao.get_all()
+        list(enrollment_dao.iter_all())
+        enrollment_dao.get_by_student(1)
+        enrollment_dao.get_by_course(1)
+        enrollment_dao.get_enrollment_details()
+        page = enrollment_dao.get_page(limit=50)
+        enrollment_dao.get_page(after=page.next_cursor, limit=50)
+        enrollment_dao.get_page(after=page.next_cursor, direction="prev", limit=50)
+
+        crud.get_student_transcript(1)
+        list(crud.get_student_transcripts([1, 2, 3]))
+        list(crud.get_student_transcripts(status="active"))
+        crud.get_course_roster(1)
+
+        navigator.search_students_advanced({'status': 'active'})
+        navigator.search_students_advanced({'name': 'Apellido1', 'email': 'alumno', 'status': 'active'})
+        navigator.get_student_statistics(1)
+
+        reports = ReportGenerator(output_directory=os.path.join(self.temp_dir.name, "reports"))
+        reports.generate_student_report("csv")
+        reports.generate_student_report("csv", filter_status="active")
+        reports.generate_course_report("csv")
+        reports.export_enrollments_csv()
+        # PDF/Excel necesitan ReportLab o pandas; las consultas se ejecutan antes
+        for generate in (lambda: reports.generate_student_transcript(1),
+                         lambda: reports.generate_course_roster(1),
+                         reports.generate_statistics_report):
+            with contextlib.suppress(ImportError):
+                generate()
+
+        self.db.statistics.invalidate()
+        self.db.statistics.get()
+        crud.get_statistics()
+
+    def _explain(self, sql: str):
+        connection = self.db.pool.acquire()
+        try:
+            return [row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}")]
+        finally:
+            self.db.pool.release(connection)
+
+    def test_hot_queries_use_indexes(self):
+        """
+        Prueba que ninguna consulta frecuente recorra tablas ni ordene en temporales
+        """
+        self._run_read_paths()
+        queries = {sql for sql in self.statements if sql.lstrip().upper().startswith("SELECT")}
+        self.assertGreater(len(queries), 10)
+
+        violations = []
+        for sql in sorted(queries):
+            for line in self._explain(sql):
+                regression = (_FULL_SCAN.match(line) or _TEMP_BTREE in line
+                              or (_INDEX_WALK.match(line) and _WHERE.search(sql)))
+                if regression and not _is_allowed(sql, line):
+                    violations.append(f"{line}\n    {' '.join(sql.split())}")
+
+        self.assertEqual(violations, [], "Planes de ejecución con regresiones:\n" + "\n".join(violations))
+
+    def test_secondary_indexes_exist(self):
+        """
+        Prueba que la migración cree los índices secundarios
+        """
+        rows = self.db.execute_query("SELECT name FROM sqlite_master WHERE type = 'index'")
+        names = {row['name'] for row in rows}
+        for index in ("idx_students_name", "idx_students_status_name", "idx_courses_name",
+                      "idx_courses_semester_name", "idx_enrollments_date",
+                      "idx_enrollments_student_date", "idx_enrollments_course_date"):
+            self.assertIn(index, names)
+
+
+class TestQueryPlansAnalyzed(TestQueryPlans):
+    """
+    Mismas verificaciones después de ANALYZE (con estadísticas en sqlite_stat1)
+    """
+
+    analyze = True
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Pruebas unitarias para las estadísticas de consultas
+"""
+
+import unittest
+import json
+import sys
+import os
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base import DatabaseTestCase
+from src.database.query_stats import normalize_sql
+
+class TestQueryStats(DatabaseTestCase):
+    """
+    Clase para probar la medición de consultas y el registro de consultas lentas
+    """
+
+    database_options = None
+
+    def setUp(self):
+        """
+        Configuración inicial para cada prueba
+        """
+        super().setUp()
+        self.log_path = os.path.join(self.temp_dir.name, "slow.log")
+        self.open_database(slow_query_threshold_ms=0, slow_query_log=self.log_path, sample_data=True)
+        self.db.reset_query_stats()
+
+    def test_normalize_sql(self):
+        """
+        Prueba que los literales y espacios no generen sentencias distintas
+        """
+        self.assertEqual(
+            normalize_sql("SELECT *\n  FROM students WHERE id = 5 AND status = 'active'"),
+            "SELECT * FROM students WHERE id = ? AND status = ?"
+        )
+
+    def test_statements_are_aggregated(self):
+        """
+        Prueba el conteo, las filas y los percentiles por sentencia
+        """
+        for student_id in (1, 2, 3):
+            self.db.execute_query("SELECT * FROM students WHERE id = ?", (student_id,))
+        self.db.execute_scalar("SELECT MAX(id) FROM students")
+
+        stats = self.db.get_database_info()['query_stats']
+        by_statement = {item['statement']: item for item in stats['statements']}
+
+        lookup = by_statement["SELECT * FROM students WHERE id = ?"]
+        self.assertEqual(lookup['count'], 3)
+        self.assertEqual(lookup['rows'], 3)
+        self.assertLessEqual(lookup['p50_ms'], lookup['p99_ms'])
+        self.assertEqual(by_statement["SELECT MAX(id) FROM students"]['count'], 1)
+
+    def test_slow_query_log_contains_plan(self):
+        """
+        Prueba que las consultas lentas se registren con su plan de ejecución
+        """
+        self.db.execute_query("SELECT * FROM students WHERE email = ?", ("juan.perez@email.com",))
+
+        with open(self.log_path, encoding='utf-8') as log_file:
+            entries = [json.loads(line) for line in log_file]
+
+        entry = [e for e in entries if e['statement'] == "SELECT * FROM students WHERE email = ?"][-1]
+        self.assertEqual(entry['rows'], 1)
+        self.assertTrue(any("students" in line for line in entry['plan']))
+
+    def test_iterated_rows_and_normalize_cache(self):
+        """
+        Prueba el conteo de filas al iterar el cursor y la caché de normalización
+        """
+        normalize_sql.cache_clear()
+        with self.db.get_cursor() as cursor:
+            for _ in range(3):
+                rows = sum(1 for _row in cursor.execute("SELECT * FROM enrollments"))
+        self.assertEqual(rows, 5)
+        self.assertGreaterEqual(normalize_sql.cache_info().hits, 2)
+
+        stats = self.db.get_query_stats()
+        lookup = [s for s in stats['statements'] if s['statement'] == "SELECT * FROM enrollments"][0]
+        self.assertEqual((lookup['count'], lookup['rows']), (3, 15))
+        self.assertGreater(lookup['total_ms'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
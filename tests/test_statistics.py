@@ -0,0 +1,98 @@
+"""
+Pruebas unitarias para el servicio de estadísticas con caché
+"""
+
+import sqlite3
+import unittest
+import sys
+import os
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base import DatabaseTestCase
+from src.database.crud_operations import CRUDOperations
+from src.database.dao import Student, StudentDAO
+
+class TestStatisticsService(DatabaseTestCase):
+    """
+    Clase para probar los contadores en una pasada y su invalidación
+    """
+
+    database_options = {'sample_data': True}
+
+    def setUp(self):
+        super().setUp()
+        self.service = self.db.statistics
+        self.crud = CRUDOperations()
+
+    def scalar(self, query: str):
+        return self.db.execute_scalar(query)
+
+    def test_counters_match_individual_queries(self):
+        """
+        Prueba que la pasada única dé los mismos valores que las consultas separadas
+        """
+        stats = self.crud.get_statistics()
+        self.assertEqual(stats['total_students'], self.scalar("SELECT COUNT(*) FROM students"))
+        self.assertEqual(stats['active_students'],
+                         self.scalar("SELECT COUNT(*) FROM students WHERE status = 'active'"))
+        self.assertEqual(stats['total_courses'], self.scalar("SELECT COUNT(*) FROM courses"))
+        self.assertEqual(stats['total_enrollments'], self.scalar("SELECT COUNT(*) FROM enrollments"))
+        self.assertEqual(stats['active_enrollments'],
+                         self.scalar("SELECT COUNT(*) FROM enrollments WHERE status = 'enrolled'"))
+        self.assertEqual(stats['average_grade'],
+                         round(self.scalar("SELECT AVG(grade) FROM enrollments WHERE grade IS NOT NULL"), 2))
+
+        distribution = self.db.execute_query("""
+            SELECT CASE WHEN grade >= 90 THEN 'A (90-100)' WHEN grade >= 80 THEN 'B (80-89)'
+                        WHEN grade >= 70 THEN 'C (70-79)' WHEN grade >= 60 THEN 'D (60-69)'
+                        ELSE 'F (0-59)' END AS grade_range, COUNT(*) AS count
+            FROM enrollments WHERE grade IS NOT NULL GROUP BY grade_range ORDER BY grade_range
+        """)
+        self.assertEqual(self.service.get()['enrollments']['grade_distribution'],
+                         [dict(row) for row in distribution])
+
+    def test_repeated_calls_hit_cache(self):
+        """
+        Prueba que sin escrituras las llamadas siguientes no consulten las tablas
+        """
+        self.crud.get_statistics()
+        self.db.reset_query_stats()
+        for _ in range(5):
+            self.crud.get_statistics()
+
+        self.assertEqual(self.db.get_query_stats()['total_queries'], 0)
+        stats = self.service.get_stats()
+        self.assertEqual((stats['computations'], stats['hits']), (1, 5))
+
+    def test_writes_invalidate(self):
+        """
+        Prueba la invalidación por escrituras propias y de otra conexión (otro proceso)
+        """
+        before = self.crud.get_statistics()['total_students']
+        StudentDAO().create(Student(first_name="Nueva", last_name="Cuenta", email="nueva@test.com"))
+        self.assertEqual(self.crud.get_statistics()['total_students'], before + 1)
+
+        other = sqlite3.connect(self.db_path)
+        try:
+            other.execute("UPDATE students SET status = 'graduated' WHERE id = 1")
+            other.commit()
+        finally:
+            other.close()
+        self.assertEqual(self.service.get()['students']['graduated'],
+                         self.scalar("SELECT COUNT(*) FROM students WHERE status = 'graduated'"))
+        self.assertEqual(self.service.get_stats()['computations'], 3)
+
+    def test_transaction_bypasses_cache(self):
+        """
+        Prueba que dentro de una transacción se vean las escrituras no confirmadas
+        """
+        before = self.crud.get_statistics()['total_students']
+        with self.db.transaction():
+            StudentDAO().create(Student(first_name="En", last_name="Curso", email="encurso@test.com"))
+            self.assertEqual(self.crud.get_statistics()['total_students'], before + 1)
+        self.assertEqual(self.crud.get_statistics()['total_students'], before + 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Pruebas unitarias para las transacciones (unidad de trabajo con SAVEPOINT)
+"""
+
+import unittest
+import sys
+import os
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base import DatabaseTestCase
+from src.database.dao import Student, StudentDAO
+from src.database.crud_operations import CRUDOperations
+
+class TestTransactions(DatabaseTestCase):
+    """
+    Clase para probar transacciones anidadas y commits de los DAO
+    """
+
+    def setUp(self):
+        """
+        Configuración inicial para cada prueba
+        """
+        super().setUp()
+        self.dao = StudentDAO()
+
+    def count_commits(self):
+        """Registra las sentencias COMMIT ejecutadas en la conexión del hilo"""
+        statements = []
+        with self.db.pool.connection() as conn:
+            conn.set_trace_callback(statements.append)
+        return lambda: len([s for s in statements if s.strip().upper() == "COMMIT"])
+
+    def student_count(self) -> int:
+        return self.db.execute_scalar("SELECT COUNT(*) FROM students")
+
+    def test_nested_savepoint_rollback(self):
+        """
+        Prueba que un error en un bloque interno solo revierta ese bloque
+        """
+        before = self.student_count()
+        with self.db.transaction():
+            self.dao.create(Student(first_name="Ext", last_name="Uno", email="ext@test.com"))
+            with self.assertRaises(RuntimeError):
+                with self.db.transaction():
+                    self.dao.create(Student(first_name="Int", last_name="Dos", email="int@test.com"))
+                    raise RuntimeError("fallo interno")
+
+        self.assertEqual(self.student_count(), before + 1)
+        self.assertIsNotNone(self.dao.search_by_email("ext@test.com"))
+        self.assertIsNone(self.dao.search_by_email("int@test.com"))
+
+    def test_rollback_includes_audit_rows(self):
+        """
+        Prueba que al revertir se descarten también las filas de auditoría
+        """
+        audit_before = self.db.execute_scalar("SELECT COUNT(*) FROM audit_log")
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.dao.create(Student(first_name="Tmp", last_name="Tmp", email="tmp@test.com"))
+                raise RuntimeError("abortar")
+
+        self.assertEqual(self.db.execute_scalar("SELECT COUNT(*) FROM audit_log"), audit_before)
+        self.assertIsNone(self.dao.search_by_email("tmp@test.com"))
+
+    def test_dao_write_commits_once(self):
+        """
+        Prueba que una escritura del DAO y su auditoría usen un único COMMIT
+        """
+        commits = self.count_commits()
+        student_id = self.dao.create(Student(first_name="Uno", last_name="Solo", email="uno@test.com"))
+        self.assertEqual(commits(), 1)
+
+        crud = CRUDOperations()
+        crud.update_student(student_id, phone="555-0000")
+        self.assertEqual(commits(), 2)
+        self.assertEqual(self.dao.get_by_id(student_id).phone, "555-0000")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Pruebas unitarias para los historiales académicos por lotes
+"""
+
+import unittest
+import sys
+import os
+
+# Agregar el directorio raíz al path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base import DatabaseTestCase
+from src.database.crud_operations import CRUDOperations
+from src.database.dao import Student, Enrollment, StudentDAO, CourseDAO, EnrollmentDAO
+
+class TestStudentTranscripts(DatabaseTestCase):
+    """
+    Clase para probar get_student_transcripts frente al cálculo estudiante por estudiante
+    """
+
+    database_options = {'sample_data': True}
+
+    def setUp(self):
+        super().setUp()
+        self.crud = CRUDOperations()
+        self.student_dao = StudentDAO()
+        self.enrollment_dao = EnrollmentDAO()
+
+        # Inscripciones sin calificar, retiradas y de un estudiante inactivo
+        self.enrollment_dao.create(Enrollment(student_id=1, course_id=3))
+        self.enrollment_dao.create(Enrollment(student_id=2, course_id=4, grade=55.0, status="dropped"))
+        inactive = self.student_dao.create(Student(first_name="Ina", last_name="Activa",
+                                                   email="ina@test.com", status="inactive"))
+        self.enrollment_dao.create(Enrollment(student_id=inactive, course_id=1, grade=70.0,
+                                              status="completed"))
+        self.student_dao.create(Student(first_name="Sin", last_name="Cursos", email="sin@test.com"))
+
+    def expected(self, student_id: int):
+        """GPA y créditos calculados en Python, como el historial individual original"""
+        credits = {course.id: course.credits for course in CourseDAO().get_all()}
+        completed = [(e.grade, credits[e.course_id]) for e in self.enrollment_dao.get_by_student(student_id)
+                     if e.grade is not None and e.status == 'completed']
+        total_credits = sum(c for _grade, c in completed)
+        gpa = sum(grade * c for grade, c in completed) / total_credits if total_credits else 0
+        return total_credits, gpa, len(self.enrollment_dao.get_by_student(student_id))
+
+    def test_matches_per_student_totals(self):
+        """
+        Prueba GPA, créditos y cursos de todos los estudiantes con inscripciones
+        """
+        transcripts = list(self.crud.get_student_transcripts())
+        with_enrollments = self.db.execute_query(
+            "SELECT DISTINCT student_id FROM enrollments ORDER BY student_id")
+        self.assertEqual([t['student_id'] for t in transcripts], [row[0] for row in with_enrollments])
+
+        for transcript in transcripts:
+            total_credits, gpa, courses = self.expected(transcript['student_id'])
+            self.assertEqual(transcript['total_credits'], total_credits)
+            self.assertAlmostEqual(transcript['gpa'], gpa)
+            self.assertEqual(len(transcript['courses']), courses)
+            dates = [course['enrollment_date'] for course in transcript['courses']]
+            self.assertEqual(dates, sorted(dates))
+
+        self.assertEqual(self.crud.get_student_transcript(1), transcripts[0])
+        self.assertIsNone(self.crud.get_student_transcript(999))
+
+    def test_filters_and_single_query(self):
+        """
+        Prueba los filtros por IDs y por estado con una sola consulta por llamada
+        """
+        self.db.reset_query_stats()
+        self.assertEqual([t['student_id'] for t in self.crud.get_student_transcripts([3, 1, 999])], [1, 3])
+        self.assertEqual(self.db.get_query_stats()['total_queries'], 1)
+
+        active = {s.id for s in self.student_dao.get_by_status("active")}
+        students = [t['student_id'] for t in self.crud.get_student_transcripts(status="active")]
+        self.assertTrue(students)
+        self.assertTrue(set(students) <= active)
+        self.assertEqual(list(self.crud.get_student_transcripts([1, 2], status="inactive")), [])
+
+    def test_streams_one_student_at_a_time(self):
+        """
+        Prueba que el primer historial se entregue antes de leer el resto
+        """
+        transcripts = self.crud.get_student_transcripts()
+        first = next(transcripts)
+        self.assertEqual(first['student_id'], 1)
+        self.assertEqual(self.db.pool.get_stats()['in_use'], 1)
+        transcripts.close()
+        self.assertEqual(self.db.pool.get_stats()['in_use'], 0)
+
+if __name__ == '__main__':
+    unittest.main()